@@ -0,0 +1,31 @@
+"""Add updated_at to products and customers
+
+Revision ID: 3c9f1a7d2b64
+Revises: 78d492b9ae24
+Create Date: 2026-10-17 10:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9f1a7d2b64'
+down_revision: Union[str, None] = '78d492b9ae24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time as their first version
+    op.add_column('products', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+    op.create_index(op.f('ix_products_updated_at'), 'products', ['updated_at'], unique=False)
+    op.add_column('customers', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('customers', 'updated_at')
+    op.drop_index(op.f('ix_products_updated_at'), table_name='products')
+    op.drop_column('products', 'updated_at')
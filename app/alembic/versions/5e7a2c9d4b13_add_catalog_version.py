@@ -0,0 +1,31 @@
+"""Add catalog_version
+
+Revision ID: 5e7a2c9d4b13
+Revises: 9b2e4d6f8a10
+Create Date: 2026-10-17 16:21:08.412730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a2c9d4b13'
+down_revision: Union[str, None] = '9b2e4d6f8a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    catalog_version = op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_version')
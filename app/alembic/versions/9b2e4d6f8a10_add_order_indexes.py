@@ -0,0 +1,53 @@
+"""Add order indexes, drop duplicate primary key indexes
+
+Revision ID: 9b2e4d6f8a10
+Revises: 3c9f1a7d2b64
+Create Date: 2026-10-17 14:03:52.877104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e4d6f8a10'
+down_revision: Union[str, None] = '3c9f1a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'Pending'")
+
+# Primary keys are already indexed by their constraint
+DUPLICATE_INDEXES = (
+    ('ix_customers_id', 'customers'),
+    ('ix_products_id', 'products'),
+    ('ix_orders_id', 'orders'),
+    ('ix_order_items_id', 'order_items'),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY on PostgreSQL, so live tables are not locked for writes
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_customer_id_id', 'orders', ['customer_id', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_status_id', 'orders', ['status', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_total_amount', 'orders', ['total_amount'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_pending_total_amount', 'orders', ['total_amount'], unique=False, postgresql_where=PENDING, sqlite_where=PENDING, postgresql_concurrently=True)
+        op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_order_items_product_id'), 'order_items', ['product_id'], unique=False, postgresql_concurrently=True)
+        for index_name, table_name in DUPLICATE_INDEXES:
+            op.drop_index(op.f(index_name), table_name=table_name, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in DUPLICATE_INDEXES:
+            op.create_index(op.f(index_name), table_name, ['id'], unique=False, postgresql_concurrently=True)
+        op.drop_index(op.f('ix_order_items_product_id'), table_name='order_items', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_order_items_order_id'), table_name='order_items', postgresql_concurrently=True)
+        op.drop_index('ix_orders_pending_total_amount', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_total_amount', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_status_id', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_customer_id_id', table_name='orders', postgresql_concurrently=True)
@@ -12,11 +12,175 @@ class Settings:
     DB_NAME: str = os.getenv("DB_NAME", "mydatabase")
     DB_HOST: str = os.getenv("DB_HOST", "db")
     DB_PORT: str = os.getenv("DB_PORT", "5432")
-    DATABASE_URL: str = (
+    DATABASE_URL: str = os.getenv("DATABASE_URL") or (
         f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL") or (
+        f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}"
+        f"/{DB_NAME}"
+    )
+    # Read replicas (comma-separated sync URLs); reads fall back to the
+    # primary when none is healthy
+    DATABASE_REPLICA_URLS: list[str] = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    DB_REPLICA_MAX_LAG: float = float(os.getenv("DB_REPLICA_MAX_LAG", "10"))
+    DB_REPLICA_CHECK_INTERVAL: float = float(
+        os.getenv("DB_REPLICA_CHECK_INTERVAL", "5")
+    )
+    DB_REPLICA_CONNECT_TIMEOUT: int = int(
+        os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "2")
+    )
+    # Serve the CRUD routes from the async (asyncpg) stack
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = (
+        os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    )
+    # PgBouncer (transaction pooling): no app-side pool, no prepared
+    # statements
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
     APP_NAME: str = os.getenv("APP_NAME", "FastAPI Order API")
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    # Token for the /admin routes (sent as X-Admin-Token); empty disables
+    # them
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    # NLP: LLM backend ("gemini" or "fake" for offline load tests)
+    NLP_LLM_BACKEND: str = os.getenv("NLP_LLM_BACKEND", "gemini")
+    NLP_MODEL: str = os.getenv("NLP_MODEL", "gemini-2.0-flash")
+    NLP_MAX_CONCURRENCY: int = int(os.getenv("NLP_MAX_CONCURRENCY", "8"))
+    NLP_LLM_TIMEOUT: float = float(os.getenv("NLP_LLM_TIMEOUT", "30"))
+    NLP_FAKE_LATENCY_MS: int = int(os.getenv("NLP_FAKE_LATENCY_MS", "500"))
+    NLP_FAKE_SQL: str = os.getenv(
+        "NLP_FAKE_SQL", "SELECT COUNT(*) AS total_orders FROM orders"
+    )
+    # Seconds between checks of the Alembic revision behind the cached
+    # schema
+    NLP_SCHEMA_CHECK_INTERVAL: float = float(
+        os.getenv("NLP_SCHEMA_CHECK_INTERVAL", "60")
+    )
+    # Limits for executing generated SQL (timeout is PostgreSQL only)
+    NLP_MAX_ROWS: int = int(os.getenv("NLP_MAX_ROWS", "1000"))
+    NLP_STREAM_MAX_ROWS: int = int(os.getenv("NLP_STREAM_MAX_ROWS", "100000"))
+    NLP_FETCH_SIZE: int = int(os.getenv("NLP_FETCH_SIZE", "500"))
+    NLP_STATEMENT_TIMEOUT_MS: int = int(
+        os.getenv("NLP_STATEMENT_TIMEOUT_MS", "15000")
+    )
+    # EXPLAIN guard for generated SQL (PostgreSQL): "reject" queries
+    # estimated above the thresholds, "limit" to accept them if the row
+    # cap makes them cheap enough, or "off"
+    NLP_COST_GUARD: str = os.getenv("NLP_COST_GUARD", "limit")
+    NLP_MAX_PLAN_COST: float = float(os.getenv("NLP_MAX_PLAN_COST", "100000"))
+    NLP_MAX_PLAN_ROWS: int = int(os.getenv("NLP_MAX_PLAN_ROWS", "1000000"))
+    # Translation cache: "memory" (per worker), "sqlite" (shared by the
+    # workers on a host) or "none"
+    NLP_CACHE_BACKEND: str = os.getenv("NLP_CACHE_BACKEND", "memory")
+    NLP_CACHE_PATH: str = os.getenv("NLP_CACHE_PATH", "nlp_cache.db")
+    NLP_CACHE_SIZE: int = int(os.getenv("NLP_CACHE_SIZE", "1024"))
+    NLP_CACHE_TTL: float = float(os.getenv("NLP_CACHE_TTL", "86400"))
+    # Query result cache; 0 disables it
+    NLP_RESULT_CACHE_TTL: float = float(
+        os.getenv("NLP_RESULT_CACHE_TTL", "0")
+    )
+    NLP_RESULT_CACHE_SIZE: int = int(os.getenv("NLP_RESULT_CACHE_SIZE", "256"))
+
+    # Pagination total_count strategies
+    COUNT_CACHE_TTL: int = int(os.getenv("COUNT_CACHE_TTL", "30"))
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+    COUNT_ESTIMATE_THRESHOLD: int = int(
+        os.getenv("COUNT_ESTIMATE_THRESHOLD", "1000")
+    )
+
+    # Largest batch accepted by POST /orders/bulk
+    ORDER_BULK_MAX: int = int(os.getenv("ORDER_BULK_MAX", "5000"))
+
+    # Logging: records go through a bounded queue to a listener thread
+    # unless LOG_ASYNC is off. LOG_QUEUE_POLICY is "drop" (never wait on
+    # a full queue) or "block" (never lose a record).
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_QUEUE_POLICY: str = os.getenv("LOG_QUEUE_POLICY", "drop")
+    LOG_FILE_MAX_BYTES: int = int(
+        os.getenv("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024))
+    )
+    LOG_FILE_BACKUPS: int = int(os.getenv("LOG_FILE_BACKUPS", "5"))
+    # Fraction of INFO records kept; warnings and errors are always kept
+    LOG_INFO_SAMPLE_RATE: float = float(
+        os.getenv("LOG_INFO_SAMPLE_RATE", "1.0")
+    )
+
+    # Serialize responses with pydantic-core instead of jsonable_encoder +
+    # json.dumps; list routes also skip re-validating their page
+    FAST_JSON: bool = os.getenv("FAST_JSON", "false").lower() == "true"
+
+    # In-process product cache: catalog fields are kept PRODUCT_CACHE_TTL
+    # seconds, stock PRODUCT_STOCK_CACHE_TTL (0 disables either layer).
+    # PRODUCT_CACHE_NOTIFY spreads invalidations to every worker with
+    # PostgreSQL LISTEN/NOTIFY on PRODUCT_CACHE_CHANNEL.
+    PRODUCT_CACHE_SIZE: int = int(os.getenv("PRODUCT_CACHE_SIZE", "10000"))
+    PRODUCT_CACHE_TTL: float = float(os.getenv("PRODUCT_CACHE_TTL", "300"))
+    PRODUCT_STOCK_CACHE_TTL: float = float(
+        os.getenv("PRODUCT_STOCK_CACHE_TTL", "1")
+    )
+    PRODUCT_CACHE_NOTIFY: bool = (
+        os.getenv("PRODUCT_CACHE_NOTIFY", "false").lower() == "true"
+    )
+    PRODUCT_CACHE_CHANNEL: str = os.getenv(
+        "PRODUCT_CACHE_CHANNEL", "product_cache"
+    )
+
+    # Seconds clients may reuse a product/customer read before
+    # revalidating it with its ETag (0: always revalidate)
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+
+    # Send each request's app/db/pool/llm time breakdown in a
+    # Server-Timing header. Metrics are always on GET /metrics; set
+    # PROMETHEUS_MULTIPROC_DIR when running several workers.
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+    # Query profiler: per-statement-fingerprint stats of the last
+    # QUERY_STATS_SIZE fingerprints (GET /admin/query-stats), and a
+    # warning log for statements over SLOW_QUERY_MS (0 disables it)
+    QUERY_PROFILER: bool = (
+        os.getenv("QUERY_PROFILER", "true").lower() == "true"
+    )
+    QUERY_STATS_SIZE: int = int(os.getenv("QUERY_STATS_SIZE", "500"))
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Production server (python -m app.serve). SERVER_WORKERS 0 runs one
+    # worker per usable CPU; each worker has its own DB pool, so keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the server's
+    # max_connections. SERVER_KEEP_ALIVE should exceed the load
+    # balancer's idle timeout so it never reuses a connection we closed.
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "uvloop")
+    SERVER_HTTP: str = os.getenv("SERVER_HTTP", "httptools")
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEP_ALIVE: int = int(os.getenv("SERVER_KEEP_ALIVE", "65"))
+    SERVER_GRACEFUL_TIMEOUT: int = int(
+        os.getenv("SERVER_GRACEFUL_TIMEOUT", "30")
+    )
+    SERVER_ACCESS_LOG: bool = (
+        os.getenv("SERVER_ACCESS_LOG", "false").lower() == "true"
+    )
+
+    # Test mode: fail list requests that exceed their statement budget
+    ENFORCE_QUERY_BUDGET: bool = (
+        os.getenv("ENFORCE_QUERY_BUDGET", "false").lower() == "true"
+    )
 
 
 settings = Settings()
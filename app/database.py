@@ -1,13 +1,135 @@
+from datetime import datetime, timezone
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.utils.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+)
+from app.utils.query_profiler import profile_engine
+from app.utils.replicas import Replica, ReplicaSet
+
+# Async driver used for a replica URL, by backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def engine_options(name: str, is_async: bool = False) -> dict[str, Any]:
+    """Returns the pool options for an engine from the settings"""
+    if settings.DB_PGBOUNCER:
+        options: dict[str, Any] = {
+            "poolclass": InstrumentedNullPool,
+            "pool_logging_name": name,
+        }
+        if is_async:
+            # PgBouncer in transaction mode cannot keep prepared statements
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        return options
+
+    return {
+        "poolclass": (
+            InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+        ),
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def replica_options(url: URL, name: str, is_async: bool) -> dict[str, Any]:
+    """Returns the engine options for a read replica"""
+    options = engine_options(name, is_async=is_async)
+    if url.get_backend_name() == "postgresql":
+        # Fail fast on an unreachable replica so reads fall back quickly
+        timeout_arg = "timeout" if is_async else "connect_timeout"
+        options["connect_args"] = {
+            **options.get("connect_args", {}),
+            timeout_arg: settings.DB_REPLICA_CONNECT_TIMEOUT,
+        }
+    return options
+
+
+def async_url(url: URL) -> URL:
+    """Returns ``url`` with the async driver for its backend"""
+    return url.set(
+        drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    )
+
+
+def create_replica(index: int, url: str) -> Replica:
+    """Creates the sync and async engines of one read replica"""
+    parsed = make_url(url)
+    name = f"replica-{index}"
+    async_engine = create_async_engine(
+        async_url(parsed),
+        **replica_options(parsed, f"async-{name}", True),
+    )
+    profile_engine(async_engine.sync_engine)
+    return Replica(
+        name,
+        profile_engine(
+            create_engine(parsed, **replica_options(parsed, name, False))
+        ),
+        async_engine,
+    )
 
 
-engine = create_engine(settings.DATABASE_URL)
+engine = profile_engine(
+    create_engine(settings.DATABASE_URL, **engine_options("primary"))
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Returns the current UTC time, for timestamp column defaults"""
+    return datetime.now(timezone.utc)
+
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL, **engine_options("async", is_async=True)
+)
+profile_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+replicas = ReplicaSet(
+    [
+        create_replica(index, url)
+        for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+    ],
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+)
+
+
+def read_engine():
+    """Returns the engine for read-only work: a replica or the primary"""
+    replica = replicas.pick()
+    return replica.engine if replica is not None else engine
+
+
+async def async_read_engine():
+    """Returns the async engine for read-only work"""
+    replica = await replicas.apick()
+    return replica.async_engine if replica is not None else async_engine
+
+
 def get_db():
     """Returns a database session"""
     db = SessionLocal()
@@ -15,3 +137,62 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Returns an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """
+    Returns a database session for read-only routes.
+
+    The session is bound to a healthy read replica when one is configured
+    and within DB_REPLICA_MAX_LAG, otherwise to the primary. Reads may
+    therefore trail writes by up to that lag.
+    """
+    db = SessionLocal(bind=read_engine())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """Returns an async database session for read-only routes"""
+    async with AsyncSessionLocal(bind=await async_read_engine()) as db:
+        yield db
+
+
+def _all_engines() -> tuple[list, list]:
+    """Returns the sync and the async engines, replicas included"""
+    sync_engines = [engine]
+    async_engines = [async_engine]
+    for replica in replicas.replicas:
+        sync_engines.append(replica.engine)
+        async_engines.append(replica.async_engine)
+    return sync_engines, async_engines
+
+
+def dispose_engines(close: bool = True) -> None:
+    """
+    Empties the pools of every engine.
+
+    A forked worker passes ``close=False`` so it never touches the
+    connections it inherited from the parent, only drops them. Async
+    connections are always just dropped: they can only be closed on
+    their event loop, by ``adispose_engines``.
+    """
+    sync_engines, async_engines = _all_engines()
+    for target in sync_engines:
+        target.dispose(close=close)
+    for target in async_engines:
+        target.sync_engine.dispose(close=False)
+
+
+async def adispose_engines() -> None:
+    """Closes the pooled connections of every async engine"""
+    for target in _all_engines()[1]:
+        await target.dispose()
@@ -1,6 +1,12 @@
-from fastapi import APIRouter
+import secrets
+from typing import Any, Callable, Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config import settings
+
 router = APIRouter()
 
 
@@ -8,3 +14,30 @@ class BaseService:
     """Base class for services"""
     def __init__(self, db: Session):
         self.db = db
+
+
+class AsyncBaseService:
+    """
+    Base class for services on the async database stack.
+
+    Async services run the synchronous service implementation through
+    ``AsyncSession.run_sync``: the ORM code executes in a greenlet while
+    every database round-trip is awaited on asyncpg, so the event loop is
+    never blocked and both stacks share one implementation.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def run_sync(self, fn: Callable[[Session], Any]) -> Any:
+        """Runs ``fn`` with the underlying synchronous session."""
+        return await self.db.run_sync(fn)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Allows the request only with the configured ``ADMIN_TOKEN``."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled.")
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
@@ -1,17 +1,67 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
 from app.config import settings
-from app.routes import customer, nlp, orders, products
+from app.database import adispose_engines, engine
+from app.middlewares.request_context import RequestContextMiddleware
+from app.middlewares.security import SecurityHeadersMiddleware
+from app.middlewares.timing import RequestTimingMiddleware
+from app.routes import admin, customer, metrics, nlp, orders, products
+from app.routes.aio import customer as async_customer
+from app.routes.aio import orders as async_orders
+from app.routes.aio import products as async_products
+from app.services.product_cache import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from app.utils.responses import FastJSONResponse
+from app.utils.validation import validation_message
+
+# Both stacks serve the same paths; DB_ASYNC picks one per deployment so
+# they can be load-tested side by side.
+if settings.DB_ASYNC:
+    customer, orders, products = async_customer, async_orders, async_products
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts and stops the background threads and pools of this worker"""
+    start_invalidation_listener(engine)
+    yield
+    stop_invalidation_listener()
+    await adispose_engines()
 
 
-app = FastAPI(title=settings.APP_NAME)
+app = FastAPI(
+    title=settings.APP_NAME,
+    lifespan=lifespan,
+    default_response_class=(
+        FastJSONResponse if settings.FAST_JSON else JSONResponse
+    ),
+)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    # The interactive docs load their assets from a CDN
+    routes={
+        "/docs": {"Content-Security-Policy": None},
+        "/redoc": {"Content-Security-Policy": None},
+    },
+)
+app.add_middleware(RequestContextMiddleware)
+# Outermost, so the whole stack is in the request latency
+app.add_middleware(
+    RequestTimingMiddleware, server_timing=settings.SERVER_TIMING
+)
 
 app.include_router(orders.router)
 app.include_router(nlp.router)
 app.include_router(products.router)
 app.include_router(customer.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 # Custom validation error handler
@@ -22,10 +72,9 @@ async def validation_exception_handler(
     """
     Custom error handler to return only the first validation error message.
     """
-    first_error = exc.errors()[0]  # Get the first error
-    message = first_error["msg"].replace("Value error, ", "")  # Clean message
-
-    return JSONResponse(status_code=422, content={"detail": message})
+    return JSONResponse(
+        status_code=422, content={"detail": validation_message(exc)}
+    )
 
 
 @app.exception_handler(Exception)
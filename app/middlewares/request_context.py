@@ -0,0 +1,57 @@
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.request_context import (
+    request_id_var,
+    request_scope_var,
+    request_start_var,
+)
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Client-supplied ids are echoed in headers and logs; keep them tame.
+_VALID_ID_RE = re.compile(rb"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """
+    Tags each request with an id, start time and scope for logging.
+
+    The id is taken from a valid ``X-Request-ID`` header or generated,
+    and echoed on the response. Pure ASGI, so it adds no per-request task
+    or body buffering.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER and _VALID_ID_RE.match(value):
+                request_id = value.decode()
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER, request_id.encode())
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        id_token = request_id_var.set(request_id)
+        start_token = request_start_var.set(time.perf_counter())
+        scope_token = request_scope_var.set(scope)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(id_token)
+            request_start_var.reset(start_token)
+            request_scope_var.reset(scope_token)
@@ -1,14 +1,91 @@
-from fastapi import Request
-from app.main import app
+from typing import Optional
 
-@app.middleware("http")
-async def security_headers(request: Request, call_next):
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Header name -> value; None removes a header in a per-route override.
+HeaderMap = dict[str, Optional[str]]
+# Lowercase header names and the (name, value) pairs sent for them
+EncodedHeaders = tuple[frozenset, list[tuple[bytes, bytes]]]
+
+DEFAULT_SECURITY_HEADERS: HeaderMap = {
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Content-Security-Policy": "default-src 'self'",
+}
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to the response.
+
+    Pure ASGI: the precomputed header bytes are appended to the
+    ``http.response.start`` message and the body is passed through
+    untouched, so streaming responses keep streaming.
+
+    ``routes`` maps a path prefix to header overrides merged over
+    ``headers`` (a None value drops that header), or to None to skip the
+    middleware for that prefix. The longest matching prefix wins.
     """
-    response = await call_next(request)
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Content-Security-Policy"] = "default-src 'self'"
-    return response
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        headers: Optional[HeaderMap] = None,
+        routes: Optional[dict[str, Optional[HeaderMap]]] = None,
+    ):
+        self.app = app
+        base = dict(DEFAULT_SECURITY_HEADERS if headers is None else headers)
+        self.default = _encode(base)
+        self.routes = sorted(
+            (
+                (
+                    prefix.rstrip("/"),
+                    None
+                    if overrides is None
+                    else _encode({**base, **overrides}),
+                )
+                for prefix, overrides in (routes or {}).items()
+            ),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = self._headers_for(scope["path"])
+        if headers is None:
+            await self.app(scope, receive, send)
+            return
+        names, values = headers
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", [])
+                    if header[0].lower() not in names
+                ] + values
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _headers_for(self, path: str) -> Optional[EncodedHeaders]:
+        """Returns the encoded headers for a request path."""
+        for prefix, headers in self.routes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return headers
+        return self.default
+
+
+def _encode(headers: HeaderMap) -> EncodedHeaders:
+    """Encodes headers once into ASGI (name, value) byte pairs."""
+    values = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+        if value is not None
+    ]
+    return frozenset(name for name, _ in values), values
@@ -0,0 +1,59 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.prometheus import UNMATCHED_ROUTE, observe_request
+from app.utils.request_timing import RequestTiming, request_timing_var
+
+SERVER_TIMING_HEADER = b"server-timing"
+
+
+class RequestTimingMiddleware:
+    """
+    Breaks each request's time down into DB, pool wait and LLM time.
+
+    Requests are recorded in the Prometheus metrics under their route
+    template (``/orders/{order_id}``), so ids do not explode the label
+    set. With ``server_timing`` the breakdown is also sent in a
+    ``Server-Timing`` header, as measured when the response starts.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    value = timing.server_timing(time.perf_counter() - start)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (SERVER_TIMING_HEADER, value.encode()),
+                    ]
+            await send(message)
+
+        token = request_timing_var.set(timing)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timing_var.reset(token)
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            observe_request(
+                scope["method"],
+                route,
+                status,
+                time.perf_counter() - start,
+                timing,
+            )
@@ -1,5 +1,6 @@
 from app.database import Base
 from app.models.order import Order , OrderItem
 from app.models.customer import Customer
+from app.models.product import CatalogVersion, Product
 
-__all__ = ["Base", "Order", "Product", "Customer", "OrderItem",]
+__all__ = ["Base", "Order", "Product", "CatalogVersion", "Customer", "OrderItem",]
@@ -1,14 +1,15 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Customer(Base):
     """Customer model"""
 
     __tablename__ = "customers"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
@@ -17,6 +18,14 @@ class Customer(Base):
     city = Column(String(50), nullable=False)
     state = Column(String(50), nullable=False)
     zip_code = Column(String(10), nullable=False)
+    # Bumped on every write; drives the ETags
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+    )
 
     orders = relationship(
         "Order", back_populates="customer", cascade="all, delete"
@@ -25,7 +34,12 @@ class Customer(Base):
     def __repr__(self):
         return str(self.id)
 
-    @property
+    @hybrid_property
     def full_name(self):
         """Return the full name of the customer"""
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+    @full_name.expression
+    def full_name(cls):
+        """SQL expression for the full name, used by column projections"""
+        return cls.first_name + " " + cls.last_name
\ No newline at end of file
@@ -1,4 +1,13 @@
-from sqlalchemy import DECIMAL, Column, Date, ForeignKey, Integer, String
+from sqlalchemy import (
+    DECIMAL,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -8,7 +17,20 @@ class Order(Base):
     """Order model"""
 
     __tablename__ = "orders"
-    id = Column(Integer, primary_key=True, index=True)
+    # Listings filter on one of these columns and page by id
+    __table_args__ = (
+        Index("ix_orders_customer_id_id", "customer_id", "id"),
+        Index("ix_orders_status_id", "status", "id"),
+        Index("ix_orders_total_amount", "total_amount"),
+        # Price filters over the pending orders a cancel run targets
+        Index(
+            "ix_orders_pending_total_amount",
+            "total_amount",
+            postgresql_where=text("status = 'Pending'"),
+            sqlite_where=text("status = 'Pending'"),
+        ),
+    )
+    id = Column(Integer, primary_key=True)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
     date = Column(Date, nullable=False)
     total_amount = Column(DECIMAL(10, 2), nullable=False)
@@ -24,9 +46,13 @@ class OrderItem(Base):
     """OrderItem model"""
 
     __tablename__ = "order_items"
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    order_id = Column(
+        Integer, ForeignKey("orders.id"), nullable=False, index=True
+    )
+    product_id = Column(
+        Integer, ForeignKey("products.id"), nullable=False, index=True
+    )
     quantity = Column(Integer, nullable=False)
     price = Column(DECIMAL(10, 2), nullable=False)
 
@@ -1,13 +1,61 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Text
-from app.database import Base
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    String,
+    DECIMAL,
+    Text,
+    event,
+    func,
+)
+from app.database import Base, utcnow
+
+# Id of the single catalog_version row
+CATALOG_VERSION_ID = 1
+
 
 class Product(Base):
     """Product model"""
 
     __tablename__ = "products"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     category = Column(String(50), nullable=False)
     price = Column(DECIMAL(10, 2), nullable=False)
     stock_quantity = Column(Integer, nullable=False)
+    # Bumped on every write (also by Core updates); drives the ETags
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+        index=True,
+    )
+
+
+class CatalogVersion(Base):
+    """
+    Single-row counter of catalog edits, part of the products listing ETag.
+
+    Incremented in the transaction of every product create, update and
+    delete made through ``invalidate_on_commit``. Stock-only writes leave
+    it alone, so concurrent orders do not queue on this row.
+    """
+
+    __tablename__ = "catalog_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+event.listen(
+    CatalogVersion.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO catalog_version (id, version) "
+        f"VALUES ({CATALOG_VERSION_ID}, 0)"
+    ),
+)
@@ -0,0 +1,68 @@
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_read_db
+from app.dependencies import require_admin
+from app.services.nlp_cache import result_cache, translation_cache
+from app.services.schema_cache import schema_cache
+from app.utils.query_profiler import query_profiler
+
+router = APIRouter(
+    prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/nlp/schema", response_model=dict)
+async def nlp_schema(db: AsyncSession = Depends(get_async_read_db)):
+    """Returns the cached schema used by the NLP prompt."""
+    return (await schema_cache.get(db)).to_dict()
+
+
+@router.post("/nlp/schema/refresh", response_model=dict)
+async def refresh_nlp_schema(db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Rebuilds the cached NLP schema, e.g. right after a migration.
+
+    Only the serving worker process (``pid``) rebuilds it; the others
+    pick up a new Alembic revision on their next periodic check.
+    """
+    schema = await schema_cache.refresh(db)
+    return {
+        "version": schema.version,
+        "source": schema.source,
+        "pid": os.getpid(),
+    }
+
+
+@router.delete("/nlp/cache", response_model=dict)
+async def clear_nlp_cache():
+    """
+    Drops cached NLP translations and results.
+
+    Results, and translations with the memory backend, are cached per
+    worker process: only those of the serving one (``pid``) are dropped.
+    """
+    await translation_cache.clear()
+    result_cache.clear()
+    return {"message": "NLP caches cleared.", "pid": os.getpid()}
+
+
+@router.get("/query-stats", response_model=dict)
+def query_stats(
+    order_by: Literal[
+        "total", "mean", "max", "calls", "rows", "errors"
+    ] = "total",
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """Returns the statement fingerprints of the serving worker process."""
+    return query_profiler.snapshot(order_by=order_by, limit=limit)
+
+
+@router.delete("/query-stats", response_model=dict)
+def reset_query_stats():
+    """Resets the statement stats of the serving worker process."""
+    query_profiler.reset()
+    return {"message": "Query stats reset.", "pid": os.getpid()}
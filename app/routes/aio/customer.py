@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.customer import Customer
+from app.routes.customer import CUSTOMER_LIST
+from app.schemas.customers import CustomerResponse
+from app.database import get_async_read_db
+from app.utils.conditional import conditional_get, weak_etag
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    apaginate,
+)
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
+
+router = APIRouter(prefix="/customers", tags=["Customers"])
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[CustomerResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
+async def get_customers(
+    request: Request,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Fetch all customers"""
+    page = await apaginate(
+        db,
+        db.sync_session.query(Customer),
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=CUSTOMER_LIST,
+    )
+    return model_response(page)
+
+
+@router.get("/{customer_id}", response_model=CustomerResponse)
+async def get_customer(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Fetch customer by ID"""
+    customer = await db.scalar(
+        select(Customer).filter(Customer.id == customer_id)
+    )
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    # Personal data: cacheable by the client only, never by shared caches
+    etag = weak_etag(customer.id, customer.updated_at)
+    not_modified = conditional_get(request, response, etag, public=False)
+    return not_modified or customer
@@ -0,0 +1,146 @@
+from typing import List
+from fastapi import Depends, APIRouter, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
+from app.routes.orders import ORDER_LIST
+from app.schemas.orders import (
+    OrderBulkCreateSchema,
+    OrderBulkResponse,
+    OrderCancelSchema,
+    OrderCreateSchema,
+    OrderFilter,
+    OrderResponse,
+    OrderDetailResponse,
+)
+from app.services.order import AsyncOrderService
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    apaginate,
+)
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
+
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"description": "Order created successfully"},
+        400: {"description": "Bad request"},
+        500: {"description": "Internal server error"},
+    },
+)
+async def create(
+    order: OrderCreateSchema, db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new order"""
+    is_success, message, status_code = await AsyncOrderService(
+        db
+    ).create_order(order)
+    if not is_success:
+        raise HTTPException(status_code=status_code, detail=message)
+    await db.commit()
+    return {"message": message}
+
+
+@router.post("/bulk", response_model=OrderBulkResponse)
+async def create_bulk(
+    batch: OrderBulkCreateSchema, db: AsyncSession = Depends(get_async_db)
+):
+    """Create a batch of orders, reporting success per order"""
+    is_success, message, result = await AsyncOrderService(
+        db
+    ).create_orders_bulk(batch.orders)
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    return result
+
+
+@router.post("/cancel", response_model=dict)
+async def cancel(
+    selection: OrderCancelSchema, db: AsyncSession = Depends(get_async_db)
+):
+    """Cancel orders by id or by filter, restoring their stock"""
+    is_success, message, result = await AsyncOrderService(db).cancel_orders(
+        selection.order_ids, selection.filters
+    )
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    await db.commit()
+    return {"message": message, "cancelled": result}
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[OrderResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
+async def order_list(
+    request: Request,
+    filters: OrderFilter = Depends(),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Retrieve orders with optional filtering and pagination"""
+    is_success, message, query = await AsyncOrderService(db).get_orders(
+        filters
+    )
+    if not is_success:
+        raise HTTPException(status_code=query, detail=message)
+
+    page = await apaginate(
+        db,
+        query,
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=ORDER_LIST,
+    )
+    return model_response(page)
+
+
+@router.get("/{order_id}", response_model=OrderDetailResponse)
+async def detail(order_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Return Order Detail"""
+    is_success, message, result = await AsyncOrderService(db).get_order(
+        order_id
+    )
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    return result
+
+
+@router.delete("/{order_id}", response_model=dict)
+async def delete(order_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete an order"""
+    is_success, message, status_code = await AsyncOrderService(
+        db
+    ).delete_order(order_id)
+    if not is_success:
+        raise HTTPException(status_code=status_code, detail=message)
+    await db.commit()
+    return {"message": message}
+
+
+@router.get(
+    "/customer/{customer_id}",
+    response_model=List[OrderResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
+async def customer_orders(
+    customer_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Return customer orders"""
+    is_success, message, result = await AsyncOrderService(
+        db
+    ).get_customer_orders(customer_id)
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    return result
@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
+from app.routes.products import PRODUCT_LIST
+from app.services.products import AsyncProductService
+from app.schemas.products import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+)
+from app.utils.conditional import conditional_get, weak_etag
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    apaginate,
+)
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
+
+router = APIRouter(prefix="/products", tags=["Products"])
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[ProductResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
+async def get_products(
+    request: Request,
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Retrieve all products."""
+    service = AsyncProductService(db)
+    is_success, message, version = await service.get_catalog_version()
+    if not is_success:
+        raise HTTPException(status_code=version, detail=message)
+    # Any write bumps the watermark, so a match skips the page queries
+    etag = weak_etag(*version, request.url.query)
+    not_modified = conditional_get(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    is_success, message, result = await service.get_all_products()
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    page = await apaginate(
+        db,
+        result,
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=PRODUCT_LIST,
+    )
+    return model_response(page, response)
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Retrieve a specific product."""
+    is_success, message, result = await AsyncProductService(db).get_product(
+        product_id
+    )
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    etag = weak_etag(result.id, result.updated_at)
+    return conditional_get(request, response, etag) or result
+
+
+@router.post("/", response_model=dict)
+async def create_product(
+    product: ProductCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new product."""
+    is_success, message, status_code = await AsyncProductService(
+        db
+    ).create_product(product)
+    if not is_success:
+        raise HTTPException(status_code=status_code, detail=message)
+    await db.commit()
+    return {"message": message}
+
+
+@router.put("/{product_id}", response_model=dict)
+async def update_product(
+    product_id: int,
+    data: ProductUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update an existing product."""
+    is_success, message, status_code = await AsyncProductService(
+        db
+    ).update_product(product_id, data)
+    if not is_success:
+        raise HTTPException(status_code=status_code, detail=message)
+    await db.commit()
+    return {"message": message}
+
+
+@router.delete("/{product_id}", response_model=dict)
+async def delete_product(
+    product_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a product."""
+    is_success, message, status_code = await AsyncProductService(
+        db
+    ).delete_product(product_id)
+    if not is_success:
+        raise HTTPException(status_code=status_code, detail=message)
+    await db.commit()
+    return {"message": message}
@@ -1,28 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.models.customer import Customer
 from app.schemas.customers import CustomerResponse
-from app.database import get_db
-from app.utils.pagination import PaginatedResponse, paginate
+from app.database import get_read_db
+from app.utils.conditional import conditional_get, weak_etag
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    paginate,
+)
+from app.utils.projection import Projection
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
 
 router = APIRouter(prefix="/customers", tags=["Customers"])
 
+CUSTOMER_LIST = Projection(Customer, CustomerResponse)
 
-@router.get("/", response_model=PaginatedResponse[CustomerResponse])
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[CustomerResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
 def get_customers(
     request: Request,
-    page: int = 1,
-    page_size: int = 10,
-    db: Session = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: Session = Depends(get_read_db),
 ):
     """Fetch all customers"""
-    return paginate(db.query(Customer), page, page_size, request)
+    page = paginate(
+        db.query(Customer),
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=CUSTOMER_LIST,
+    )
+    return model_response(page)
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
+def get_customer(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     """Fetch customer by ID"""
     customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    # Personal data: cacheable by the client only, never by shared caches
+    etag = weak_etag(customer.id, customer.updated_at)
+    not_modified = conditional_get(request, response, etag, public=False)
+    return not_modified or customer
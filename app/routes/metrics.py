@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Response
+
+from app.database import replicas
+from app.services.nlp_cache import nlp_cache_snapshot
+from app.services.product_cache import product_cache
+from app.utils.logger import log_stats
+from app.utils.pool_metrics import pool_snapshot
+from app.utils.prometheus import render
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("", response_class=Response)
+def prometheus_metrics():
+    """Prometheus metrics of every worker process, in text format."""
+    content, media_type = render()
+    return Response(content=content, media_type=media_type)
+
+
+@router.get("/pool", response_model=dict)
+def pool_metrics():
+    """Connection pool usage of the worker process serving the request."""
+    return pool_snapshot()
+
+
+@router.get("/nlp-cache", response_model=dict)
+def nlp_cache_metrics():
+    """NLP translation/result cache hits of the serving worker process."""
+    return nlp_cache_snapshot()
+
+
+@router.get("/product-cache", response_model=dict)
+def product_cache_metrics():
+    """Product catalog/stock cache hits of the serving worker process."""
+    return product_cache.snapshot()
+
+
+@router.get("/replicas", response_model=dict)
+def replica_metrics():
+    """Read replica health as last seen by the serving worker process."""
+    return replicas.snapshot()
+
+
+@router.get("/logging", response_model=dict)
+def logging_metrics():
+    """Log queue depth and dropped records of the serving worker process."""
+    return log_stats()
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.nlp import QueryRequest, QueryResponse
-from app.services.nlp import NLPQueryService
+from app.config import settings
+from app.database import get_async_read_db
+from app.schemas.nlp import QueryRequest, QueryResponse, StreamFormat
+from app.services.nlp import NLPQueryService, stream_media_type
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/nlp", tags=["NLP"])
@@ -11,17 +13,24 @@ router = APIRouter(prefix="/nlp", tags=["NLP"])
 
 @router.post("/generate-sql", response_model=QueryResponse)
 async def generate_sql_query(
-    request: QueryRequest, db: Session = Depends(get_db)
+    request: QueryRequest, db: AsyncSession = Depends(get_async_read_db)
 ):
     """Generates and executes an SQL query from a natural language request."""
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty.")
 
     try:
-        response = NLPQueryService.generate_and_execute_sql(request.query, db)
+        response = await NLPQueryService.generate_and_execute_sql(
+            request.query, db
+        )
 
         if response.error:
-            return QueryResponse(sql_query="", error=response.error, result=[])
+            return QueryResponse(
+                sql_query="",
+                error=response.error,
+                result=[],
+                plan=response.plan,
+            )
 
         return response
 
@@ -30,3 +39,29 @@ async def generate_sql_query(
         raise HTTPException(
             status_code=500, detail=f"Error processing query: {str(e)}"
         ) from e
+
+
+@router.post("/generate-sql/stream")
+async def stream_sql_query(
+    request: QueryRequest,
+    format: StreamFormat = StreamFormat.NDJSON,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Generates an SQL query and streams its result as NDJSON or CSV."""
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty.")
+
+    sql_query, error, _ = await NLPQueryService.translate(request.query, db)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    plan = await NLPQueryService.check_plan(
+        db, sql_query, max_rows=settings.NLP_STREAM_MAX_ROWS
+    )
+    if plan is not None and plan.rejected:
+        raise HTTPException(status_code=400, detail=plan.reason)
+
+    return StreamingResponse(
+        NLPQueryService.stream_query(sql_query, format),
+        media_type=stream_media_type(format),
+    )
@@ -1,19 +1,33 @@
 from typing import List
 from fastapi import Depends, APIRouter, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.orders import (
+    OrderBulkCreateSchema,
+    OrderBulkResponse,
+    OrderCancelSchema,
     OrderCreateSchema,
     OrderFilter,
     OrderResponse,
     OrderDetailResponse,
 )
+from app.models.order import Order
 from app.services.order import OrderService
 from app.dependencies import router
-from app.utils.pagination import PaginatedResponse, paginate
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    paginate,
+)
+from app.utils.projection import Projection
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+ORDER_LIST = Projection(Order, OrderResponse)
+
 
 @router.post(
     "/",
@@ -33,24 +47,60 @@ def create(order: OrderCreateSchema, db: Session = Depends(get_db)):
     return {"message": message}
 
 
-@router.get("/", response_model=PaginatedResponse[OrderResponse])
+@router.post("/bulk", response_model=OrderBulkResponse)
+def create_bulk(batch: OrderBulkCreateSchema, db: Session = Depends(get_db)):
+    """Create a batch of orders, reporting success per order"""
+    is_success, message, result = OrderService(db).create_orders_bulk(
+        batch.orders
+    )
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    return result
+
+
+@router.post("/cancel", response_model=dict)
+def cancel(selection: OrderCancelSchema, db: Session = Depends(get_db)):
+    """Cancel orders by id or by filter, restoring their stock"""
+    is_success, message, result = OrderService(db).cancel_orders(
+        selection.order_ids, selection.filters
+    )
+    if not is_success:
+        raise HTTPException(status_code=result, detail=message)
+    db.commit()
+    return {"message": message, "cancelled": result}
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[OrderResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
 def order_list(
     request: Request,
     filters: OrderFilter = Depends(),
-    page: int = 1,
-    page_size: int = 10,
-    db: Session = Depends(get_db),
+    pagination: PaginationParams = Depends(),
+    db: Session = Depends(get_read_db),
 ):
     """Retrieve orders with optional filtering and pagination"""
     is_success, message, query = OrderService(db).get_orders(filters)
     if not is_success:
         raise HTTPException(status_code=query, detail=message)
 
-    return paginate(query, page, page_size, request)
+    page = paginate(
+        query,
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=ORDER_LIST,
+    )
+    return model_response(page)
 
 
 @router.get("/{order_id}", response_model=OrderDetailResponse)
-def detail(order_id: int, db: Session = Depends(get_db)):
+def detail(order_id: int, db: Session = Depends(get_read_db)):
     """Return Order Detail"""
     is_success, message, result = OrderService(db).get_order(order_id)
     if not is_success:
@@ -68,8 +118,12 @@ def delete(order_id: int, db: Session = Depends(get_db)):
     return {"message": message}
 
 
-@router.get("/customer/{customer_id}", response_model=List[OrderResponse])
-def customer_orders(customer_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/customer/{customer_id}",
+    response_model=List[OrderResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
+def customer_orders(customer_id: int, db: Session = Depends(get_read_db)):
     """Return customer orders"""
     is_success, message, result = OrderService(db).get_customer_orders(
         customer_id
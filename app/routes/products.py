@@ -1,38 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.models.product import Product
 from app.services.products import ProductService
 from app.schemas.products import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
 )
-from app.utils.pagination import PaginatedResponse, paginate
+from app.utils.conditional import conditional_get, weak_etag
+from app.utils.constants import LIST_QUERY_BUDGET
+from app.utils.pagination import (
+    PaginatedResponse,
+    PaginationParams,
+    paginate,
+)
+from app.utils.projection import Projection
+from app.utils.query_counter import statement_budget
+from app.utils.responses import model_response
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+PRODUCT_LIST = Projection(Product, ProductResponse)
+
 
-@router.get("/", response_model=PaginatedResponse[ProductResponse])
+@router.get(
+    "/",
+    response_model=PaginatedResponse[ProductResponse],
+    dependencies=[Depends(statement_budget(LIST_QUERY_BUDGET))],
+)
 def get_products(
     request: Request,
-    page: int = 1,
-    page_size: int = 10,
-    db: Session = Depends(get_db)
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    db: Session = Depends(get_read_db)
     ):
     """Retrieve all products."""
-    is_success, message, result = ProductService(db).get_all_products()
+    service = ProductService(db)
+    is_success, message, version = service.get_catalog_version()
+    if not is_success:
+        raise HTTPException(status_code=version, detail=message)
+    # Any write bumps the watermark, so a match skips the page queries
+    etag = weak_etag(*version, request.url.query)
+    not_modified = conditional_get(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    is_success, message, result = service.get_all_products()
     if not is_success:
         raise HTTPException(status_code=result, detail=message)
-    return paginate(result, page, page_size, request)
+    page = paginate(
+        result,
+        pagination.page,
+        pagination.page_size,
+        request,
+        cursor=pagination.cursor,
+        with_count=pagination.with_count,
+        count_strategy=pagination.count,
+        projection=PRODUCT_LIST,
+    )
+    return model_response(page, response)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     """Retrieve a specific product."""
     is_success, message, result = ProductService(db).get_product(product_id)
     if not is_success:
         raise HTTPException(status_code=result, detail=message)
-    return result
+    etag = weak_etag(result.id, result.updated_at)
+    return conditional_get(request, response, etag) or result
 
 
 @router.post("/", response_model=dict)
@@ -1,6 +1,9 @@
-from typing import List, Any
+from enum import Enum
+from typing import List, Any, Optional
 from pydantic import BaseModel
 
+from app.config import settings
+
 
 class QueryRequest(BaseModel):
     """Schema for handling natural language query requests"""
@@ -8,9 +11,37 @@ class QueryRequest(BaseModel):
     query: str
 
 
+class PlanSummary(BaseModel):
+    """Planner estimate for a generated query"""
+
+    node_type: str
+    total_cost: float
+    plan_rows: int
+    limited: bool = False
+    rejected: bool = False
+    reason: str = ""
+
+    def within_limits(self) -> bool:
+        """Whether the estimate is below the configured thresholds"""
+        return (
+            self.total_cost <= settings.NLP_MAX_PLAN_COST
+            and self.plan_rows <= settings.NLP_MAX_PLAN_ROWS
+        )
+
+
 class QueryResponse(BaseModel):
     """Schema for returning the generated SQL query and its execution result"""
 
     sql_query: str
     error: str
     result: List[Any]
+    row_count: int = 0
+    truncated: bool = False
+    plan: Optional[PlanSummary] = None
+
+
+class StreamFormat(str, Enum):
+    """Body format of a streamed query result"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,14 +1,17 @@
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import (
     BaseModel,
     Field,
     field_validator,
+    model_validator,
     PositiveInt,
     PositiveFloat,
 )
 
+from app.config import settings
+
 
 class OrderItemSchema(BaseModel):
     """Schema for an order item"""
@@ -63,6 +66,36 @@ class OrderCreateSchema(BaseModel):
         return items
 
 
+class OrderBulkCreateSchema(BaseModel):
+    """
+    Schema for a batch of orders
+
+    Orders are validated one by one by the service (as OrderCreateSchema),
+    so an invalid order fails alone instead of rejecting the batch.
+    """
+
+    orders: List[Dict[str, Any]] = Field(
+        min_length=1, max_length=settings.ORDER_BULK_MAX
+    )
+
+
+class OrderBulkResult(BaseModel):
+    """Outcome of one order in a batch"""
+
+    index: int
+    success: bool
+    order_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class OrderBulkResponse(BaseModel):
+    """Response schema for a batch of orders"""
+
+    created: int
+    failed: int
+    results: List[OrderBulkResult]
+
+
 class OrderFilter(BaseModel):
     """Filter options for orders"""
 
@@ -105,3 +138,24 @@ class OrderDetailResponse(OrderResponse):
         """Configuration for OrderDetailResponse"""
 
         from_attributes = True
+
+
+class OrderCancelSchema(BaseModel):
+    """Schema for cancelling orders by id or by filter"""
+
+    order_ids: Optional[List[PositiveInt]] = None
+    filters: Optional[OrderFilter] = None
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        """Require exactly one non-empty selection"""
+        if (self.order_ids is None) == (self.filters is None):
+            raise ValueError("Provide either order_ids or filters.")
+        if self.order_ids is not None and not self.order_ids:
+            raise ValueError("order_ids cannot be empty.")
+        # search narrows order lists only; it selects nothing to cancel
+        if self.filters is not None and not self.filters.model_dump(
+            exclude_none=True, exclude={"search"}
+        ):
+            raise ValueError("At least one filter is required.")
+        return self
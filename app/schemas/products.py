@@ -21,6 +21,9 @@ class ProductBase(BaseModel):
 class ProductCreate(ProductBase):
     """Schema for creating a Product."""
 
+    category: str
+    description: Optional[str] = None
+
 
 class ProductUpdate(ProductBase):
     """Schema for updating a Product with optional fields."""
@@ -0,0 +1,259 @@
+"""
+Production server: a preforking supervisor running uvicorn workers.
+
+    python -m app.serve [--workers N] [--host H] [--port P]
+
+The app is imported once in the supervisor and each worker is forked
+from it, so the imported code and module state are shared copy-on-write
+instead of being loaded once per worker. Workers share one listening
+socket, run uvloop and httptools, and are replaced if they die. On
+SIGTERM or SIGINT every worker stops accepting connections, finishes
+its in-flight requests (up to SERVER_GRACEFUL_TIMEOUT seconds), runs
+the app's shutdown and exits; stragglers are killed after that.
+Settings are read from the environment (see ``SERVER_*`` in
+app/config.py); the flags override them.
+
+All processes log to the console only, for the container runtime to
+collect: workers cannot share the rotating logs/app.log. Caches, query
+stats and other in-memory state are per worker, and so are the admin
+actions resetting them; their responses carry the worker's ``pid``.
+"""
+
+import argparse
+import gc
+import glob
+import math
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Optional
+
+import uvicorn
+
+from app.config import settings
+from app.utils.logger import (
+    disable_file_logging,
+    logger,
+    start_logging,
+    stop_logging,
+)
+
+# Seconds a worker must live before it is replaced without a pause, so a
+# worker that crashes on start does not fork in a tight loop
+MIN_WORKER_LIFETIME = 5
+# Seconds workers get past the graceful timeout before being killed
+KILL_GRACE = 5
+# Exit status of a worker that could not start serving (bad settings, a
+# failing startup); the supervisor then shuts down instead of retrying
+BOOT_ERROR = 3
+
+
+def cpu_count() -> int:
+    """CPUs this process may use: affinity and a cgroup v2 quota apply."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            count = min(count, max(math.ceil(int(quota) / int(period)), 1))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+def worker_count(configured: int) -> int:
+    """SERVER_WORKERS, or one worker per usable CPU when it is 0."""
+    return configured if configured > 0 else cpu_count()
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Opens the listening socket every worker accepts on."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def clear_metrics_dir() -> None:
+    """Drops the Prometheus samples of a previous run of the server."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+class Supervisor:
+    """Forks the workers, replaces dead ones and stops them on a signal."""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        # pid -> start time
+        self.children: dict[int, float] = {}
+        self.stopping = False
+        self.exit_status = 0
+
+    def run(self) -> int:
+        """
+        Serves until SIGTERM or SIGINT, then drains the workers.
+
+        :return: The supervisor's exit status
+        """
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logger.info(
+            "Starting %s workers on %s (pid %s)",
+            self.workers,
+            self.sock.getsockname(),
+            os.getpid(),
+        )
+        # Objects created so far are never collected, so the collector
+        # does not touch (and copy) the pages shared with the workers
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+        while not self.stopping:
+            self.reap()
+            time.sleep(0.5)
+        self.stop()
+        return self.exit_status
+
+    def spawn(self) -> None:
+        """Forks one worker."""
+        # The log listener thread would not survive the fork, and could
+        # leave the log queue locked in the child
+        stop_logging()
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        start_logging()
+        self.children[pid] = time.monotonic()
+
+    def reap(self) -> None:
+        """Replaces the workers that exited."""
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code == BOOT_ERROR:
+                logger.error("Worker %s failed to start; exiting", pid)
+                self.stopping = True
+                self.exit_status = BOOT_ERROR
+                return
+            logger.warning(
+                "Worker %s exited (status %s); replacing it", pid, exit_code
+            )
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(1)
+            self.spawn()
+
+    def stop(self) -> None:
+        """Asks every worker to drain and kills those that do not."""
+        logger.info("Stopping %s workers", len(self.children))
+        for pid in self.children:
+            _signal(pid, signal.SIGTERM)
+        deadline = (
+            time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT + KILL_GRACE
+        )
+        while self.children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Killing worker %s", pid)
+            _signal(pid, signal.SIGKILL)
+        self.sock.close()
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _run_worker(self) -> None:
+        """Serves in a forked worker; never returns."""
+        # Loaded with the app, once the metrics directory was cleared
+        from app.database import dispose_engines
+
+        # uvicorn handles SIGTERM/SIGINT while serving; ignoring them
+        # until then keeps the supervisor's handlers out of the worker
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        status = BOOT_ERROR
+        server = None
+        try:
+            start_logging()
+            # Connections must not be shared with the parent
+            dispose_engines(close=False)
+            server = uvicorn.Server(
+                uvicorn.Config(
+                    self.app,
+                    loop=settings.SERVER_LOOP,
+                    http=settings.SERVER_HTTP,
+                    lifespan="on",
+                    backlog=settings.SERVER_BACKLOG,
+                    timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+                    timeout_graceful_shutdown=(
+                        settings.SERVER_GRACEFUL_TIMEOUT
+                    ),
+                    access_log=settings.SERVER_ACCESS_LOG,
+                )
+            )
+            server.run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker %s failed", os.getpid())
+        finally:
+            if server is not None and server.started:
+                status = 0 if server.should_exit else 1
+            dispose_engines()
+            stop_logging()
+            os._exit(status)
+
+
+def _signal(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Binds the socket, preloads the app and supervises the workers."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help="Worker processes; 0 for one per CPU (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    disable_file_logging()
+    # Before the app creates its metric files
+    clear_metrics_dir()
+    # Preloaded here, in the supervisor, before any worker is forked
+    from app.main import app
+
+    sock = bind_socket(args.host, args.port, settings.SERVER_BACKLOG)
+    sys.exit(Supervisor(app, sock, worker_count(args.workers)).run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from google import genai
+from google.genai import types
+
+from app.config import settings
+
+
+class LLMBackend(ABC):
+    """Base class for the model that turns prompts into SQL."""
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> str:
+        """Returns the raw text completion for ``prompt``."""
+
+
+class GeminiBackend(LLMBackend):
+    """Gemini through the async client, shared by every request."""
+
+    def __init__(self):
+        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+
+    async def generate(self, prompt: str) -> str:
+        contents = [
+            types.Content(
+                role="user", parts=[types.Part.from_text(text=prompt)]
+            )
+        ]
+        response = await self.client.aio.models.generate_content(
+            model=settings.NLP_MODEL, contents=contents
+        )
+        return response.text
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Stand-in model for offline load tests: waits ``NLP_FAKE_LATENCY_MS``
+    and answers every prompt with ``NLP_FAKE_SQL``.
+    """
+
+    async def generate(self, prompt: str) -> str:
+        await asyncio.sleep(settings.NLP_FAKE_LATENCY_MS / 1000)
+        return json.dumps({"sql_query": settings.NLP_FAKE_SQL, "error": ""})
+
+
+BACKENDS = {"gemini": GeminiBackend, "fake": FakeLLMBackend}
+
+# Caps in-flight LLM calls per worker; extra requests queue here.
+_llm_slots = asyncio.Semaphore(settings.NLP_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=None)
+def get_llm_backend() -> LLMBackend:
+    """Returns the process-wide backend selected by NLP_LLM_BACKEND."""
+    return BACKENDS[settings.NLP_LLM_BACKEND]()
+
+
+async def generate(prompt: str) -> str:
+    """
+    Calls the configured backend under the concurrency limit.
+
+    ``NLP_LLM_TIMEOUT`` covers the wait for a slot and the call itself;
+    ``asyncio.TimeoutError`` is raised when it is exceeded.
+    """
+
+    async def limited() -> str:
+        async with _llm_slots:
+            return await get_llm_backend().generate(prompt)
+
+    return await asyncio.wait_for(limited(), timeout=settings.NLP_LLM_TIMEOUT)
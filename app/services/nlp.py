@@ -1,45 +1,71 @@
+import asyncio
+import csv
+import io
 import json
-from sqlalchemy.orm import Session
+import re
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
 from fastapi import HTTPException
 
-from google import genai
-from google.genai import types
 from app.config import settings
-from app.schemas.nlp import QueryResponse
+from app.database import AsyncSessionLocal, async_read_engine
+from app.schemas.nlp import PlanSummary, QueryResponse, StreamFormat
+from app.services import llm
+from app.services.nlp_cache import result_cache, translation_cache
+from app.services.schema_cache import schema_cache
 from app.utils.logger import logger
+from app.utils.prometheus import LLM_DURATION
+from app.utils.request_timing import record_llm_call
+
+# Whole words only, so columns such as updated_at do not match
+DANGEROUS_SQL_RE = re.compile(
+    r"\b(?:DROP|DELETE|TRUNCATE|ALTER|UPDATE|INSERT)\b", re.IGNORECASE
+)
 
 
 class NLPQueryService:
     """Handles SQL generation and execution logic."""
 
     @staticmethod
-    def generate_and_execute_sql(
-        natural_language_query: str, db: Session
+    async def generate_and_execute_sql(
+        natural_language_query: str, db: AsyncSession
     ) -> QueryResponse:
         """Generates SQL from natural language, validates, and executes it."""
 
-        schema_str = NLPQueryService.get_database_schema(db)
-        prompt = NLPQueryService.create_prompt(
-            natural_language_query, schema_str
+        sql_query, error, schema_version = await NLPQueryService.translate(
+            natural_language_query, db
         )
-
-        sql_query, error = NLPQueryService.call_gemini_api(prompt)
-
         if error:
             return QueryResponse(sql_query="", error=error, result=[])
 
-        if NLPQueryService.is_query_dangerous(sql_query):
+        try:
+            cached = result_cache.get(sql_query, schema_version)
+            if cached is None:
+                plan = await NLPQueryService.check_plan(db, sql_query)
+                if plan is not None and plan.rejected:
+                    return QueryResponse(
+                        sql_query="", error=plan.reason, result=[], plan=plan
+                    )
+                results, truncated = await NLPQueryService.execute_query(
+                    db, sql_query
+                )
+                cached = results, truncated, plan
+                result_cache.set(sql_query, schema_version, cached)
+            results, truncated, plan = cached
             return QueryResponse(
-                sql_query="",
-                error="Destructive SQL commands are not allowed.",
-                result=[],
+                sql_query=sql_query,
+                error="",
+                result=results,
+                row_count=len(results),
+                truncated=truncated,
+                plan=plan,
             )
-
-        try:
-            results = NLPQueryService.execute_query(db, sql_query)
-            return QueryResponse(sql_query=sql_query, error="", result=results)
         except Exception as e:
             logger.error("SQL execution failed: %s", e, exc_info=True)
             return QueryResponse(
@@ -47,116 +73,393 @@ class NLPQueryService:
             )
 
     @staticmethod
-    def create_prompt(natural_language_query: str, schema_str: str) -> str:
-        """Creates the prompt for the AI model."""
-        return f"""
-        You are an expert in SQL query generation. Given the following database schema:
+    async def translate(
+        natural_language_query: str, db: AsyncSession
+    ) -> tuple[str, str, str]:
+        """
+        Turns a question into a validated SQL query.
 
-        ### Database Schema:
-        {schema_str}
+        :return: Tuple of the SQL query, an error message (empty on
+            success) and the schema version the query was written for
+        """
+        schema = await schema_cache.get(db)
+        sql_query = await translation_cache.get(
+            natural_language_query, schema.version
+        )
+        if sql_query is None:
+            prompt = NLPQueryService.create_prompt(
+                natural_language_query, schema.text
+            )
+            start = time.perf_counter()
+            sql_query, error = await NLPQueryService.call_gemini_api(prompt)
+            llm_ms = (time.perf_counter() - start) * 1000
 
-        Convert the following natural language query into an SQL query:
-        "{natural_language_query}"
+            if error:
+                return "", error, schema.version
+            await translation_cache.set(
+                natural_language_query, schema.version, sql_query, llm_ms
+            )
 
-        ### Requirements:
-        - Ensure the SQL query is syntactically correct.
-        - Use only the tables and columns present in the provided schema.
-        - Avoid unnecessary joins for optimal performance.
-        - Validate that all referenced tables and columns exist in the schema.
-        - If a table or column is missing, return an error message specifying which one.
-        - If the input query is unclear, return a validation error.
-        - **Ensure text comparisons are case-insensitive.**
-        - Use `ILIKE` for PostgreSQL.
-        - Use `LOWER(column) = LOWER(value)` for MySQL/SQLite.
+        if NLPQueryService.is_query_dangerous(sql_query):
+            return (
+                "",
+                "Destructive SQL commands are not allowed.",
+                schema.version,
+            )
+        return sql_query, "", schema.version
 
-        ### Response Format:
-        Return the response as a JSON object with:
-        - `"sql_query"`: A string containing the generated SQL query (empty if an error occurs).
-        - `"error"`: A string describing any validation issue (empty if no error occurs).
-        """
+    @staticmethod
+    def create_prompt(natural_language_query: str, schema_str: str) -> str:
+        """Creates the prompt for the AI model."""
+        return (
+            _prompt_prefix(schema_str)
+            + f'"{natural_language_query}"'
+            + PROMPT_REQUIREMENTS
+        )
 
     @staticmethod
-    def call_gemini_api(prompt: str) -> tuple[str, str]:
+    async def call_gemini_api(prompt: str) -> tuple[str, str]:
         """Calls the Gemini API and returns SQL query and any errors."""
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
-            model = "gemini-2.0-flash"
-            contents = [
-                types.Content(
-                    role="user", parts=[types.Part.from_text(text=prompt)]
-                )
-            ]
-
-            response = client.models.generate_content(
-                model=model, contents=contents
-            )
-
-            # Ensure response is valid JSON
-            response_text = response.text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-
-            response_json = json.loads(response_text)
-            return (
-                response_json.get("sql_query", "").strip(),
-                response_json.get("error", "").strip(),
-            )
+            response_text = await llm.generate(prompt)
+            outcome = "ok"
+            return NLPQueryService.parse_response(response_text)
 
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.error("Timed out waiting for the AI model")
+            return "", "AI model timed out. Please try again later."
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from Gemini API")
             return "", "Invalid response format from AI model."
         except Exception as e:
             logger.error("Error calling Gemini API: %s",e, exc_info=True)
             return "", "Error generating SQL query."
+        finally:
+            elapsed = time.perf_counter() - start
+            LLM_DURATION.labels(settings.NLP_LLM_BACKEND, outcome).observe(
+                elapsed
+            )
+            record_llm_call(elapsed)
 
     @staticmethod
-    def execute_query(db: Session, query: str) -> list[dict]:
-        """Executes an SQL query and returns results."""
+    def parse_response(response_text: str) -> tuple[str, str]:
+        """Extracts the SQL query and error from the model's JSON reply."""
+        # Ensure response is valid JSON
+        response_text = response_text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+
+        response_json = json.loads(response_text)
+        return (
+            response_json.get("sql_query", "").strip(),
+            response_json.get("error", "").strip(),
+        )
+
+    @staticmethod
+    async def execute_query(
+        db: AsyncSession, query: str, max_rows: int = settings.NLP_MAX_ROWS
+    ) -> tuple[list[dict], bool]:
+        """
+        Executes an SQL query read-only and returns at most ``max_rows``.
+
+        Rows are fetched through a server-side cursor, so a runaway query
+        never holds more than one batch beyond the cap in memory.
+
+        :return: Tuple of the rows and whether the result was truncated
+        """
         try:
-            result = db.execute(text(query)).fetchall()
-            return [dict(row._mapping) for row in result]
+            await NLPQueryService.begin_read_only(db)
+            result = await db.stream(bounded_query(query, max_rows))
+            rows: list[dict] = []
+            truncated = False
+            async for row in result.mappings():
+                if len(rows) == max_rows:
+                    truncated = True
+                    break
+                rows.append(dict(row))
+            await result.close()
+            return rows, truncated
         except SQLAlchemyError as e:
             logger.error("SQL execution error: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=400, detail="Error executing SQL query."
             ) from e
+        finally:
+            await db.rollback()
 
     @staticmethod
-    def get_database_schema(db: Session) -> str:
-        """Fetches database schema dynamically from PostgreSQL."""
-        result: list[tuple[str, str]] = db.execute(
-            text(
-                """
-                SELECT table_name, column_name
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                ORDER BY table_name, ordinal_position;
-                """
-            )
-        ).fetchall()
+    async def stream_query(
+        query: str,
+        fmt: StreamFormat,
+        max_rows: int = settings.NLP_STREAM_MAX_ROWS,
+    ) -> AsyncIterator[str]:
+        """
+        Executes an SQL query read-only and yields it as NDJSON or CSV.
+
+        Runs in its own read session because the response body is sent
+        after the request's dependencies have been closed. Rows are encoded one
+        fetch batch at a time, so memory stays flat however many rows the
+        query returns. A truncated result ends with a
+        ``{"__meta__": ...}`` line (NDJSON) or a ``# truncated`` comment
+        line (CSV); a failed one ends with an ``error`` in the same place.
+        """
+        encoder_class = _ENCODERS[fmt]
+        row_count = 0
+        async with AsyncSessionLocal(bind=await async_read_engine()) as db:
+            try:
+                await NLPQueryService.begin_read_only(db)
+                result = await db.stream(bounded_query(query, max_rows))
+                encoder = encoder_class(list(result.keys()))
+                header = encoder.header()
+                if header:
+                    yield header
+
+                truncated = False
+                async for batch in result.mappings().partitions():
+                    if row_count + len(batch) > max_rows:
+                        batch = batch[: max_rows - row_count]
+                        truncated = True
+                    row_count += len(batch)
+                    yield encoder.rows(batch)
+                    if truncated:
+                        break
+                await result.close()
+                yield encoder.footer(row_count, truncated)
+            except SQLAlchemyError as e:
+                # The status line is already sent; say so in the body.
+                logger.error("SQL streaming error: %s", e, exc_info=True)
+                yield encoder_class.error(
+                    row_count, "Error executing SQL query."
+                )
+            finally:
+                await db.rollback()
+
+    @staticmethod
+    async def check_plan(
+        db: AsyncSession,
+        query: str,
+        max_rows: int = settings.NLP_MAX_ROWS,
+    ) -> Optional[PlanSummary]:
+        """
+        Checks the planner's estimate for a query before it runs.
+
+        A query whose estimated total cost exceeds ``NLP_MAX_PLAN_COST``
+        or whose estimated rows exceed ``NLP_MAX_PLAN_ROWS`` is rejected.
+        With ``NLP_COST_GUARD=limit`` such a query is planned again with
+        the row cap applied, and accepted if the LIMIT alone brings its
+        cost within the threshold (e.g. a nested loop that stops early).
+
+        PostgreSQL only; returns None elsewhere or when the guard is off.
+        """
+        mode = settings.NLP_COST_GUARD
+        if mode == "off" or db.bind.dialect.name != "postgresql":
+            return None
+
+        try:
+            await NLPQueryService.begin_read_only(db)
+            plan = await explain(db, query)
+            if plan.within_limits():
+                return plan
+            if mode == "limit":
+                limited = await explain(db, bounded_sql(query, max_rows))
+                if limited.total_cost <= settings.NLP_MAX_PLAN_COST:
+                    limited.limited = True
+                    return limited
+        except SQLAlchemyError as e:
+            logger.error("EXPLAIN failed: %s", e, exc_info=True)
+            raise HTTPException(
+                status_code=400, detail="Error executing SQL query."
+            ) from e
+
+        plan.rejected = True
+        plan.reason = (
+            "Query is too expensive to run "
+            f"(estimated cost {plan.total_cost:.0f}, "
+            f"rows {plan.plan_rows})."
+        )
+        logger.warning("Rejected NLP query: %s %s", plan.reason, query)
+        return plan
 
-        schema: dict[str, list[str]] = {}
-        for table, column in result:
-            schema.setdefault(table, []).append(column)
+    @staticmethod
+    async def begin_read_only(db: AsyncSession) -> None:
+        """
+        Makes the current transaction read-only with a statement timeout.
 
-        return "\n".join(
-            [
-                f"{table} ({', '.join(columns)})"
-                for table, columns in schema.items()
-            ]
+        PostgreSQL only; both settings end with the transaction.
+        """
+        if db.bind.dialect.name != "postgresql":
+            return
+        await db.execute(text("SET TRANSACTION READ ONLY"))
+        await db.execute(
+            text(
+                "SET LOCAL statement_timeout = "
+                f"{int(settings.NLP_STATEMENT_TIMEOUT_MS)}"
+            )
         )
 
+    @staticmethod
+    async def get_database_schema(db: AsyncSession) -> str:
+        """Returns the database schema from the process-wide cache."""
+        return (await schema_cache.get(db)).text
+
     @staticmethod
     def is_query_dangerous(query: str) -> bool:
         """Prevents execution of destructive SQL queries."""
-        dangerous_keywords = [
-            "DROP",
-            "DELETE",
-            "TRUNCATE",
-            "ALTER",
-            "UPDATE",
-            "INSERT",
-        ]
-        return any(kw in query.upper() for kw in dangerous_keywords)
+        return DANGEROUS_SQL_RE.search(query) is not None
+
+
+
+async def explain(db: AsyncSession, query: str) -> PlanSummary:
+    """Returns the top of the planner's estimate for ``query``."""
+    plan = (
+        await db.execute(text(f"EXPLAIN (FORMAT JSON) {query}"))
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    top = plan[0]["Plan"]
+    return PlanSummary(
+        node_type=top["Node Type"],
+        total_cost=top["Total Cost"],
+        plan_rows=top["Plan Rows"],
+    )
+
+
+def bounded_sql(query: str, max_rows: int) -> str:
+    """
+    Wraps an SQL query so the database returns at most ``max_rows + 1``.
+
+    The extra row tells a full result apart from a truncated one. The
+    query is closed on a new line, so a trailing ``--`` comment cannot
+    swallow the limit.
+    """
+    query = query.strip().rstrip(";")
+    return (
+        f"SELECT * FROM ({query}\n) AS nlp_query LIMIT {int(max_rows) + 1}"
+    )
+
+
+def bounded_query(query: str, max_rows: int) -> Any:
+    """
+    ``bounded_sql`` as a statement whose rows are fetched through a
+    server-side cursor in batches of ``NLP_FETCH_SIZE``.
+    """
+    return text(bounded_sql(query, max_rows)).execution_options(
+        yield_per=settings.NLP_FETCH_SIZE
+    )
+
+
+class NDJSONEncoder:
+    """Encodes rows as newline-delimited JSON objects."""
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, columns: list[str]):
+        self.columns = columns
+
+    def header(self) -> str:
+        """Returns nothing; NDJSON has no header."""
+        return ""
+
+    def rows(self, batch: list[Any]) -> str:
+        """Encodes a batch of row mappings."""
+        return "".join(
+            json.dumps(dict(row), default=jsonable_encoder) + "\n"
+            for row in batch
+        )
+
+    def footer(self, row_count: int, truncated: bool) -> str:
+        """Reports truncation as a trailing metadata object."""
+        if not truncated:
+            return ""
+        meta = {"row_count": row_count, "truncated": True}
+        return json.dumps({"__meta__": meta}) + "\n"
+
+    @staticmethod
+    def error(row_count: int, message: str) -> str:
+        """Reports a failure as a trailing metadata object."""
+        meta = {"row_count": row_count, "error": message}
+        return json.dumps({"__meta__": meta}) + "\n"
+
+
+class CSVEncoder:
+    """Encodes rows as CSV with a header line."""
+
+    media_type = "text/csv"
+
+    def __init__(self, columns: list[str]):
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def header(self) -> str:
+        """Returns the column names line."""
+        return self._encode([self.columns])
+
+    def rows(self, batch: list[Any]) -> str:
+        """Encodes a batch of row mappings."""
+        return self._encode([tuple(row.values()) for row in batch])
+
+    def footer(self, row_count: int, truncated: bool) -> str:
+        """Reports truncation as a trailing comment line."""
+        if not truncated:
+            return ""
+        return f"# truncated after {row_count} rows\r\n"
+
+    @staticmethod
+    def error(row_count: int, message: str) -> str:
+        """Reports a failure as a trailing comment line."""
+        return f"# error after {row_count} rows: {message}\r\n"
+
+    def _encode(self, rows: list[Any]) -> str:
+        """Writes rows into the reused buffer and returns them as text."""
+        self._writer.writerows(rows)
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+_ENCODERS = {StreamFormat.NDJSON: NDJSONEncoder, StreamFormat.CSV: CSVEncoder}
+
+
+def stream_media_type(fmt: StreamFormat) -> str:
+    """Returns the content type of a streamed result format."""
+    return _ENCODERS[fmt].media_type
+
+
+PROMPT_REQUIREMENTS = """
+
+        ### Requirements:
+        - Ensure the SQL query is syntactically correct.
+        - Use only the tables and columns present in the provided schema.
+        - Avoid unnecessary joins for optimal performance.
+        - Validate that all referenced tables and columns exist in the schema.
+        - If a table or column is missing, return an error message specifying which one.
+        - If the input query is unclear, return a validation error.
+        - **Ensure text comparisons are case-insensitive.**
+        - Use `ILIKE` for PostgreSQL.
+        - Use `LOWER(column) = LOWER(value)` for MySQL/SQLite.
+
+        ### Response Format:
+        Return the response as a JSON object with:
+        - `"sql_query"`: A string containing the generated SQL query (empty if an error occurs).
+        - `"error"`: A string describing any validation issue (empty if no error occurs).
+        """
+
+
+@lru_cache(maxsize=8)
+def _prompt_prefix(schema_str: str) -> str:
+    """Builds the schema part of the prompt once per schema version."""
+    return f"""
+        You are an expert in SQL query generation. Given the following database schema:
+
+        ### Database Schema:
+        {schema_str}
+
+        Convert the following natural language query into an SQL query:
+        """
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Trailing punctuation that does not change what is being asked.
+_TRAILING_PUNCTUATION = " ?!.;"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalizes a question so trivially different phrasings share a key.
+
+    Unicode compatibility forms, letter case, runs of whitespace and
+    trailing punctuation are ignored.
+    """
+    question = unicodedata.normalize("NFKC", question).casefold()
+    question = _WHITESPACE_RE.sub(" ", question).strip()
+    return question.rstrip(_TRAILING_PUNCTUATION)
+
+
+class TranslationStore(ABC):
+    """Storage for cached translations; values are JSON-able dicts."""
+
+    # Whether calls do I/O and must run off the event loop.
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Returns the entry stored under ``key`` if it has not expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Stores ``value``, evicting entries beyond the size limit."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drops every entry."""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Returns the number of stored entries."""
+
+
+class MemoryTranslationStore(TranslationStore):
+    """Per-process LRU store with a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+class SQLiteTranslationStore(TranslationStore):
+    """
+    SQLite file store shared by every worker on the host.
+
+    Entries expire ``ttl`` seconds after they were written; once the store
+    holds more than ``maxsize`` entries the least recently used ones are
+    deleted.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, maxsize: int, ttl: float):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_translations_used_at "
+                "ON translations (used_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM translations "
+                "WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE translations SET used_at = ? WHERE key = ?",
+                (now, key),
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations "
+                "(key, value, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            conn.execute(
+                "DELETE FROM translations WHERE created_at <= ?",
+                (now - self.ttl,),
+            )
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                "SELECT key FROM translations ORDER BY used_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM translations")
+
+    def size(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM translations"
+        ).fetchone()[0]
+
+
+class CacheStats:
+    """Hit/miss counters of one cache in this worker."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool, saved_ms: float = 0.0) -> None:
+        """Counts one lookup; hits add the latency they avoided."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_ms += saved_ms
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_ms": round(self.saved_ms, 3),
+            }
+
+
+class TranslationCache:
+    """
+    Caches question-to-SQL translations between the prompt and the LLM.
+
+    Entries are keyed by the normalized question and the schema version,
+    so a migration never serves SQL written for the old schema. Only
+    successful translations are stored, together with the LLM latency
+    they took; a hit counts that latency as saved.
+    """
+
+    def __init__(self, store: Optional[TranslationStore]):
+        self.store = store
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(question: str, schema_version: str) -> str:
+        """Returns the cache key of ``question`` under a schema version."""
+        raw = f"{schema_version}\n{normalize_question(question)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, question: str, schema_version: str) -> Optional[str]:
+        """Returns the cached SQL for ``question``, if any."""
+        if self.store is None:
+            return None
+        entry = await self._call(
+            self.store.get, self.key(question, schema_version)
+        )
+        if entry is None:
+            self.stats.record(hit=False)
+            return None
+        self.stats.record(hit=True, saved_ms=entry["llm_ms"])
+        return entry["sql_query"]
+
+    async def set(
+        self,
+        question: str,
+        schema_version: str,
+        sql_query: str,
+        llm_ms: float,
+    ) -> None:
+        """Stores a successful translation and the LLM time it took."""
+        if self.store is None:
+            return
+        await self._call(
+            self.store.set,
+            self.key(question, schema_version),
+            {"sql_query": sql_query, "llm_ms": llm_ms},
+        )
+
+    async def clear(self) -> None:
+        """Drops every cached translation."""
+        if self.store is not None:
+            await self._call(self.store.clear)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the backend, size and hit/miss counters."""
+        return {
+            "backend": settings.NLP_CACHE_BACKEND,
+            "size": self.store.size() if self.store is not None else 0,
+            **self.stats.snapshot(),
+        }
+
+    async def _call(self, fn: Any, *args: Any) -> Any:
+        """Runs a store call, off the event loop for blocking stores."""
+        try:
+            if self.store.blocking:
+                return await run_in_threadpool(fn, *args)
+            return fn(*args)
+        except sqlite3.Error as e:
+            # A broken cache must never fail the request.
+            logger.warning("NLP translation cache unavailable: %s", e)
+            return None
+
+
+class ResultCache:
+    """
+    Short-lived per-process cache of NLP query results.
+
+    Disabled unless ``NLP_RESULT_CACHE_TTL`` is set: results are served
+    up to that many seconds stale. Keyed by the executed SQL and the
+    schema version.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.enabled = ttl > 0
+        self._cache: Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=ttl) if self.enabled else None
+        )
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, sql_query: str, schema_version: str) -> Optional[Any]:
+        """Returns the cached result of ``sql_query``, if any."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            result = self._cache.get((schema_version, sql_query))
+        self.stats.record(hit=result is not None)
+        return result
+
+    def set(self, sql_query: str, schema_version: str, result: Any) -> None:
+        """Stores the result returned by ``sql_query``."""
+        if self.enabled:
+            with self._lock:
+                self._cache[(schema_version, sql_query)] = result
+
+    def clear(self) -> None:
+        """Drops every cached result."""
+        if self.enabled:
+            with self._lock:
+                self._cache.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns whether the cache is on, its size and counters."""
+        with self._lock:
+            size = len(self._cache) if self.enabled else 0
+        return {"enabled": self.enabled, "size": size, **self.stats.snapshot()}
+
+
+def _make_store() -> Optional[TranslationStore]:
+    """Builds the translation store selected by NLP_CACHE_BACKEND."""
+    backend = settings.NLP_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryTranslationStore(
+            settings.NLP_CACHE_SIZE, settings.NLP_CACHE_TTL
+        )
+    if backend == "sqlite":
+        return SQLiteTranslationStore(
+            settings.NLP_CACHE_PATH,
+            settings.NLP_CACHE_SIZE,
+            settings.NLP_CACHE_TTL,
+        )
+    if backend != "none":
+        logger.warning("Unknown NLP_CACHE_BACKEND %r; caching off", backend)
+    return None
+
+
+translation_cache = TranslationCache(_make_store())
+result_cache = ResultCache(
+    settings.NLP_RESULT_CACHE_SIZE, settings.NLP_RESULT_CACHE_TTL
+)
+
+
+def nlp_cache_snapshot() -> dict[str, Any]:
+    """Returns the stats of both NLP caches in this worker process."""
+    return {
+        "pid": os.getpid(),
+        "translations": translation_cache.snapshot(),
+        "results": result_cache.snapshot(),
+    }
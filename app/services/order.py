@@ -1,16 +1,40 @@
+from collections import defaultdict
 from enum import Enum
 from typing import Tuple, List
-from app.dependencies import BaseService
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+
+from app.dependencies import AsyncBaseService, BaseService
 from app.models.customer import Customer
 from app.models.order import Order, OrderItem
 from app.models.product import Product
-from app.schemas.orders import OrderCreateSchema, OrderFilter
+from app.schemas.orders import (
+    OrderBulkResponse,
+    OrderBulkResult,
+    OrderCreateSchema,
+    OrderDetailResponse,
+    OrderFilter,
+    OrderResponse,
+)
+from app.services.product_cache import invalidate_on_commit
+from app.services.products import load_catalog
+from app.services.stock import (
+    InsufficientStockError,
+    match_ids,
+    reserve_stock,
+    restore_stock,
+)
 from app.utils.constants import (
     CUSTOMER_NOT_FOUND,
     ERROR_MESSAGE,
+    NO_ORDER_FILTER,
+    ORDER_NOT_CANCELLABLE,
     PRODUCT_NOT_FOUND,
 )
+from app.utils.loading import loader_options
 from app.utils.logger import logger
+from app.utils.validation import validation_message
 
 
 class OrderStatus(str, Enum):
@@ -21,45 +45,67 @@ class OrderStatus(str, Enum):
     CANCELED = "Canceled"
 
 
+# Statuses a cancel-by-filter may select
+CANCELLABLE_STATUSES = (OrderStatus.PENDING,)
+
+
+def order_filter_criteria(filters: OrderFilter) -> list:
+    """Builds the WHERE criteria for an OrderFilter"""
+    criteria = []
+
+    if filters.status is not None:
+        criteria.append(Order.status == filters.status)
+
+    if filters.customer_id is not None:
+        criteria.append(Order.customer_id == filters.customer_id)
+
+    if filters.min_price is not None:
+        criteria.append(Order.total_amount >= filters.min_price)
+
+    if filters.max_price is not None:
+        criteria.append(Order.total_amount <= filters.max_price)
+
+    return criteria
+
+
 class OrderService(BaseService):
     """Order service"""
 
     def create_order(self, order: OrderCreateSchema) -> tuple[bool, str, int]:
         """Create a new order with proper validation and optimized queries."""
+        product_names: dict[int, str] = {}
         try:
             with self.db.begin():  # Ensures atomic transaction
                 # Check if customer exists
                 customer = (
-                    self.db.query(Customer)
+                    self.db.query(Customer.id)
                     .filter_by(id=order.customer_id)
                     .first()
                 )
                 if not customer:
                     return False, CUSTOMER_NOT_FOUND, 404
 
-                # Fetch all product details in a single query
-                product_ids = [item.product_id for item in order.items]
-                products = (
-                    self.db.query(Product)
-                    .filter(Product.id.in_(product_ids))
-                    .all()
-                )
-                product_map = {product.id: product for product in products}
+                # Product names come from the catalog cache; stock is
+                # checked against the database by reserve_stock below
+                product_ids = {item.product_id for item in order.items}
+                product_names = {
+                    product_id: entry.name
+                    for product_id, entry in load_catalog(
+                        self.db, product_ids
+                    ).items()
+                }
+                if len(product_names) != len(product_ids):
+                    return False, PRODUCT_NOT_FOUND, 404
 
-                # Validate product and stock availability before creating order
                 total_amount = 0
+                quantities: dict[int, int] = defaultdict(int)
                 for item in order.items:
-                    product = product_map.get(item.product_id)
-                    if not product:
-                        return False, PRODUCT_NOT_FOUND, 404
-
-                    if product.stock_quantity < item.quantity:
-                        return (
-                            False,
-                            f"Insufficient stock for {product.name}",
-                            400,
-                        )
                     total_amount += item.quantity * item.price
+                    quantities[item.product_id] += item.quantity
+
+                # Check and deduct stock atomically, in product id order
+                reserve_stock(self.db, quantities)
+                invalidate_on_commit(self.db, quantities, stock_only=True)
 
                 # Create new order
                 new_order = Order(
@@ -71,30 +117,31 @@ class OrderService(BaseService):
                 self.db.add(new_order)
                 self.db.flush()
 
-                # Prepare order items and update stock
-                order_items = [
-                    OrderItem(
-                        order_id=new_order.id,
-                        product_id=item.product_id,
-                        quantity=item.quantity,
-                        price=item.price,
-                    )
-                    for item in order.items
-                ]
-
-                for item in order.items:
-                    product_map[
-                        item.product_id
-                    ].stock_quantity -= item.quantity  # Deduct stock
-
                 # Bulk insert order items
-                self.db.bulk_save_objects(order_items)
+                self.db.bulk_save_objects(
+                    [
+                        OrderItem(
+                            order_id=new_order.id,
+                            product_id=item.product_id,
+                            quantity=item.quantity,
+                            price=item.price,
+                        )
+                        for item in order.items
+                    ]
+                )
 
                 logger.info(
                     "Order created successfully with ID: %s", new_order.id
                 )
                 return True, "Order created successfully.", 201
 
+        except InsufficientStockError as e:
+            # The transaction (and any earlier reservation) is rolled back
+            return (
+                False,
+                f"Insufficient stock for {product_names[e.product_id]}",
+                400,
+            )
         except Exception as e:
             self.db.rollback()
             logger.error(
@@ -102,26 +149,173 @@ class OrderService(BaseService):
             )
             return False, ERROR_MESSAGE, 500
 
-    def get_orders(
-        self, filters: OrderFilter
-    ) -> Tuple[bool, str, List[Order]]:
-        """Retrieve orders with filtering"""
-        try:
-            orders = self.db.query(Order)
+    def create_orders_bulk(
+        self, orders: List[dict]
+    ) -> tuple[bool, str, OrderBulkResponse | int]:
+        """
+        Create many orders with set-based queries, accepting each order
+        independently.
 
-            if filters.status is not None:
-                orders = orders.filter(Order.status == filters.status)
+        Each order is validated as an OrderCreateSchema; an invalid one
+        fails with the validation message. Customers and products are
+        checked with one ``IN`` query each. The batch's products are
+        locked once, in id order, and stock is allocated to the orders in
+        request order; orders that reference unknown rows or exceed the
+        remaining stock fail without affecting the others. Accepted orders
+        and their items are written with multi-row INSERTs and the stock
+        deltas with one bulk UPDATE.
+        """
+        results = [
+            OrderBulkResult(index=index, success=False)
+            for index in range(len(orders))
+        ]
+        valid: list[tuple[OrderBulkResult, OrderCreateSchema]] = []
+        for result, raw in zip(results, orders):
+            try:
+                valid.append((result, OrderCreateSchema.model_validate(raw)))
+            except ValidationError as e:
+                result.error = validation_message(e)
 
-            if filters.customer_id is not None:
-                orders = orders.filter(
-                    Order.customer_id == filters.customer_id
+        accepted: list[tuple[OrderBulkResult, OrderCreateSchema]] = []
+        try:
+            with self.db.begin():
+                customer_ids = {
+                    customer_id
+                    for (customer_id,) in self.db.query(Customer.id).filter(
+                        Customer.id.in_({o.customer_id for _, o in valid})
+                    )
+                }
+                products = (
+                    self.db.query(
+                        Product.id, Product.name, Product.stock_quantity
+                    )
+                    .filter(
+                        Product.id.in_(
+                            {i.product_id for _, o in valid for i in o.items}
+                        )
+                    )
+                    .order_by(Product.id)
+                    .with_for_update()
+                    .all()
                 )
+                names = {p.id: p.name for p in products}
+                stock = {p.id: p.stock_quantity for p in products}
+
+                for result, order in valid:
+                    error = self._allocate(order, customer_ids, names, stock)
+                    if error:
+                        result.error = error
+                    else:
+                        accepted.append((result, order))
+
+                if accepted:
+                    order_ids = self.db.execute(
+                        insert(Order).returning(
+                            Order.id, sort_by_parameter_order=True
+                        ),
+                        [
+                            {
+                                "customer_id": order.customer_id,
+                                "date": order.order_date,
+                                "total_amount": sum(
+                                    item.quantity * item.price
+                                    for item in order.items
+                                ),
+                                "status": OrderStatus.PENDING,
+                            }
+                            for _, order in accepted
+                        ],
+                    ).scalars()
 
-            if filters.min_price is not None:
-                orders = orders.filter(Order.total_amount >= filters.min_price)
+                    items = []
+                    for (result, order), order_id in zip(accepted, order_ids):
+                        result.success = True
+                        result.order_id = order_id
+                        items.extend(
+                            {
+                                "order_id": order_id,
+                                "product_id": item.product_id,
+                                "quantity": item.quantity,
+                                "price": item.price,
+                            }
+                            for item in order.items
+                        )
+                    self.db.execute(insert(OrderItem), items)
+
+                    touched = {
+                        item.product_id
+                        for _, order in accepted
+                        for item in order.items
+                    }
+                    invalidate_on_commit(self.db, touched, stock_only=True)
+                    # Rows are locked, so the new absolute values are safe
+                    self.db.execute(
+                        update(Product),
+                        [
+                            {
+                                "id": product_id,
+                                "stock_quantity": stock[product_id],
+                            }
+                            for product_id in sorted(touched)
+                        ],
+                    )
 
-            if filters.max_price is not None:
-                orders = orders.filter(Order.total_amount <= filters.max_price)
+            created = len(accepted)
+            logger.info(
+                "Bulk order batch: %s created, %s failed",
+                created,
+                len(orders) - created,
+            )
+            return (
+                True,
+                "Bulk order batch processed.",
+                OrderBulkResponse(
+                    created=created,
+                    failed=len(orders) - created,
+                    results=results,
+                ),
+            )
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(
+                "Unexpected error creating bulk orders: %s", e, exc_info=True
+            )
+            return False, ERROR_MESSAGE, 500
+
+    @staticmethod
+    def _allocate(
+        order: OrderCreateSchema,
+        customer_ids: set[int],
+        names: dict[int, str],
+        stock: dict[int, int],
+    ) -> str | None:
+        """Takes an order's quantities from ``stock``; returns any error."""
+        if order.customer_id not in customer_ids:
+            return CUSTOMER_NOT_FOUND
+
+        quantities: dict[int, int] = defaultdict(int)
+        for item in order.items:
+            if item.product_id not in names:
+                return PRODUCT_NOT_FOUND
+            quantities[item.product_id] += item.quantity
+
+        for product_id, quantity in quantities.items():
+            if stock[product_id] < quantity:
+                return f"Insufficient stock for {names[product_id]}"
+
+        for product_id, quantity in quantities.items():
+            stock[product_id] -= quantity
+        return None
+
+    def get_orders(
+        self, filters: OrderFilter
+    ) -> Tuple[bool, str, List[Order]]:
+        """Retrieve orders with filtering"""
+        try:
+            orders = self.db.query(Order).filter(
+                *order_filter_criteria(filters)
+            )
 
             logger.info("Order list retrieved successfully")
             return True, "Order list retrieved successfully", orders
@@ -134,7 +328,12 @@ class OrderService(BaseService):
         try:
             if order_id <= 0:
                 return False, "Invalid order ID", 400
-            order = self.db.query(Order).filter(Order.id == order_id).first()
+            order = (
+                self.db.query(Order)
+                .options(*loader_options(Order, OrderDetailResponse))
+                .filter(Order.id == order_id)
+                .first()
+            )
             if not order:
                 return False, "Order not found", 404
             return True, "Order retrieved successfully", order
@@ -147,34 +346,74 @@ class OrderService(BaseService):
         Deletes an order, restores stock,
         and ensures product completion state is respected.
         """
-        try:
-            if order_id <= 0:
-                return False, "Invalid order ID", 400
+        if order_id <= 0:
+            return False, "Invalid order ID", 400
 
-            order = self.db.query(Order).filter_by(id=order_id).first()
-            if not order:
-                return False, "Order not found", 404
+        is_success, message, result = self.cancel_orders(order_ids=[order_id])
+        if not is_success:
+            return False, message, result
+        if result == 0:
+            return False, "Order not found", 404
+        return True, "Order deleted successfully", 200
 
-            # Restore product stock before deleting order
-            for item in order.order_items:
-                product = (
-                    self.db.query(Product)
-                    .filter_by(id=item.product_id)
-                    .first()
-                )
-                if product:
-                    product.stock_quantity += item.quantity
+    def cancel_orders(
+        self,
+        order_ids: List[int] | None = None,
+        filters: OrderFilter | None = None,
+    ) -> tuple[bool, str, int]:
+        """
+        Cancels orders by id or by filter: restores their stock and deletes
+        them with their items. A filter only selects cancellable (pending)
+        orders and must narrow the selection down.
+
+        The matching orders are locked and their ids fetched once; then
+        stock is restored with a single aggregated UPDATE and the items
+        and orders are removed with one DELETE each, however many orders
+        match.
+        """
+        try:
+            if order_ids is not None:
+                criteria = [match_ids(self.db, Order.id, order_ids)]
+            else:
+                criteria = order_filter_criteria(filters)
+                if not criteria:
+                    return False, NO_ORDER_FILTER, 422
+                if (
+                    filters.status is not None
+                    and filters.status not in CANCELLABLE_STATUSES
+                ):
+                    return False, ORDER_NOT_CANCELLABLE, 422
+                criteria.append(Order.status.in_(CANCELLABLE_STATUSES))
 
-            # Delete order (OrderItems will be auto-deleted due to cascade)
-            self.db.delete(order)
-            self.db.flush()
+            ids = (
+                self.db.execute(
+                    select(Order.id)
+                    .where(*criteria)
+                    .order_by(Order.id)
+                    .with_for_update()
+                )
+                .scalars()
+                .all()
+            )
+            if ids:
+                restore_stock(self.db, ids)
+                self.db.execute(
+                    delete(OrderItem)
+                    .where(match_ids(self.db, OrderItem.order_id, ids))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.execute(
+                    delete(Order)
+                    .where(match_ids(self.db, Order.id, ids))
+                    .execution_options(synchronize_session=False)
+                )
 
-            logger.info("Order deleted successfully")
-            return True, "Order deleted successfully", 200
+            logger.info("Cancelled %s orders", len(ids))
+            return True, "Orders cancelled successfully", len(ids)
 
         except Exception as e:
             self.db.rollback()
-            logger.error("Error deleting order: %s", e, exc_info=True)
+            logger.error("Error cancelling orders: %s", e, exc_info=True)
             return False, ERROR_MESSAGE, 500
 
     def get_customer_orders(self, customer_id: int):
@@ -182,6 +421,7 @@ class OrderService(BaseService):
         try:
             orders = (
                 self.db.query(Order)
+                .options(*loader_options(Order, OrderResponse))
                 .filter(Order.customer_id == customer_id)
                 .all()
             )
@@ -191,3 +431,55 @@ class OrderService(BaseService):
                 "Error retrieving customer orders: %s", e, exc_info=True
             )
             return False, ERROR_MESSAGE, 500
+
+
+class AsyncOrderService(AsyncBaseService):
+    """Order service for the async database stack"""
+
+    async def create_order(
+        self, order: OrderCreateSchema
+    ) -> tuple[bool, str, int]:
+        """Create a new order"""
+        return await self.run_sync(
+            lambda db: OrderService(db).create_order(order)
+        )
+
+    async def create_orders_bulk(self, orders: List[dict]):
+        """Create many orders with set-based queries"""
+        return await self.run_sync(
+            lambda db: OrderService(db).create_orders_bulk(orders)
+        )
+
+    async def get_orders(self, filters: OrderFilter):
+        """Retrieve orders with filtering"""
+        return await self.run_sync(
+            lambda db: OrderService(db).get_orders(filters)
+        )
+
+    async def get_order(self, order_id: int):
+        """Retrieve a specific order"""
+        return await self.run_sync(
+            lambda db: OrderService(db).get_order(order_id)
+        )
+
+    async def delete_order(self, order_id: int) -> tuple[bool, str, int]:
+        """Deletes an order and restores stock"""
+        return await self.run_sync(
+            lambda db: OrderService(db).delete_order(order_id)
+        )
+
+    async def cancel_orders(
+        self,
+        order_ids: List[int] | None = None,
+        filters: OrderFilter | None = None,
+    ) -> tuple[bool, str, int]:
+        """Cancels orders by id or by filter"""
+        return await self.run_sync(
+            lambda db: OrderService(db).cancel_orders(order_ids, filters)
+        )
+
+    async def get_customer_orders(self, customer_id: int):
+        """Get customer orders"""
+        return await self.run_sync(
+            lambda db: OrderService(db).get_customer_orders(customer_id)
+        )
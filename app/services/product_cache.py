@@ -0,0 +1,372 @@
+import os
+import select
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import event, func, update
+from sqlalchemy import select as sql_select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.product import CATALOG_VERSION_ID, CatalogVersion
+from app.services.nlp_cache import CacheStats
+from app.utils.logger import logger
+
+# Session.info key of the product ids to invalidate once it commits
+_PENDING_KEY = "product_cache_pending"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Product fields that only change through the product endpoints."""
+
+    name: str
+    description: Optional[str]
+    category: str
+    price: Decimal
+
+
+@dataclass(frozen=True)
+class StockEntry:
+    """Product fields that every order changes."""
+
+    stock_quantity: int
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class CachedProduct:
+    """A product assembled from its catalog and stock entries."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    category: str
+    price: Decimal
+    stock_quantity: int
+    updated_at: datetime
+
+    @classmethod
+    def build(
+        cls, product_id: int, catalog: CatalogEntry, stock: StockEntry
+    ) -> "CachedProduct":
+        """Combines the two entries of a product."""
+        return cls(
+            id=product_id,
+            name=catalog.name,
+            description=catalog.description,
+            category=catalog.category,
+            price=catalog.price,
+            stock_quantity=stock.stock_quantity,
+            updated_at=stock.updated_at,
+        )
+
+
+class ProductCache:
+    """
+    Per-process LRU + TTL cache of products, keyed by id.
+
+    Catalog fields and stock live in separate caches: the catalog is kept
+    for ``ttl`` seconds, stock (and ``updated_at``) for the much shorter
+    ``stock_ttl``, 0 turning a layer off. Stock is only ever shown from
+    here; order validation reserves it in the database.
+
+    Entries are dropped when a session that changed them commits (see
+    ``invalidate_on_commit``). Invalidations bump the ``generation`` of
+    the layers they touch; a load started before that is not stored, so
+    a reader racing a writer cannot put the old row back.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stock_ttl: float):
+        self._catalog: Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+        )
+        self._stock: Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=stock_ttl) if stock_ttl > 0 else None
+        )
+        self._lock = threading.Lock()
+        self._catalog_generation = 0
+        self._stock_generation = 0
+        self.catalog_stats = CacheStats()
+        self.stock_stats = CacheStats()
+
+    @property
+    def generation(self) -> tuple[int, int]:
+        """Catalog and stock generations, taken before a load."""
+        return self._catalog_generation, self._stock_generation
+
+    def get_catalog(
+        self, product_ids: Iterable[int]
+    ) -> dict[int, CatalogEntry]:
+        """Returns the cached catalog entries among ``product_ids``."""
+        product_ids = set(product_ids)
+        if self._catalog is None:
+            return {}
+        with self._lock:
+            entries = {
+                product_id: self._catalog[product_id]
+                for product_id in product_ids
+                if product_id in self._catalog
+            }
+        for product_id in product_ids:
+            self.catalog_stats.record(hit=product_id in entries)
+        return entries
+
+    def set_catalog(
+        self, entries: dict[int, CatalogEntry], generation: tuple[int, int]
+    ) -> None:
+        """Stores entries loaded while ``generation`` was current."""
+        if self._catalog is None:
+            return
+        with self._lock:
+            if generation[0] == self._catalog_generation:
+                self._catalog.update(entries)
+
+    def get_stock(self, product_id: int) -> Optional[StockEntry]:
+        """Returns the cached stock entry of a product, if fresh."""
+        if self._stock is None:
+            return None
+        with self._lock:
+            entry = self._stock.get(product_id)
+        self.stock_stats.record(hit=entry is not None)
+        return entry
+
+    def set_stock(
+        self, product_id: int, entry: StockEntry, generation: tuple[int, int]
+    ) -> None:
+        """Stores a stock entry loaded while ``generation`` was current."""
+        if self._stock is None:
+            return
+        with self._lock:
+            if generation[1] == self._stock_generation:
+                self._stock[product_id] = entry
+
+    def invalidate(
+        self, product_ids: Iterable[int], stock_only: bool = False
+    ) -> None:
+        """Drops the entries of the given products."""
+        with self._lock:
+            self._stock_generation += 1
+            if not stock_only:
+                self._catalog_generation += 1
+            for product_id in product_ids:
+                if self._stock is not None:
+                    self._stock.pop(product_id, None)
+                if self._catalog is not None and not stock_only:
+                    self._catalog.pop(product_id, None)
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._catalog_generation += 1
+            self._stock_generation += 1
+            for cache in (self._catalog, self._stock):
+                if cache is not None:
+                    cache.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the size and hit counters of both layers."""
+        with self._lock:
+            sizes = [
+                len(cache) if cache is not None else 0
+                for cache in (self._catalog, self._stock)
+            ]
+        return {
+            "pid": os.getpid(),
+            "catalog": {
+                "enabled": self._catalog is not None,
+                "size": sizes[0],
+                **self.catalog_stats.snapshot(),
+            },
+            "stock": {
+                "enabled": self._stock is not None,
+                "size": sizes[1],
+                **self.stock_stats.snapshot(),
+            },
+            "listener": (
+                invalidation_listener.snapshot()
+                if invalidation_listener is not None
+                else None
+            ),
+        }
+
+
+product_cache = ProductCache(
+    settings.PRODUCT_CACHE_SIZE,
+    settings.PRODUCT_CACHE_TTL,
+    settings.PRODUCT_STOCK_CACHE_TTL,
+)
+
+
+def invalidate_on_commit(
+    db: Session, product_ids: Iterable[int], stock_only: bool = False
+) -> None:
+    """
+    Invalidates products once ``db`` commits, in every worker.
+
+    Nothing happens if the transaction rolls back. Catalog changes bump
+    the catalog version inside the transaction, so listings see it change
+    with the rows; stock-only changes do not take that lock (listings
+    follow them through ``updated_at``). Catalog changes are also
+    announced with ``pg_notify`` inside the transaction when
+    PRODUCT_CACHE_NOTIFY is on, so other workers drop them on commit.
+    """
+    catalog_ids, stock_ids = db.info.setdefault(_PENDING_KEY, (set(), set()))
+    (stock_ids if stock_only else catalog_ids).update(product_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_catalog_version(session: Session) -> None:
+    # Last statement of the transaction, so the row stays locked briefly;
+    # order writes only change stock and never wait on it
+    pending = session.info.get(_PENDING_KEY)
+    if pending and pending[0]:
+        session.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == CATALOG_VERSION_ID)
+            .values(version=CatalogVersion.version + 1)
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_invalidations(session: Session) -> None:
+    pending = session.info.get(_PENDING_KEY)
+    if (
+        not settings.PRODUCT_CACHE_NOTIFY
+        or not pending
+        or not pending[0]
+        or session.get_bind().dialect.name != "postgresql"
+    ):
+        return
+    session.execute(
+        sql_select(
+            func.pg_notify(
+                settings.PRODUCT_CACHE_CHANNEL,
+                ",".join(map(str, sorted(pending[0]))),
+            )
+        )
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        catalog_ids, stock_ids = pending
+        if catalog_ids:
+            product_cache.invalidate(catalog_ids)
+        if stock_ids - catalog_ids:
+            product_cache.invalidate(stock_ids - catalog_ids, stock_only=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class InvalidationListener:
+    """
+    Drops products announced on a PostgreSQL NOTIFY channel.
+
+    Runs a daemon thread on a dedicated connection taken out of the
+    primary engine's pool, reconnecting after errors. While it is
+    disconnected, other workers' changes are only bounded by the TTLs.
+    """
+
+    def __init__(self, engine: Engine, channel: str, cache: ProductCache):
+        self.engine = engine
+        self.channel = channel
+        self.cache = cache
+        self.received = 0
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the listener thread (again, e.g. in a forked worker)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="product-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the listener thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns whether the listener is connected and what it saw."""
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "received": self.received,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning("Product cache listener failed: %s", e)
+            finally:
+                self.connected = False
+            # Changes made while disconnected were missed
+            self.cache.clear()
+            self._stop.wait(5)
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        connection.detach()  # never returned to the pool
+        dbapi_connection = connection.dbapi_connection
+        try:
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self.connected = True
+            while not self._stop.is_set():
+                if not select.select([dbapi_connection], [], [], 1)[0]:
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    self.received += 1
+                    self.cache.invalidate(
+                        int(product_id)
+                        for product_id in notify.payload.split(",")
+                    )
+        finally:
+            dbapi_connection.close()
+
+
+invalidation_listener: Optional[InvalidationListener] = None
+
+
+def start_invalidation_listener(engine: Engine) -> None:
+    """Listens for other workers' invalidations if PRODUCT_CACHE_NOTIFY."""
+    global invalidation_listener
+    if not settings.PRODUCT_CACHE_NOTIFY:
+        return
+    if engine.dialect.name != "postgresql":
+        logger.warning("PRODUCT_CACHE_NOTIFY needs PostgreSQL; ignored")
+        return
+    if invalidation_listener is None:
+        invalidation_listener = InvalidationListener(
+            engine, settings.PRODUCT_CACHE_CHANNEL, product_cache
+        )
+    invalidation_listener.start()
+
+
+def stop_invalidation_listener() -> None:
+    """Stops the listener thread, if running."""
+    if invalidation_listener is not None:
+        invalidation_listener.stop()
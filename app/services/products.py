@@ -1,10 +1,61 @@
-from app.dependencies import BaseService
-from app.models.product import Product
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.dependencies import AsyncBaseService, BaseService
+from app.models.product import CATALOG_VERSION_ID, CatalogVersion, Product
 from app.schemas.products import ProductCreate, ProductUpdate
+from app.services.product_cache import (
+    CachedProduct,
+    CatalogEntry,
+    StockEntry,
+    invalidate_on_commit,
+    product_cache,
+)
 from app.utils.constants import ERROR_MESSAGE, INVALID_ID, PRODUCT_NOT_FOUND
 from app.utils.logger import logger
 
 
+def catalog_entry(row) -> CatalogEntry:
+    """Builds the catalog entry of a product row."""
+    return CatalogEntry(
+        name=row.name,
+        description=row.description,
+        category=row.category,
+        price=row.price,
+    )
+
+
+def load_catalog(
+    db: Session, product_ids: Iterable[int]
+) -> dict[int, CatalogEntry]:
+    """
+    Returns the catalog fields of the existing products among the ids.
+
+    Cached entries are used as is; the rest are loaded with one ``IN``
+    query and cached. Unknown ids are left out.
+    """
+    product_ids = set(product_ids)
+    entries = product_cache.get_catalog(product_ids)
+    missing = product_ids - entries.keys()
+    if missing:
+        generation = product_cache.generation
+        loaded = {
+            row.id: catalog_entry(row)
+            for row in db.query(
+                Product.id,
+                Product.name,
+                Product.description,
+                Product.category,
+                Product.price,
+            ).filter(Product.id.in_(missing))
+        }
+        product_cache.set_catalog(loaded, generation)
+        entries.update(loaded)
+    return entries
+
+
 class ProductService(BaseService):
     """Service for managing products (Synchronous)"""
 
@@ -17,17 +68,63 @@ class ProductService(BaseService):
             logger.error("Error retrieving products: %s", e, exc_info=True)
             return False, ERROR_MESSAGE, 500
 
-    def get_product(self, product_id: int) -> Product:
-        """Retrieve a specific product using SQLAlchemy ORM."""
+    def get_catalog_version(self):
+        """
+        Return the catalog watermark: the catalog version, bumped by
+        catalog edits, and the last ``updated_at``, moved by stock writes.
+        One primary key lookup and one index lookup, no count.
+        """
+        try:
+            version = self.db.execute(
+                select(
+                    CatalogVersion.version,
+                    select(func.max(Product.updated_at)).scalar_subquery(),
+                ).where(CatalogVersion.id == CATALOG_VERSION_ID)
+            ).one()
+            return True, "Catalog version retrieved successfully.", version
+        except Exception as e:
+            logger.error(
+                "Error retrieving catalog version: %s", e, exc_info=True
+            )
+            return False, ERROR_MESSAGE, 500
+
+    def get_product(self, product_id: int) -> CachedProduct:
+        """Retrieve a specific product through the product cache."""
         try:
             if product_id <= 0:
                 return False, INVALID_ID, 400
-            product = (
-                self.db.query(Product).filter(Product.id == product_id).first()
+            catalog = product_cache.get_catalog((product_id,)).get(product_id)
+            stock = product_cache.get_stock(product_id)
+            if catalog is None:
+                # One query fills both layers
+                generation = product_cache.generation
+                product = (
+                    self.db.query(Product)
+                    .filter(Product.id == product_id)
+                    .first()
+                )
+                if not product:
+                    return False, PRODUCT_NOT_FOUND, 404
+                catalog = catalog_entry(product)
+                stock = StockEntry(product.stock_quantity, product.updated_at)
+                product_cache.set_catalog({product_id: catalog}, generation)
+                product_cache.set_stock(product_id, stock, generation)
+            elif stock is None:
+                generation = product_cache.generation
+                row = (
+                    self.db.query(Product.stock_quantity, Product.updated_at)
+                    .filter(Product.id == product_id)
+                    .first()
+                )
+                if not row:
+                    return False, PRODUCT_NOT_FOUND, 404
+                stock = StockEntry(row.stock_quantity, row.updated_at)
+                product_cache.set_stock(product_id, stock, generation)
+            return (
+                True,
+                "Product retrieved successfully.",
+                CachedProduct.build(product_id, catalog, stock),
             )
-            if not product:
-                return False, PRODUCT_NOT_FOUND, 404
-            return True, "Product retrieved successfully.", product
         except Exception as e:
             logger.error("Error retrieving product: %s", e, exc_info=True)
             return False, ERROR_MESSAGE, 500
@@ -38,6 +135,7 @@ class ProductService(BaseService):
             new_product = Product(**product_data.model_dump())
             self.db.add(new_product)
             self.db.flush()
+            invalidate_on_commit(self.db, (new_product.id,))
             return True, "Product created successfully.", 201
         except Exception as e:
             logger.error("Error creating product: %s", e, exc_info=True)
@@ -62,6 +160,7 @@ class ProductService(BaseService):
             if result == 0:
                 return False, PRODUCT_NOT_FOUND, 404
 
+            invalidate_on_commit(self.db, (product_id,))
             self.db.commit()  # Commit transaction
             return True, "Product updated successfully.", 200
 
@@ -84,7 +183,48 @@ class ProductService(BaseService):
 
             self.db.delete(product)
             self.db.flush()
+            invalidate_on_commit(self.db, (product_id,))
             return True, "Product deleted successfully", 200
         except Exception as e:
             logger.error("Error deleting product: %s", e, exc_info=True)
             return False, ERROR_MESSAGE, 500
+
+
+class AsyncProductService(AsyncBaseService):
+    """Service for managing products (Asynchronous)"""
+
+    async def get_all_products(self):
+        """Retrieve all products."""
+        return await self.run_sync(
+            lambda db: ProductService(db).get_all_products()
+        )
+
+    async def get_catalog_version(self):
+        """Return the catalog watermark."""
+        return await self.run_sync(
+            lambda db: ProductService(db).get_catalog_version()
+        )
+
+    async def get_product(self, product_id: int):
+        """Retrieve a specific product."""
+        return await self.run_sync(
+            lambda db: ProductService(db).get_product(product_id)
+        )
+
+    async def create_product(self, product_data: ProductCreate):
+        """Create a new product."""
+        return await self.run_sync(
+            lambda db: ProductService(db).create_product(product_data)
+        )
+
+    async def update_product(self, product_id: int, data: ProductUpdate):
+        """Update product details."""
+        return await self.run_sync(
+            lambda db: ProductService(db).update_product(product_id, data)
+        )
+
+    async def delete_product(self, product_id: int):
+        """Delete a product."""
+        return await self.run_sync(
+            lambda db: ProductService(db).delete_product(product_id)
+        )
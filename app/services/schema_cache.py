@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Optional
+
+from sqlalchemy import UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models  # noqa: F401  (registers the mapped tables)
+from app.config import settings
+from app.database import Base
+from app.utils.logger import logger
+
+ALEMBIC_TABLE = "alembic_version"
+
+
+class DatabaseSchema:
+    """
+    Snapshot of the database schema as described to the LLM.
+
+    ``tables`` keeps the structured description (column types, primary
+    and foreign keys, unique columns, indexes); ``text`` is the rendering
+    used in the prompt. ``version`` changes whenever either the Alembic
+    revision or the rendered schema changes.
+    """
+
+    def __init__(
+        self, revision: Optional[str], source: str, tables: dict[str, Any]
+    ):
+        self.revision = revision
+        self.source = source
+        self.tables = tables
+        self.text = "\n".join(
+            _render_table(name, table) for name, table in tables.items()
+        )
+        digest = hashlib.sha1(self.text.encode()).hexdigest()[:12]
+        self.version = f"{revision or 'unversioned'}:{digest}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the snapshot for the admin API."""
+        return {
+            "version": self.version,
+            "revision": self.revision,
+            "source": self.source,
+            "tables": self.tables,
+        }
+
+
+class SchemaCache:
+    """
+    Process-wide cache of the schema used by the NLP prompt.
+
+    The schema only changes with Alembic migrations, so instead of
+    introspecting it on every request the cache re-reads the revision in
+    ``alembic_version`` at most once per ``check_interval`` seconds and
+    rebuilds the snapshot only when the revision moved.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._schema: Optional[DatabaseSchema] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> DatabaseSchema:
+        """Returns the cached schema, rebuilding it if it is stale."""
+        schema = self._schema
+        if schema is not None and not self._check_due():
+            return schema
+
+        async with self._lock:
+            if self._schema is not None and not self._check_due():
+                return self._schema
+
+            revision = await db.run_sync(
+                lambda session: _read_revision(session.connection())
+            )
+            if self._schema is None or self._schema.revision != revision:
+                self._schema = await db.run_sync(
+                    lambda session: build_schema(
+                        session.connection(), revision
+                    )
+                )
+                logger.info(
+                    "Loaded database schema %s from %s",
+                    self._schema.version,
+                    self._schema.source,
+                )
+            self._checked_at = time.monotonic()
+            return self._schema
+
+    async def refresh(self, db: AsyncSession) -> DatabaseSchema:
+        """Drops the cached schema and rebuilds it."""
+        self.invalidate()
+        return await self.get(db)
+
+    def invalidate(self) -> None:
+        """Drops the cached schema; the next ``get`` rebuilds it."""
+        self._schema = None
+        self._checked_at = 0.0
+
+    def _check_due(self) -> bool:
+        """Whether the Alembic revision should be read again."""
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+
+schema_cache = SchemaCache(settings.NLP_SCHEMA_CHECK_INTERVAL)
+
+
+def build_schema(
+    connection: Connection, revision: Optional[str]
+) -> DatabaseSchema:
+    """
+    Describes the database schema.
+
+    The description comes from ``Base.metadata`` when every mapped table
+    exists in the database (the common case after ``alembic upgrade``);
+    otherwise the database is introspected.
+    """
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names()) - {ALEMBIC_TABLE}
+    declared = Base.metadata.tables
+
+    if declared and set(declared) <= existing:
+        tables = {
+            table.name: _describe_table(table, connection.dialect)
+            for table in Base.metadata.sorted_tables
+        }
+        return DatabaseSchema(revision, "metadata", tables)
+
+    tables = {
+        name: _inspect_table(inspector, name, connection.dialect)
+        for name in sorted(existing)
+    }
+    return DatabaseSchema(revision, "introspection", tables)
+
+
+def _read_revision(connection: Connection) -> Optional[str]:
+    """Reads the current Alembic revision, if migrations were applied."""
+    if not inspect(connection).has_table(ALEMBIC_TABLE):
+        return None
+    return connection.execute(
+        text(f"SELECT version_num FROM {ALEMBIC_TABLE}")
+    ).scalar()
+
+
+def _describe_table(table: Any, dialect: Any) -> dict[str, Any]:
+    """Describes a ``Table`` from the SQLAlchemy metadata."""
+    unique = {
+        constraint.columns.keys()[0]
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+        and len(constraint.columns) == 1
+    }
+    unique.update(
+        column.name for column in table.columns if column.unique
+    )
+    return {
+        "columns": [
+            {
+                "name": column.name,
+                "type": column.type.compile(dialect=dialect),
+                "nullable": bool(column.nullable),
+                "primary_key": column.primary_key,
+                "unique": column.name in unique,
+                "references": next(
+                    (
+                        f"{fk.column.table.name}.{fk.column.name}"
+                        for fk in column.foreign_keys
+                    ),
+                    None,
+                ),
+            }
+            for column in table.columns
+        ],
+        "indexes": sorted(
+            (
+                {
+                    "name": index.name,
+                    "columns": [column.name for column in index.columns],
+                    "unique": bool(index.unique),
+                }
+                for index in table.indexes
+            ),
+            key=lambda index: index["name"] or "",
+        ),
+    }
+
+
+def _inspect_table(inspector: Any, name: str, dialect: Any) -> dict[str, Any]:
+    """Describes a table by introspecting the database."""
+    primary_key = set(
+        inspector.get_pk_constraint(name).get("constrained_columns") or []
+    )
+    references = {}
+    for fk in inspector.get_foreign_keys(name):
+        for local, remote in zip(
+            fk["constrained_columns"], fk["referred_columns"]
+        ):
+            references[local] = f"{fk['referred_table']}.{remote}"
+    unique = {
+        constraint["column_names"][0]
+        for constraint in inspector.get_unique_constraints(name)
+        if len(constraint["column_names"]) == 1
+    }
+    return {
+        "columns": [
+            {
+                "name": column["name"],
+                "type": column["type"].compile(dialect=dialect),
+                "nullable": bool(column["nullable"]),
+                "primary_key": column["name"] in primary_key,
+                "unique": column["name"] in unique,
+                "references": references.get(column["name"]),
+            }
+            for column in inspector.get_columns(name)
+        ],
+        "indexes": [
+            {
+                "name": index["name"],
+                "columns": index["column_names"],
+                "unique": bool(index["unique"]),
+            }
+            for index in inspector.get_indexes(name)
+        ],
+    }
+
+
+def _render_table(name: str, table: dict[str, Any]) -> str:
+    """Renders one table as a compact line for the prompt."""
+    columns = []
+    for column in table["columns"]:
+        parts = [column["name"], column["type"]]
+        if column["primary_key"]:
+            parts.append("PK")
+        elif not column["nullable"]:
+            parts.append("NOT NULL")
+        if column["unique"]:
+            parts.append("UNIQUE")
+        if column["references"]:
+            parts.append(f"FK -> {column['references']}")
+        columns.append(" ".join(parts))
+
+    line = f"{name} ({', '.join(columns)})"
+    if table["indexes"]:
+        indexes = ", ".join(
+            f"{index['name']}({', '.join(index['columns'])})"
+            + (" UNIQUE" if index["unique"] else "")
+            for index in table["indexes"]
+        )
+        line += f"\n  indexes: {indexes}"
+    return line
@@ -0,0 +1,103 @@
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Integer, any_, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.models.order import OrderItem
+from app.models.product import Product
+from app.services.product_cache import invalidate_on_commit
+
+
+class InsufficientStockError(Exception):
+    """Raised when a product cannot cover the requested quantity."""
+
+    def __init__(self, product_id: int):
+        super().__init__(f"Insufficient stock for product {product_id}")
+        self.product_id = product_id
+
+
+def reserve_stock(
+    db: Session, quantities: Mapping[int, int]
+) -> dict[int, int]:
+    """
+    Decrements stock for every product, or for none of them.
+
+    Each product is reserved with one conditional
+    ``UPDATE ... WHERE stock_quantity >= :q RETURNING``, so the check and
+    the decrement are atomic and only the product's own row is locked, for
+    the rest of the transaction. Products are always visited in ascending
+    id order, so two orders sharing products cannot deadlock. When a
+    product falls short, ``InsufficientStockError`` is raised and the
+    caller must roll back the reservations already made.
+
+    :param db: Session whose transaction holds the reservation
+    :param quantities: Quantity to reserve per product id
+    :return: Remaining stock per product id
+    """
+    remaining = {}
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        stock = db.execute(
+            update(Product)
+            .where(
+                Product.id == product_id,
+                Product.stock_quantity >= quantity,
+            )
+            .values(stock_quantity=Product.stock_quantity - quantity)
+            .returning(Product.stock_quantity)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if stock is None:
+            raise InsufficientStockError(product_id)
+        remaining[product_id] = stock
+    return remaining
+
+
+def restore_stock(db: Session, order_ids: Sequence[int]) -> None:
+    """
+    Puts the items of the given orders back into stock.
+
+    Quantities are summed per product and applied with one
+    ``UPDATE products ... FROM (SELECT product_id, SUM(quantity) ...)``,
+    however many orders and items there are. The affected products are
+    locked in id order first, matching ``reserve_stock``, so a restore
+    cannot deadlock with concurrent reservations.
+
+    :param db: Session whose transaction performs the restore
+    :param order_ids: Ids of the orders being cancelled
+    """
+    restored = (
+        select(
+            OrderItem.product_id,
+            func.sum(OrderItem.quantity).label("quantity"),
+        )
+        .where(match_ids(db, OrderItem.order_id, order_ids))
+        .group_by(OrderItem.product_id)
+        .subquery()
+    )
+    locked = db.execute(
+        select(Product.id)
+        .where(Product.id.in_(select(restored.c.product_id)))
+        .order_by(Product.id)
+        .with_for_update()
+    ).scalars()
+    invalidate_on_commit(db, locked, stock_only=True)
+    db.execute(
+        update(Product)
+        .where(Product.id == restored.c.product_id)
+        .values(stock_quantity=Product.stock_quantity + restored.c.quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def match_ids(db: Session, column: Any, ids: Sequence[int]) -> Any:
+    """
+    ``column = ANY(:ids)`` on PostgreSQL, ``column IN (...)`` elsewhere.
+
+    A single array parameter keeps the statement (and asyncpg's bind
+    parameter limit) independent of how many ids are passed.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(list(ids), ARRAY(Integer)))
+    return column.in_(ids)
@@ -0,0 +1,447 @@
+"""
+Bulk-loads a synthetic dataset at production-like volumes.
+
+    python -m app.tools.datagen --url postgresql://user:pw@localhost/db \\
+        --customers 1000000 --products 100000 --orders 20000000 --truncate
+
+Rows are generated in chunks from a seeded RNG, so the same arguments
+always produce the same data, and written with ``COPY ... FROM STDIN`` on
+PostgreSQL (multi-row INSERTs elsewhere). Traffic is skewed the way real
+stores are: customers and products are drawn from Zipf distributions
+(``--customer-skew``, ``--product-skew``), so a few customers place many
+orders and a few SKUs are in most baskets; hot ids are scattered over
+the id range. Recent orders are
+mostly pending, older ones completed with a few canceled. New rows are
+appended after the existing ids unless ``--truncate`` is given; sequences
+are moved past them and the tables analyzed at the end.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import (
+    Connection,
+    create_engine,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Engine
+
+from app import models  # noqa: F401
+from app.database import Base
+
+CATEGORIES = (
+    "Electronics",
+    "Accessories",
+    "Home",
+    "Kitchen",
+    "Garden",
+    "Toys",
+    "Books",
+    "Clothing",
+    "Shoes",
+    "Sports",
+    "Beauty",
+    "Grocery",
+)
+ADJECTIVES = ("Basic", "Classic", "Compact", "Deluxe", "Pro", "Smart")
+CITIES = (
+    ("Los Angeles", "CA", "90001"),
+    ("San Francisco", "CA", "94105"),
+    ("New York", "NY", "10001"),
+    ("Chicago", "IL", "60601"),
+    ("Houston", "TX", "77001"),
+    ("Seattle", "WA", "98101"),
+)
+# Items per order; OrderCreateSchema accepts at most 3
+ITEM_COUNTS = (1, 2, 3)
+ITEM_COUNT_WEIGHTS = (60, 30, 10)
+CUSTOMER_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+)
+PRODUCT_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "category",
+    "price",
+    "stock_quantity",
+)
+ORDER_COLUMNS = ("id", "customer_id", "date", "total_amount", "status")
+ITEM_COLUMNS = ("order_id", "product_id", "quantity", "price")
+# Orders of the last PENDING_DAYS days are mostly still pending
+PENDING_DAYS = 7
+HISTORY_DAYS = 730
+
+
+class Zipf:
+    """Draws from ``ids`` with P(rank k) proportional to 1 / k ** skew."""
+
+    def __init__(self, ids: list[int], skew: float, rng: random.Random):
+        self.rng = rng
+        self.ranks = range(len(ids))
+        self.cum_weights = list(
+            itertools.accumulate(1 / k**skew for k in range(1, len(ids) + 1))
+        )
+        # Hot ranks land on random ids, not on the oldest rows
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self._batch: list[int] = []
+
+    def sample(self, k: int = 1) -> list[int]:
+        """Returns ``k`` ids, with repetition."""
+        return [
+            self.ids[rank]
+            for rank in self.rng.choices(
+                self.ranks, cum_weights=self.cum_weights, k=k
+            )
+        ]
+
+    def draw(self) -> int:
+        """Returns one id; draws are made in batches to cut overhead."""
+        if not self._batch:
+            self._batch = self.sample(4096)
+        return self._batch.pop()
+
+
+@dataclass
+class Volumes:
+    """Rows to add per table and the skew of the references."""
+
+    customers: int
+    products: int
+    orders: int
+    customer_skew: float = 0.8
+    product_skew: float = 1.1
+
+
+def customer_rows(start: int, count: int, rng: random.Random) -> Iterator:
+    """Yields customer rows with ids from ``start``."""
+    for customer_id in range(start, start + count):
+        city, state, zip_code = rng.choice(CITIES)
+        yield (
+            customer_id,
+            f"First{customer_id}",
+            f"Last{customer_id}",
+            f"customer{customer_id}@example.com",
+            f"555-{rng.randrange(10_000):04d}",
+            f"{rng.randrange(1, 9999)} Main St",
+            city,
+            state,
+            zip_code,
+        )
+
+
+def product_rows(
+    start: int, count: int, rng: random.Random, prices: dict[int, Decimal]
+) -> Iterator:
+    """Yields product rows with ids from ``start``, recording prices."""
+    for product_id in range(start, start + count):
+        category = rng.choice(CATEGORIES)
+        # Log-normal prices: mostly tens of dollars, a long tail above
+        price = Decimal(
+            f"{min(max(rng.lognormvariate(3.5, 1.0), 0.99), 9999.99):.2f}"
+        )
+        prices[product_id] = price
+        yield (
+            product_id,
+            f"{rng.choice(ADJECTIVES)} {category} item {product_id}",
+            f"Synthetic {category.lower()} product {product_id}",
+            category,
+            price,
+            0 if rng.random() < 0.05 else rng.randrange(1, 1_000),
+        )
+
+
+def order_rows(
+    start: int,
+    count: int,
+    rng: random.Random,
+    customers: Zipf,
+    products: Zipf,
+    prices: dict[int, Decimal],
+    items: list,
+) -> Iterator:
+    """Yields order rows with ids from ``start``; fills ``items``."""
+    today = date.today()
+    for order_id in range(start, start + count):
+        age = rng.randrange(HISTORY_DAYS)
+        if age < PENDING_DAYS:
+            status = "Pending" if rng.random() < 0.9 else "Canceled"
+        else:
+            status = "Completed" if rng.random() < 0.95 else "Canceled"
+        (item_count,) = rng.choices(ITEM_COUNTS, ITEM_COUNT_WEIGHTS)
+        total = Decimal(0)
+        for product_id in {products.draw() for _ in range(item_count)}:
+            quantity = rng.randint(1, 3)
+            price = prices[product_id]
+            total += quantity * price
+            items.append((order_id, product_id, quantity, price))
+        yield (
+            order_id,
+            customers.draw(),
+            today - timedelta(days=age),
+            total,
+            status,
+        )
+
+
+class Writer:
+    """Writes row chunks to a table; multi-row INSERTs by default."""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+    def write(
+        self, table: str, columns: Sequence[str], rows: Sequence[tuple]
+    ) -> None:
+        """Appends ``rows`` (tuples in ``columns`` order) to ``table``."""
+        self.connection.execute(
+            Base.metadata.tables[table].insert(),
+            [dict(zip(columns, row)) for row in rows],
+        )
+
+
+class CopyWriter(Writer):
+    """Streams row chunks through PostgreSQL's COPY as CSV."""
+
+    def write(
+        self, table: str, columns: Sequence[str], rows: Sequence[tuple]
+    ) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = self.connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+
+def load(
+    connection: Connection,
+    writer: Writer,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    chunk_size: int,
+    flush: Any = None,
+) -> dict[str, Any]:
+    """Writes ``rows`` in committed chunks and returns the load rate."""
+    started = time.perf_counter()
+    written = 0
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        writer.write(table, columns, chunk)
+        written += len(chunk)
+        if flush is not None:
+            flush()
+        connection.commit()
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": written,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(written / elapsed) if elapsed else None,
+    }
+
+
+def next_id(connection: Connection, table: str) -> int:
+    """Returns the id after the highest one in ``table``."""
+    column = Base.metadata.tables[table].c.id
+    return (connection.scalar(select(func.max(column))) or 0) + 1
+
+
+def truncate(connection: Connection) -> None:
+    """Empties the four tables, children first."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text(
+                "TRUNCATE order_items, orders, products, customers "
+                "RESTART IDENTITY"
+            )
+        )
+    else:
+        for table in ("order_items", "orders", "products", "customers"):
+            connection.execute(Base.metadata.tables[table].delete())
+    connection.commit()
+
+
+def finish(connection: Connection) -> None:
+    """
+    Moves the id sequences past the loaded rows, bumps the catalog
+    version (so cached product listings revalidate) and analyzes.
+    """
+    catalog_version = Base.metadata.tables["catalog_version"]
+    connection.execute(
+        update(catalog_version).values(version=catalog_version.c.version + 1)
+    )
+    if connection.dialect.name == "postgresql":
+        for table in ("customers", "products", "orders", "order_items"):
+            connection.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"GREATEST((SELECT MAX(id) FROM {table}), 1))"
+                )
+            )
+    connection.execute(text("ANALYZE"))
+    connection.commit()
+
+
+def generate(
+    engine: Engine,
+    volumes: Volumes,
+    seed: int,
+    chunk_size: int,
+    reset: bool = False,
+) -> dict[str, Any]:
+    """Loads ``volumes`` of new rows and returns per-table load rates."""
+    rng = random.Random(seed)
+    report = {}
+    with engine.connect() as connection:
+        if reset:
+            truncate(connection)
+        writer = (
+            CopyWriter(connection)
+            if connection.dialect.name == "postgresql"
+            else Writer(connection)
+        )
+
+        report["customers"] = load(
+            connection,
+            writer,
+            "customers",
+            CUSTOMER_COLUMNS,
+            customer_rows(
+                next_id(connection, "customers"), volumes.customers, rng
+            ),
+            chunk_size,
+        )
+
+        products_table = Base.metadata.tables["products"]
+        prices: dict[int, Decimal] = dict(
+            connection.execute(
+                select(products_table.c.id, products_table.c.price)
+            ).all()
+        )
+        report["products"] = load(
+            connection,
+            writer,
+            "products",
+            PRODUCT_COLUMNS,
+            product_rows(
+                next_id(connection, "products"), volumes.products, rng, prices
+            ),
+            chunk_size,
+        )
+
+        customer_ids = connection.scalars(
+            select(Base.metadata.tables["customers"].c.id)
+        ).all()
+        if volumes.orders and customer_ids and prices:
+            customers = Zipf(customer_ids, volumes.customer_skew, rng)
+            products = Zipf(sorted(prices), volumes.product_skew, rng)
+            items: list[tuple] = []
+            item_count = 0
+
+            def flush_items() -> None:
+                # Items follow their orders chunk by chunk
+                nonlocal item_count
+                writer.write("order_items", ITEM_COLUMNS, items)
+                item_count += len(items)
+                items.clear()
+
+            report["orders"] = load(
+                connection,
+                writer,
+                "orders",
+                ORDER_COLUMNS,
+                order_rows(
+                    next_id(connection, "orders"),
+                    volumes.orders,
+                    rng,
+                    customers,
+                    products,
+                    prices,
+                    items,
+                ),
+                chunk_size,
+                flush=flush_items,
+            )
+            report["order_items"] = {"rows": item_count}
+
+        finish(connection)
+    return report
+
+
+def main() -> None:
+    """Parses the volumes, loads them and prints the rates as JSON."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url", required=True, help="Database URL")
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument(
+        "--customer-skew",
+        type=float,
+        default=Volumes.customer_skew,
+        help="Zipf exponent of the customer placing an order (0: uniform)",
+    )
+    parser.add_argument(
+        "--product-skew",
+        type=float,
+        default=Volumes.product_skew,
+        help="Zipf exponent of the products in a basket (0: uniform)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--truncate", action="store_true", help="Empty the tables first"
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    report = generate(
+        engine,
+        Volumes(
+            args.customers,
+            args.products,
+            args.orders,
+            args.customer_skew,
+            args.product_skew,
+        ),
+        args.seed,
+        args.chunk_size,
+        reset=args.truncate,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
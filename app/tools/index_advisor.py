@@ -0,0 +1,260 @@
+"""
+Replays the app's query shapes through EXPLAIN and reports table scans.
+
+    python -m app.tools.index_advisor --url postgresql://... --seed 200000
+
+Each shape is built with the same service code the routes use (filters,
+keyset pages, eager loads, stock restores), compiled with sample values
+taken from the data and explained after an ANALYZE. A shape is flagged
+when its plan reads a whole table of at least ``--min-rows`` rows (a
+PostgreSQL ``Seq Scan``, a SQLite ``SCAN`` without an index), which
+usually means an index is missing. Exits with status 1 if any shape is
+flagged, so it can gate CI against a seeded database.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.order import Order, OrderItem
+from app.models.product import CATALOG_VERSION_ID, CatalogVersion, Product
+from app.schemas.orders import OrderFilter
+from app.services.order import OrderService, OrderStatus
+from app.tools.datagen import Volumes, generate, next_id
+from app.utils.pagination import PaginationParams
+
+PAGE_SIZE = PaginationParams().page_size
+
+
+@dataclass
+class Samples:
+    """Existing values the shapes are explained with."""
+
+    customer_id: int = 1
+    product_id: int = 1
+    order_ids: list[int] = field(default_factory=lambda: [1])
+
+    @classmethod
+    def load(cls, db: Session) -> "Samples":
+        """Picks values from the middle of the data."""
+        samples = cls()
+        order_ids = db.scalars(
+            select(Order.id)
+            .order_by(Order.id)
+            .offset(db.scalar(select(func.count(Order.id))) // 2)
+            .limit(PAGE_SIZE)
+        ).all()
+        if order_ids:
+            samples.order_ids = order_ids
+            samples.customer_id = db.scalar(
+                select(Order.customer_id).where(Order.id == order_ids[0])
+            )
+        product_id = db.scalar(select(func.max(OrderItem.product_id)))
+        if product_id is not None:
+            samples.product_id = product_id
+        return samples
+
+
+def order_page(
+    filters: Callable[[Samples], OrderFilter],
+) -> Callable[[Session, Samples], Any]:
+    """The first page of GET /orders/ with the given filters."""
+
+    def build(db: Session, samples: Samples) -> Any:
+        _, _, query = OrderService(db).get_orders(filters(samples))
+        return query.order_by(Order.id).limit(PAGE_SIZE + 1).statement
+
+    return build
+
+
+# Shape name -> statement builder
+SHAPES: dict[str, Callable[[Session, Samples], Any]] = {
+    "orders: by status": order_page(
+        lambda samples: OrderFilter(status=OrderStatus.COMPLETED.value)
+    ),
+    "orders: by customer": order_page(
+        lambda samples: OrderFilter(customer_id=samples.customer_id)
+    ),
+    "orders: by price": order_page(
+        lambda samples: OrderFilter(min_price=50, max_price=60)
+    ),
+    "orders: pending by price": order_page(
+        lambda samples: OrderFilter(
+            status=OrderStatus.PENDING.value,
+            min_price=50,
+            max_price=60,
+        )
+    ),
+    "orders: keyset page": lambda db, samples: (
+        select(Order)
+        .where(Order.id > samples.order_ids[0])
+        .order_by(Order.id)
+        .limit(PAGE_SIZE + 1)
+    ),
+    "orders: of customer": lambda db, samples: select(Order).where(
+        Order.customer_id == samples.customer_id
+    ),
+    "order items: eager load": lambda db, samples: select(OrderItem).where(
+        OrderItem.order_id.in_(samples.order_ids)
+    ),
+    "order items: stock restore": lambda db, samples: (
+        select(OrderItem.product_id, func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id.in_(samples.order_ids))
+        .group_by(OrderItem.product_id)
+    ),
+    "order items: product delete": lambda db, samples: select(
+        OrderItem.id
+    ).where(OrderItem.product_id == samples.product_id),
+    "products: catalog version": lambda db, samples: select(
+        CatalogVersion.version,
+        select(func.max(Product.updated_at)).scalar_subquery(),
+    ).where(CatalogVersion.id == CATALOG_VERSION_ID),
+}
+
+
+@dataclass
+class Finding:
+    """The scans of one explained shape."""
+
+    shape: str
+    scans: list[str]
+    full_scans: list[str]
+    sql: str
+
+    @property
+    def flagged(self) -> bool:
+        """True when the shape reads a large table in full."""
+        return bool(self.full_scans)
+
+
+def explain_scans(db: Session, sql: str) -> list[tuple[str, str, bool]]:
+    """Returns (table, description, is_full_scan) per scan in the plan."""
+    if db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return list(_postgres_scans(plan[0]["Plan"]))
+
+    scans = []
+    for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+        detail = row[-1]
+        words = detail.split()
+        if words[0] in ("SCAN", "SEARCH"):
+            table = words[1]
+            full = words[0] == "SCAN" and "INDEX" not in detail
+            scans.append((table, detail, full))
+    return scans
+
+
+def _postgres_scans(node: dict):
+    """Walks a PostgreSQL JSON plan for the nodes that read a table."""
+    if "Relation Name" in node:
+        description = node["Node Type"]
+        if "Index Name" in node:
+            description += f" using {node['Index Name']}"
+        description += f" on {node['Relation Name']}"
+        yield (
+            node["Relation Name"],
+            description,
+            node["Node Type"] == "Seq Scan",
+        )
+    for child in node.get("Plans", []):
+        yield from _postgres_scans(child)
+
+
+def advise(db: Session, min_rows: int) -> list[Finding]:
+    """Explains every shape and returns what each one scans."""
+    db.execute(text("ANALYZE"))
+    db.commit()
+    samples = Samples.load(db)
+    sizes: dict[str, int] = {}
+    findings = []
+    for shape, build in SHAPES.items():
+        sql = str(
+            build(db, samples).compile(
+                dialect=db.get_bind().dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+        scans = explain_scans(db, sql)
+        full_scans = []
+        for table, description, full in scans:
+            if table not in sizes:
+                sizes[table] = db.scalar(
+                    text(f'SELECT COUNT(*) FROM "{table}"')
+                )
+            if full and sizes[table] >= min_rows:
+                full_scans.append(f"{description} ({sizes[table]} rows)")
+        findings.append(
+            Finding(
+                shape=shape,
+                scans=[description for _, description, _ in scans],
+                full_scans=full_scans,
+                sql=" ".join(sql.split()),
+            )
+        )
+    return findings
+
+
+def main() -> None:
+    """Prints the findings and exits non-zero if a shape is flagged."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True, help="Database URL")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Top the orders table up to this many rows first",
+    )
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=1_000,
+        help="Ignore full scans of smaller tables (default: %(default)s)",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if args.seed:
+        Base.metadata.create_all(engine)
+        _seed(engine, args.seed)
+    with Session(engine) as db:
+        findings = advise(db, args.min_rows)
+
+    if args.json:
+        print(json.dumps([asdict(f) for f in findings], indent=2))
+    else:
+        for finding in findings:
+            status = "SCAN" if finding.flagged else "ok"
+            print(f"{status:<5} {finding.shape}")
+            for scan in finding.full_scans or finding.scans:
+                print(f"      {scan}")
+    sys.exit(1 if any(f.flagged for f in findings) else 0)
+
+
+def _seed(engine: Engine, orders: int) -> None:
+    """Tops the tables up with a skewed dataset from app.tools.datagen."""
+    with engine.connect() as connection:
+        existing = {
+            table: next_id(connection, table) - 1
+            for table in ("customers", "products", "orders")
+        }
+    volumes = Volumes(
+        customers=max(orders // 10 - existing["customers"], 0),
+        products=max(1_000 - existing["products"], 0),
+        orders=max(orders - existing["orders"], 0),
+    )
+    if volumes.orders:
+        generate(engine, volumes, seed=42, chunk_size=50_000)
+
+
+if __name__ == "__main__":
+    main()
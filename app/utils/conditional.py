@@ -0,0 +1,69 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Returns a weak ETag for a representation identified by ``parts``.
+
+    Parts are e.g. a row id and its ``updated_at``, or a listing
+    watermark and the query string; the tag changes whenever one does.
+    """
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strips the weak prefix, for weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Tells whether the request's ``If-None-Match`` matches ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == target for tag in header.split(","))
+
+
+def cache_headers(etag: str, public: bool = True) -> dict[str, str]:
+    """Returns the ETag and Cache-Control headers of a cacheable read."""
+    scope = "public" if public else "private"
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"{scope}, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+            "must-revalidate"
+        ),
+    }
+
+
+def not_modified(etag: str, public: bool = True) -> Response:
+    """Returns an empty 304 response carrying the cache headers."""
+    return Response(status_code=304, headers=cache_headers(etag, public))
+
+
+def conditional_get(
+    request: Request, response: Response, etag: str, public: bool = True
+) -> Optional[Response]:
+    """
+    Short-circuits a GET whose representation the client already has.
+
+    Returns a 304 response when ``If-None-Match`` matches, so the route
+    can return it before loading or serializing anything more; otherwise
+    sets the cache headers on ``response`` and returns None.
+    """
+    if is_not_modified(request, etag):
+        return not_modified(etag, public)
+    response.headers.update(cache_headers(etag, public))
+    return None
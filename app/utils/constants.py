@@ -3,3 +3,13 @@ ERROR_MESSAGE = "Something went wrong. Please try again later."
 PRODUCT_NOT_FOUND = "Product not found."
 CUSTOMER_NOT_FOUND = "Customer not found."
 INVALID_ID = "Invalid ID."
+INVALID_CURSOR = "Invalid cursor."
+NO_ORDER_FILTER = "At least one filter is required."
+ORDER_NOT_CANCELLABLE = "Only pending orders can be cancelled by filter."
+
+# Largest page_size a list endpoint accepts
+MAX_PAGE_SIZE = 100
+
+# Statements a list endpoint may run per page: count, page and an eager
+# load or the products catalog version; replica checks are not counted
+LIST_QUERY_BUDGET = 3
@@ -0,0 +1,197 @@
+import json
+import re
+import threading
+from enum import Enum
+from typing import Any, Hashable
+
+from cachetools import TTLCache
+from sqlalchemy import Table, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.pool import Pool
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.util import find_tables
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+class CountStrategy(str, Enum):
+    """How a paginated listing computes its total_count."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+# Matches the target table of INSERT / UPDATE / DELETE statements.
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+\"?(\w+)\"?",
+    re.IGNORECASE,
+)
+
+_cache: TTLCache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL
+)
+_cache_lock = threading.Lock()
+
+# Tables written in a session's transaction, invalidated once it commits
+_WRITTEN_KEY = "count_cache_written"
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def count_query(query: Query, strategy: CountStrategy) -> tuple[int, bool]:
+    """
+    Counts the rows matched by ``query`` using the given strategy.
+
+    :param query: SQLAlchemy Query object (ordering is ignored)
+    :param strategy: Which CountStrategy to use
+    :return: Tuple of the count and whether it is known to be exact
+    """
+    if strategy == CountStrategy.CACHED:
+        return _cached_count(query)
+    if strategy == CountStrategy.ESTIMATED:
+        return _estimated_count(query)
+    return query.count(), True
+
+
+def invalidate_table(table: str) -> None:
+    """Drops every cached count that reads from ``table``."""
+    with _cache_lock:
+        for key in [key for key in _cache if table in key[0]]:
+            _cache.pop(key, None)
+
+
+def clear_count_cache() -> None:
+    """Drops every cached count."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cached_count(query: Query) -> tuple[int, bool]:
+    """Serves the count from the TTL cache, computing it on a miss."""
+    key = _cache_key(query)
+    with _cache_lock:
+        count = _cache.get(key)
+    if count is not None:
+        # Writes from other workers do not invalidate this process' cache.
+        return count, False
+
+    count = query.count()
+    with _cache_lock:
+        _cache[key] = count
+    return count, True
+
+
+def _cache_key(query: Query) -> tuple[frozenset, str, Hashable]:
+    """Keys a count by its tables and the compiled filter SQL and params."""
+    statement = query.statement
+    compiled = _compile(statement, query.session.get_bind().dialect)
+    tables = frozenset(table.name for table in find_tables(statement))
+    params = tuple(sorted(compiled.params.items()))
+    return tables, compiled.string, params
+
+
+def _estimated_count(query: Query) -> tuple[int, bool]:
+    """
+    Reads the planner's row estimate instead of scanning the rows.
+
+    Unfiltered single-table queries use ``pg_class.reltuples``; anything
+    else uses the top-level row estimate of ``EXPLAIN``. Small estimates
+    are recounted exactly because they are cheap and the planner is least
+    accurate there. Non-PostgreSQL databases always count exactly.
+    """
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return query.count(), True
+
+    statement = query.statement
+    froms = statement.get_final_froms()
+    if (
+        statement.whereclause is None
+        and len(froms) == 1
+        and isinstance(froms[0], Table)
+    ):
+        estimate = query.session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": froms[0].name},
+        ).scalar()
+    else:
+        plan = query.session.execute(_Explain(statement)).scalar()
+        # Drivers without a JSON codec for EXPLAIN return the text
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # reltuples is -1 (or 0) for tables that were never analyzed.
+    if estimate is None or estimate < settings.COUNT_ESTIMATE_THRESHOLD:
+        return query.count(), True
+    return int(estimate), False
+
+
+def _compile(statement: Any, dialect: Any) -> Any:
+    """Compiles a statement with IN-list parameters expanded inline."""
+    return statement.compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+@event.listens_for(Session, "after_begin")
+def _track_writes(session: Session, transaction, connection) -> None:
+    """Points the connection at its session's set of written tables."""
+    connection.info[_WRITTEN_KEY] = session.info.setdefault(
+        _WRITTEN_KEY, set()
+    )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_write(conn, cursor, statement, parameters, context, executemany):
+    """
+    Records the table a write statement touched. Writes made outside a
+    session have no transaction to wait for and invalidate at once.
+    """
+    match = _WRITE_RE.match(statement)
+    if not match:
+        return
+    table = match.group(1).lower()
+    written = conn.info.get(_WRITTEN_KEY)
+    if written is None:
+        invalidate_table(table)
+    else:
+        written.add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """Invalidates cached counts for the tables the commit wrote to."""
+    for table in session.info.pop(_WRITTEN_KEY, ()):
+        logger.debug("Invalidating cached counts for %s", table)
+        invalidate_table(table)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_WRITTEN_KEY, None)
+
+
+@event.listens_for(Pool, "checkin")
+def _untrack_writes(dbapi_connection, connection_record) -> None:
+    """Unlinks a connection from its session once it is released."""
+    connection_record.info.pop(_WRITTEN_KEY, None)
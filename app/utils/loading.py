@@ -0,0 +1,53 @@
+import typing
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+@lru_cache(maxsize=None)
+def loader_options(model: Any, schema: type[BaseModel]) -> tuple:
+    """
+    Builds eager-load options for the relationships ``schema`` serializes.
+
+    Every schema field named after a relationship of ``model`` is loaded
+    up front: many-to-one relationships with a JOIN, collections with a
+    separate ``SELECT ... IN``. Nested schemas are walked recursively, so
+    serializing the result never triggers a lazy load per row.
+
+    :param model: SQLAlchemy model class the query selects
+    :param schema: Pydantic response schema the rows are serialized into
+    :return: Tuple of loader options for ``Query.options``
+    """
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.model_fields.items():
+        relationship = relationships.get(name)
+        nested = nested_schema(field.annotation)
+        if relationship is None or nested is None:
+            continue
+
+        attribute = getattr(model, name)
+        loader = (
+            selectinload(attribute)
+            if relationship.uselist
+            else joinedload(attribute)
+        )
+        child_options = loader_options(relationship.mapper.class_, nested)
+        options.append(
+            loader.options(*child_options) if child_options else loader
+        )
+    return tuple(options)
+
+
+def nested_schema(annotation: Any) -> type[BaseModel] | None:
+    """Unwraps ``Optional[X]`` / ``List[X]`` down to a schema class."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
@@ -1,7 +1,16 @@
-import os
-
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from typing import Any, Optional
 
+from app.config import settings
+from app.utils.request_context import request_elapsed_ms, request_id
 
 # Define log directory and file path
 LOG_DIR = "logs"
@@ -10,30 +19,190 @@ log_file = os.path.join(LOG_DIR, "app.log")
 # Ensure log directory exists
 os.makedirs(LOG_DIR, exist_ok=True)
 
+
+class RequestContextFilter(logging.Filter):
+    """Adds the request id and elapsed request time to each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id()
+        record.latency_ms = request_elapsed_ms()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of INFO and lower records."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "file": record.filename,
+            "function": record.funcName,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "latency_ms": getattr(record, "latency_ms", None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread without waiting on I/O.
+
+    With the "drop" policy a full queue drops the record (counted in
+    ``dropped``) instead of stalling the request; with "block" the caller
+    waits for room, so no record is lost.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the traceback into exc_text so the listener's formatter
+        # can still place it; the base class folds it into the message.
+        # A copy, so other handlers still get the caller's record.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
 # Create logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger.setLevel(settings.LOG_LEVEL)
 
-# Create file handler to store logs
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
+# Define log format
+formatter: logging.Formatter = (
+    JSONFormatter()
+    if settings.LOG_FORMAT == "json"
+    else logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(filename)s | %(funcName)s | "
+        "%(message)s"
+    )
+)
+
+# Create file handler to store logs, rotated by size
+file_handler = logging.handlers.RotatingFileHandler(
+    log_file,
+    maxBytes=settings.LOG_FILE_MAX_BYTES,
+    backupCount=settings.LOG_FILE_BACKUPS,
+)
 
 # Create console handler to show logs in terminal
 console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
 
-# Define log format
-formatter = logging.Formatter(
-    "%(asctime)s | %(levelname)s | %(filename)s | %(funcName)s | %(message)s"
-)
+# Set formatter for handlers
+for output in (file_handler, console_handler):
+    output.setLevel(settings.LOG_LEVEL)
+    output.setFormatter(formatter)
 
+# Request context and sampling run on the calling thread (the context
+# variables are not visible from the listener thread).
+request_filters = [
+    RequestContextFilter(),
+    SamplingFilter(settings.LOG_INFO_SAMPLE_RATE),
+]
+
+queue_handler: Optional[BoundedQueueHandler] = None
+listener: Optional[logging.handlers.QueueListener] = None
+
+if settings.LOG_ASYNC:
+    # Disk and console I/O happen on the listener thread, not the request
+    queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE),
+        block=settings.LOG_QUEUE_POLICY == "block",
+    )
+    for request_filter in request_filters:
+        queue_handler.addFilter(request_filter)
+    logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(
+        queue_handler.queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True,
+    )
+else:
+    # Add handlers to logger
+    for output in (file_handler, console_handler):
+        for request_filter in request_filters:
+            output.addFilter(request_filter)
+        logger.addHandler(output)
+
+
+def start_logging() -> None:
+    """Starts the listener thread (again, e.g. in a forked worker)."""
+    if listener is not None and listener._thread is None:
+        listener.start()
+
+
+def stop_logging() -> None:
+    """Flushes queued records and stops the listener thread."""
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
+def disable_file_logging() -> None:
+    """
+    Logs to the console only, e.g. in the preforking server: every worker
+    would otherwise write and rotate logs/app.log on its own.
+    """
+    if listener is not None:
+        listener.handlers = tuple(
+            handler for handler in listener.handlers
+            if handler is not file_handler
+        )
+    else:
+        logger.removeHandler(file_handler)
+    file_handler.close()
 
-# Set formatter for handlers
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+def log_stats() -> dict[str, Any]:
+    """Returns the queue depth and dropped record count of this worker."""
+    if queue_handler is None:
+        return {"async": False}
+    return {
+        "async": True,
+        "queued": queue_handler.queue.qsize(),
+        "capacity": settings.LOG_QUEUE_SIZE,
+        "dropped": queue_handler.dropped,
+    }
 
 
+start_logging()
+atexit.register(stop_logging)
@@ -1,62 +1,262 @@
-from typing import Generic, List, Optional, TypeVar
+import base64
+import binascii
+import json
+from typing import Any, Generic, List, Optional, TypeVar
 
-from fastapi import Request
-from pydantic import BaseModel
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, Field
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query
 
+from app.utils.constants import INVALID_CURSOR, MAX_PAGE_SIZE
+from app.utils.counting import CountStrategy, count_query
+from app.utils.projection import Projection
+
 T = TypeVar("T")  # Generic Type Variable for any response model
 
+NEXT = "n"
+PREVIOUS = "p"
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """A response model for paginated results."""
 
-    total_count: int
-    total_pages: int
-    page: int
+    total_count: Optional[int]
+    total_count_exact: bool = True
+    total_pages: Optional[int]
+    page: Optional[int]
     page_size: int
     next_page: Optional[str]
     previous_page: Optional[str]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
     results: List[T]  # This allows storing any response type
 
 
+class PaginationParams(BaseModel):
+    """
+    Query parameters for paginated list endpoints.
+
+    Clients that only need to walk forward should follow ``next_cursor``
+    instead of incrementing ``page``: a cursor seeks straight to the last
+    seen key, so every page costs the same regardless of depth.
+    """
+
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    with_count: bool = True
+    count: CountStrategy = CountStrategy.EXACT
+
+
 T = TypeVar("T")
 
 
 def paginate(
-    query: Query, page: int, page_size: int, request: Request
+    query: Query,
+    page: int,
+    page_size: int,
+    request: Request,
+    cursor: Optional[str] = None,
+    with_count: bool = True,
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+    projection: Optional[Projection] = None,
 ) -> PaginatedResponse[T]:
     """
     Generic pagination function for SQLAlchemy queries.
 
+    Results are ordered by the primary key of the queried entity. When a
+    ``cursor`` is given, the page is fetched with a keyset seek
+    (``WHERE id > :cursor``) instead of an OFFSET, and ``page`` is ignored.
+
     :param query: SQLAlchemy Query object
     :param page: Current page number
     :param page_size: Number of records per page
     :param request: FastAPI request object (for generating URLs)
+    :param cursor: Opaque cursor from a previous response (keyset mode)
+    :param with_count: Whether to run the COUNT query for total_count
+    :param count_strategy: How total_count is computed when with_count
+    :param projection: Select only the columns of a response schema
     :return: PaginatedResponse with generic results
     """
-    total_count = query.count()
+    key = _key_column(query)
+    query = query.order_by(None)
+
+    total_count, total_count_exact = (
+        count_query(query, count_strategy) if with_count else (None, False)
+    )
     total_pages = (
-        total_count + page_size - 1
-    ) // page_size  # Ceiling division
+        (total_count + page_size - 1) // page_size  # Ceiling division
+        if total_count is not None
+        else None
+    )
 
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
+    if projection is not None:
+        query = projection.apply(query)
+
+    if cursor:
+        return _paginate_keyset(
+            query,
+            key,
+            cursor,
+            page_size,
+            request,
+            total_count,
+            total_count_exact,
+            total_pages,
+            projection,
+        )
+
+    rows = (
+        query.order_by(key)
+        .offset((page - 1) * page_size)
+        .limit(page_size + 1)
+        .all()
+    )
+    has_next = len(rows) > page_size
+    items = rows[:page_size]
+    next_cursor = (
+        _encode_cursor(_key_value(items[-1], key), NEXT) if has_next else None
+    )
+    if projection is not None:
+        items = projection.load(items)
 
     return PaginatedResponse[T](
         total_count=total_count,
+        total_count_exact=total_count_exact,
         total_pages=total_pages,
         page=page,
         page_size=page_size,
-        next_page=_get_next_page_url(request, page, total_pages, page_size),
+        next_page=_get_next_page_url(request, page, has_next, page_size),
         previous_page=_get_previous_page_url(request, page, page_size),
+        next_cursor=next_cursor,
+        previous_cursor=None,
         results=items,
     )
 
 
+async def apaginate(
+    db: AsyncSession,
+    query: Query,
+    page: int,
+    page_size: int,
+    request: Request,
+    **kwargs: Any,
+) -> PaginatedResponse[T]:
+    """
+    Async variant of ``paginate`` for the async database stack.
+
+    :param db: AsyncSession the query is bound to (via ``db.sync_session``)
+    :param query: SQLAlchemy Query object
+    :param page: Current page number
+    :param page_size: Number of records per page
+    :param request: FastAPI request object (for generating URLs)
+    :param kwargs: Any of the keyword arguments of ``paginate``
+    :return: PaginatedResponse with generic results
+    """
+    return await db.run_sync(
+        lambda _: paginate(query, page, page_size, request, **kwargs)
+    )
+
+
+def _paginate_keyset(
+    query: Query,
+    key: Any,
+    cursor: str,
+    page_size: int,
+    request: Request,
+    total_count: Optional[int],
+    total_count_exact: bool,
+    total_pages: Optional[int],
+    projection: Optional[Projection],
+) -> PaginatedResponse[T]:
+    """Fetches one page after (or before) the key encoded in the cursor."""
+    last_key, direction = _decode_cursor(cursor, key)
+
+    # The seek starts at the cursor's own row: if it is still there, the
+    # side we came from has rows. The other side is only known to
+    # continue when the seek returned more than a full page after it.
+    if direction == NEXT:
+        seek = query.filter(key >= last_key).order_by(key)
+    else:
+        seek = query.filter(key <= last_key).order_by(key.desc())
+
+    rows = seek.limit(page_size + 2).all()
+    has_origin = bool(rows) and _key_value(rows[0], key) == last_key
+    if has_origin:
+        rows = rows[1:]
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+    if direction == PREVIOUS:
+        items.reverse()
+
+    has_next, has_previous = (
+        (has_more, has_origin) if direction == NEXT else (has_origin, has_more)
+    )
+    next_cursor = previous_cursor = None
+    if items:
+        if has_next:
+            next_cursor = _encode_cursor(_key_value(items[-1], key), NEXT)
+        if has_previous:
+            previous_cursor = _encode_cursor(
+                _key_value(items[0], key), PREVIOUS
+            )
+    if projection is not None:
+        items = projection.load(items)
+
+    return PaginatedResponse[T](
+        total_count=total_count,
+        total_count_exact=total_count_exact,
+        total_pages=total_pages,
+        page=None,
+        page_size=page_size,
+        next_page=_get_cursor_url(request, next_cursor, page_size),
+        previous_page=_get_cursor_url(request, previous_cursor, page_size),
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        results=items,
+    )
+
+
+def _key_column(query: Query) -> Any:
+    """Returns the primary key column of the query's leading entity."""
+    entity = query.column_descriptions[0]["entity"]
+    return inspect(entity).primary_key[0]
+
+
+def _key_value(item: Any, key: Any) -> Any:
+    """Reads the ordering key from an ORM instance or a result row."""
+    return getattr(item, key.key)
+
+
+def _encode_cursor(value: Any, direction: str) -> str:
+    """Encodes an ordering key and direction into an opaque cursor."""
+    raw = json.dumps([value, direction], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str, key: Any) -> tuple[Any, str]:
+    """Decodes a cursor produced by ``_encode_cursor`` for ``key``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, direction = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=INVALID_CURSOR) from e
+    # Exact type: a string or a bool must not reach an integer key
+    if (
+        direction not in (NEXT, PREVIOUS)
+        or type(value) is not key.type.python_type
+    ):
+        raise HTTPException(status_code=400, detail=INVALID_CURSOR)
+    return value, direction
+
+
 def _get_next_page_url(
-    request: Request, page: int, total_pages: int, page_size: int
+    request: Request, page: int, has_next: bool, page_size: int
 ) -> Optional[str]:
     """Generates the next page URL if available."""
-    if page < total_pages:
+    if has_next:
         return str(
             request.url.include_query_params(
                 page=page + 1, page_size=page_size
@@ -76,3 +276,16 @@ def _get_previous_page_url(
             )
         )
     return None
+
+
+def _get_cursor_url(
+    request: Request, cursor: Optional[str], page_size: int
+) -> Optional[str]:
+    """Generates a keyset page URL for the given cursor."""
+    if cursor is None:
+        return None
+    return str(
+        request.url.remove_query_params("page").include_query_params(
+            cursor=cursor, page_size=page_size
+        )
+    )
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.utils.prometheus import POOL_WAIT
+from app.utils.request_timing import record_pool_wait
+
+
+class PoolStats:
+    """Checkout counters for one connection pool in this worker."""
+
+    def __init__(self):
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        """Records how long one checkout waited for a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current gauges and counters."""
+        pool = self.pool
+        gauges = {}
+        if isinstance(pool, QueuePool):
+            gauges = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                **gauges,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(
+                    self.wait_time_total * 1000 / self.checkouts, 3
+                )
+                if self.checkouts
+                else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+_stats: dict[str, PoolStats] = {}
+
+
+def pool_stats(name: str) -> PoolStats:
+    """Returns the stats registered under ``name``, creating them."""
+    return _stats.setdefault(name, PoolStats())
+
+
+def pool_snapshot() -> dict[str, Any]:
+    """Returns the stats of every pool in this worker process."""
+    return {
+        "pid": os.getpid(),
+        "pools": {name: stats.snapshot() for name, stats in _stats.items()},
+    }
+
+
+class _InstrumentedPool:
+    """
+    Times how long each checkout waits for a connection.
+
+    Pools are named with ``pool_logging_name``; stats survive
+    ``Pool.recreate()`` (e.g. on ``engine.dispose()``) because they are
+    registered by name.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = pool_stats(self.logging_name or "default")
+        self.stats.pool = self
+        self.wait_histogram = POOL_WAIT.labels(self.logging_name or "default")
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.stats.record_wait(waited, timed_out)
+            self.wait_histogram.observe(waited)
+            record_pool_wait(waited)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """QueuePool with checkout wait metrics."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait metrics."""
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    """NullPool (PgBouncer mode) with connect time metrics."""
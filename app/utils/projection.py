@@ -0,0 +1,90 @@
+from typing import Any, Iterable
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import inspect
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Query
+
+from app.utils.loading import nested_schema
+
+SEPARATOR = "__"
+
+
+class Projection:
+    """
+    Selects only the columns a response schema returns.
+
+    The columns are derived from the schema fields: plain columns and
+    hybrid properties are selected directly, and nested schemas for
+    many-to-one relationships are joined in and selected with a prefixed
+    label. Rows come back as plain tuples (no ORM instances, nothing added
+    to the session identity map) and are validated straight into the
+    schema.
+    """
+
+    def __init__(self, model: Any, schema: type[BaseModel]):
+        self.model = model
+        self.schema = schema
+        self.columns: list[Any] = []
+        self.joins: list[Any] = []
+        self._collect(model, schema, prefix="")
+        self._adapter = TypeAdapter(list[schema])
+        self._nested = bool(self.joins)
+
+    def apply(self, query: Query) -> Query:
+        """Restricts ``query`` to the projected columns."""
+        for relationship in self.joins:
+            query = query.join(relationship)
+        return query.with_entities(*self.columns)
+
+    def load(self, rows: Iterable[Any]) -> list[BaseModel]:
+        """Validates result rows of ``apply`` into the response schema."""
+        if self._nested:
+            return self._adapter.validate_python(
+                [_unflatten(row._mapping) for row in rows]
+            )
+        return self._adapter.validate_python(
+            [row._mapping for row in rows]
+        )
+
+    def _collect(self, model: Any, schema: type[BaseModel], prefix: str):
+        """Adds the columns and joins needed for ``schema`` on ``model``."""
+        mapper = inspect(model)
+        for name, field in schema.model_fields.items():
+            label = f"{prefix}{name}"
+            if name in mapper.column_attrs:
+                self.columns.append(getattr(model, name).label(label))
+            elif isinstance(
+                mapper.all_orm_descriptors.get(name), hybrid_property
+            ):
+                self.columns.append(getattr(model, name).label(label))
+            elif name in mapper.relationships:
+                relationship = mapper.relationships[name]
+                nested = nested_schema(field.annotation)
+                if relationship.uselist or nested is None:
+                    raise ValueError(
+                        f"Cannot project collection {model.__name__}.{name}"
+                    )
+                self.joins.append(getattr(model, name))
+                self._collect(
+                    relationship.mapper.class_,
+                    nested,
+                    prefix=f"{label}{SEPARATOR}",
+                )
+            else:
+                raise ValueError(
+                    f"{schema.__name__}.{name} has no column on "
+                    f"{model.__name__}"
+                )
+
+
+def _unflatten(mapping: Any) -> dict[str, Any]:
+    """Turns ``{"customer__id": 1}`` into ``{"customer": {"id": 1}}``."""
+    result: dict[str, Any] = {}
+    for key, value in mapping.items():
+        *parents, name = key.split(SEPARATOR)
+        target = result
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+    return result
@@ -0,0 +1,99 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.utils.request_timing import RequestTiming
+
+# Seconds; requests, statements per request and LLM calls
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+# Seconds; checkouts should not wait at all
+POOL_WAIT_BUCKETS = (
+    0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30,
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Route label of requests that matched no route, to bound cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time an HTTP request spent executing SQL statements.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed by an HTTP request.",
+    ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+REQUEST_POOL_WAIT = Histogram(
+    "http_request_pool_wait_seconds",
+    "Time an HTTP request waited for database connections.",
+    ["method", "route"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time one connection checkout waited, by pool.",
+    ["pool"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+LLM_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Time of one LLM call, by backend and outcome.",
+    ["backend", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_request(
+    method: str,
+    route: str,
+    status: int,
+    seconds: float,
+    timing: RequestTiming,
+) -> None:
+    """Records one served request and its time breakdown."""
+    REQUESTS.labels(method, route, str(status)).inc()
+    REQUEST_DURATION.labels(method, route).observe(seconds)
+    REQUEST_DB_DURATION.labels(method, route).observe(timing.db_seconds)
+    REQUEST_DB_STATEMENTS.labels(method, route).observe(timing.db_statements)
+    REQUEST_POOL_WAIT.labels(method, route).observe(timing.pool_wait_seconds)
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Returns the exposition text and its content type.
+
+    With several worker processes, ``PROMETHEUS_MULTIPROC_DIR`` must name
+    an empty, writable directory before they start: every process then
+    writes its samples there and each scrape aggregates all of them, so
+    it does not matter which worker answers.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+class StatementCounter:
+    """Counts the SQL statements executed while it is active."""
+
+    def __init__(self, parent: Optional["StatementCounter"] = None):
+        self.count = 0
+        self.statements: list[str] = []
+        self.parent = parent
+
+    def record(self, statement: str) -> None:
+        """Records a statement here and on every enclosing counter."""
+        counter = self
+        while counter is not None:
+            counter.count += 1
+            counter.statements.append(statement)
+            counter = counter.parent
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request issues more statements than its budget."""
+
+
+# The counter is a mutable object, so sync endpoints running in the
+# threadpool (which get a copy of the context) still update it.
+_current_counter: ContextVar[Optional[StatementCounter]] = ContextVar(
+    "statement_counter", default=None
+)
+
+
+@contextmanager
+def count_statements() -> Iterator[StatementCounter]:
+    """Counts every statement executed in the current context."""
+    counter = StatementCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+@contextmanager
+def uncounted() -> Iterator[None]:
+    """
+    Keeps statements out of the active counters, for infrastructure
+    work a request happens to trigger (e.g. a replica health check).
+    """
+    token = _current_counter.set(None)
+    try:
+        yield
+    finally:
+        _current_counter.reset(token)
+
+
+def statement_budget(limit: int):
+    """
+    Dependency factory failing a request that runs more than ``limit``
+    statements, lazy loads during response serialization included.
+
+    Only active when ``ENFORCE_QUERY_BUDGET`` is set (test mode), so
+    regressions such as an N+1 relationship load fail loudly in tests.
+    Statements run ``uncounted`` are not part of the budget.
+    """
+
+    async def dependency():
+        if not settings.ENFORCE_QUERY_BUDGET:
+            yield
+            return
+
+        with count_statements() as counter:
+            yield
+
+        if counter.count > limit:
+            logger.error(
+                "Query budget exceeded: %s statements (limit %s):\n%s",
+                counter.count,
+                limit,
+                "\n".join(counter.statements),
+            )
+            raise QueryBudgetExceeded(
+                f"{counter.count} statements executed, budget is {limit}"
+            )
+
+    return dependency
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(
+    conn, cursor, statement, parameters, context, executemany
+):
+    """Records the statement on the active counter, if any."""
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
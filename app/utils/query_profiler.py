@@ -0,0 +1,248 @@
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from cachetools import LRUCache
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.request_context import request_route
+
+# Connection.info key of the start times of the running statements
+_STARTS_KEY = "query_profiler_starts"
+# Route key of statements run outside a request
+NO_ROUTE = "-"
+# Routes remembered per fingerprint
+MAX_ROUTES = 10
+# Parameters shown per slow statement (long IN lists are cut)
+MAX_LOGGED_PARAMS = 20
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+# psycopg2/asyncpg/sqlite placeholders; ``::type`` casts are kept
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+# IN lists and VALUES rows, whatever their length
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LISTS_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes a statement so that runs differing only in their values
+    share one key: literals and placeholders become ``?``, IN lists and
+    multi-row VALUES collapse to ``(...)``, comments and extra whitespace
+    are dropped.
+    """
+    statement = _COMMENT_RE.sub(" ", statement)
+    statement = _STRING_RE.sub("?", statement)
+    statement = _PARAM_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _LIST_RE.sub("(...)", statement)
+    statement = _LISTS_RE.sub("(...)", statement)
+    return _SPACE_RE.sub(" ", statement).strip()
+
+
+def redact(parameters: Any, executemany: bool = False) -> Any:
+    """Replaces bound values with their type, so they are safe to log."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    extra = max(len(parameters) - MAX_LOGGED_PARAMS, 0)
+    if isinstance(parameters, dict):
+        redacted = {
+            name: _redact_value(value)
+            for name, value in list(parameters.items())[:MAX_LOGGED_PARAMS]
+        }
+        if extra:
+            redacted["..."] = f"{extra} more"
+        return redacted
+    redacted_list = [
+        _redact_value(value) for value in parameters[:MAX_LOGGED_PARAMS]
+    ]
+    if extra:
+        redacted_list.append(f"... {extra} more")
+    return redacted_list
+
+
+def _redact_value(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+class QueryStats:
+    """Rolling totals of one statement fingerprint."""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.routes: dict[str, int] = {}
+
+    def record(
+        self, seconds: float, rows: int, route: str, failed: bool
+    ) -> None:
+        """Adds one execution."""
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows += rows
+        if route in self.routes or len(self.routes) < MAX_ROUTES:
+            self.routes[route] = self.routes.get(route, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the totals, times in milliseconds."""
+        return {
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.calls, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "mean_rows": round(self.rows / self.calls, 2),
+            "routes": dict(
+                sorted(self.routes.items(), key=lambda r: r[1], reverse=True)
+            ),
+        }
+
+
+class QueryProfiler:
+    """
+    Times every statement of the engines it is attached to.
+
+    Statements are grouped by ``fingerprint`` into a table of at most
+    ``max_fingerprints`` entries, the least recently run being evicted.
+    Rows are the driver's ``rowcount``, which some drivers do not report
+    for SELECTs. Statements slower than ``slow_query_ms`` (0: none) are
+    logged with redacted parameters and the route that ran them.
+    """
+
+    def __init__(self, max_fingerprints: int, slow_query_ms: float):
+        self.slow_query_ms = slow_query_ms
+        self._stats: LRUCache = LRUCache(maxsize=max_fingerprints)
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.since = time.time()
+
+    def attach(self, engine: Engine) -> None:
+        """Profiles ``engine`` (the ``sync_engine`` of an async one)."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        seconds: float,
+        rows: int = 0,
+        executemany: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """Adds one execution to its fingerprint; logs it if slow."""
+        key = fingerprint(statement)
+        route = request_route()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self._stats.maxsize:
+                    self.evicted += 1
+                stats = self._stats[key] = QueryStats(key)
+            stats.record(seconds, max(rows, 0), route or NO_ROUTE, failed)
+
+        elapsed_ms = seconds * 1000
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms, route %s): %s | params %s",
+                elapsed_ms,
+                route or NO_ROUTE,
+                _SPACE_RE.sub(" ", statement).strip(),
+                redact(parameters, executemany),
+            )
+
+    def snapshot(
+        self, order_by: str = "total", limit: int = 50
+    ) -> dict[str, Any]:
+        """Returns the top ``limit`` fingerprints by ``order_by``."""
+        with self._lock:
+            statements = [stats.to_dict() for stats in self._stats.values()]
+        sort_key = {
+            "total": "total_ms",
+            "mean": "mean_ms",
+            "max": "max_ms",
+        }.get(order_by, order_by)
+        statements.sort(key=lambda s: s[sort_key], reverse=True)
+        return {
+            "pid": os.getpid(),
+            "since": self.since,
+            "fingerprints": len(statements),
+            "evicted": self.evicted,
+            "slow_query_ms": self.slow_query_ms,
+            "statements": statements[:limit],
+        }
+
+    def reset(self) -> None:
+        """Drops every fingerprint."""
+        with self._lock:
+            self._stats.clear()
+            self.evicted = 0
+            self.since = time.time()
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault(_STARTS_KEY, []).append(time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get(_STARTS_KEY)
+        if starts:
+            self.record(
+                statement,
+                parameters,
+                time.perf_counter() - starts.pop(),
+                rows=cursor.rowcount,
+                executemany=executemany,
+            )
+
+    def _handle_error(self, exception_context) -> None:
+        conn = exception_context.connection
+        starts = conn.info.get(_STARTS_KEY) if conn is not None else None
+        if starts and exception_context.statement is not None:
+            self.record(
+                exception_context.statement,
+                exception_context.parameters,
+                time.perf_counter() - starts.pop(),
+                executemany=bool(
+                    exception_context.execution_context
+                    and exception_context.execution_context.executemany
+                ),
+                failed=True,
+            )
+
+
+query_profiler = QueryProfiler(
+    settings.QUERY_STATS_SIZE, settings.SLOW_QUERY_MS
+)
+
+
+def profile_engine(engine: Engine) -> Engine:
+    """Attaches the profiler to ``engine`` if QUERY_PROFILER is on."""
+    if settings.QUERY_PROFILER:
+        query_profiler.attach(engine)
+    return engine
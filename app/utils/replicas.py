@@ -0,0 +1,185 @@
+import itertools
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.logger import logger
+from app.utils.query_counter import uncounted
+
+# Seconds the replica is behind the primary. A replica that has replayed
+# everything it received reports 0 even when the primary has been idle
+# (pg_last_xact_replay_timestamp() alone would keep growing then).
+_PG_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+# Stand-ins without replication (e.g. two SQLite files) never lag.
+_NO_LAG_SQL = text("SELECT 0")
+
+
+def _lag_sql(engine: Any) -> Any:
+    """Returns the lag query for the engine's dialect."""
+    if engine.dialect.name == "postgresql":
+        return _PG_LAG_SQL
+    return _NO_LAG_SQL
+
+
+class Replica:
+    """A read replica with its sync and async engines and health state."""
+
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at = 0.0
+        self._checking = threading.Lock()
+
+        # A dropped connection takes the replica out of rotation right
+        # away instead of at the next scheduled check.
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "handle_error", self._on_error)
+
+    def record(
+        self, lag: Optional[float], error: Optional[str], max_lag: float
+    ) -> None:
+        """Stores the result of a health check."""
+        was_healthy = self.healthy
+        self.lag = lag
+        self.error = error
+        self.healthy = error is None and lag is not None and lag <= max_lag
+        self.checked_at = time.monotonic()
+        if was_healthy and not self.healthy:
+            logger.warning(
+                "Replica %s out of rotation (lag=%s, error=%s)",
+                self.name,
+                lag,
+                error,
+            )
+        elif self.healthy and not was_healthy:
+            logger.info("Replica %s back in rotation", self.name)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the last known health state."""
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "error": self.error,
+            "checked_ago_seconds": round(
+                time.monotonic() - self.checked_at, 3
+            )
+            if self.checked_at
+            else None,
+        }
+
+    def _on_error(self, context: Any) -> None:
+        """Marks the replica down when its connection was lost."""
+        if context.is_disconnect:
+            self.healthy = False
+            self.error = str(context.original_exception)
+            self.checked_at = time.monotonic()
+
+
+class ReplicaSet:
+    """
+    Routes read-only sessions to the read replicas.
+
+    Replicas are used round-robin while healthy. Each replica is checked
+    at most once per ``check_interval`` seconds, by the first request that
+    finds the check due (others keep using the last known state). A
+    replica that cannot be reached, or lags more than ``max_lag`` seconds
+    behind the primary, is skipped; with no healthy replica reads go to
+    the primary.
+    """
+
+    def __init__(
+        self, replicas: list[Replica], max_lag: float, check_interval: float
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._next = itertools.count()
+
+    def pick(self) -> Optional[Replica]:
+        """Returns a healthy replica (checking due ones), or None."""
+        for replica in self._rotation():
+            if self._check_due(replica) and replica._checking.acquire(
+                blocking=False
+            ):
+                try:
+                    self._check(replica)
+                finally:
+                    replica._checking.release()
+            if replica.healthy:
+                return replica
+        return None
+
+    async def apick(self) -> Optional[Replica]:
+        """Async variant of ``pick`` that checks through the async engine."""
+        for replica in self._rotation():
+            if self._check_due(replica) and replica._checking.acquire(
+                blocking=False
+            ):
+                try:
+                    await self._acheck(replica)
+                finally:
+                    replica._checking.release()
+            if replica.healthy:
+                return replica
+        return None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the health state of every replica."""
+        return {
+            "max_lag_seconds": self.max_lag,
+            "replicas": {
+                replica.name: replica.snapshot() for replica in self.replicas
+            },
+        }
+
+    def _rotation(self) -> list[Replica]:
+        """Returns the replicas starting from the next in round-robin."""
+        if not self.replicas:
+            return []
+        start = next(self._next) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def _check_due(self, replica: Replica) -> bool:
+        """Whether the replica's health should be checked again."""
+        return time.monotonic() - replica.checked_at >= self.check_interval
+
+    def _check(self, replica: Replica) -> None:
+        """Checks a replica through its sync engine."""
+        try:
+            # Not part of the query budget of the request that ran it
+            with uncounted(), replica.engine.connect() as conn:
+                lag = conn.execute(_lag_sql(replica.engine)).scalar()
+            replica.record(float(lag), None, self.max_lag)
+        except (SQLAlchemyError, OSError) as e:
+            replica.record(None, str(e), self.max_lag)
+
+    async def _acheck(self, replica: Replica) -> None:
+        """Checks a replica through its async engine."""
+        try:
+            with uncounted():
+                async with replica.async_engine.connect() as conn:
+                    lag = (
+                        await conn.execute(_lag_sql(replica.async_engine))
+                    ).scalar()
+            replica.record(float(lag), None, self.max_lag)
+        except (SQLAlchemyError, OSError) as e:
+            replica.record(None, str(e), self.max_lag)
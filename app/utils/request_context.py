@@ -0,0 +1,42 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import Scope
+
+# Set per request by RequestContextMiddleware; read by the log records.
+request_id_var: ContextVar[Optional[str]] = ContextVar(
+    "request_id", default=None
+)
+request_start_var: ContextVar[Optional[float]] = ContextVar(
+    "request_start", default=None
+)
+# The ASGI scope; the router adds the matched route to it in place.
+request_scope_var: ContextVar[Optional[Scope]] = ContextVar(
+    "request_scope", default=None
+)
+
+
+def request_id() -> Optional[str]:
+    """Returns the id of the request being served, if any."""
+    return request_id_var.get()
+
+
+def request_elapsed_ms() -> Optional[float]:
+    """Returns the milliseconds since the current request started."""
+    start = request_start_var.get()
+    if start is None:
+        return None
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def request_route() -> Optional[str]:
+    """
+    Returns the method and route template of the current request, e.g.
+    ``GET /orders/{order_id}`` (the raw path before routing), if any.
+    """
+    scope = request_scope_var.get()
+    if scope is None:
+        return None
+    path = getattr(scope.get("route"), "path", scope["path"])
+    return f"{scope['method']} {path}"
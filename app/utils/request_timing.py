@@ -0,0 +1,94 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Connection.info key of the start times of the running statements
+_STARTS_KEY = "request_timing_starts"
+
+
+class RequestTiming:
+    """Where one request's time went, filled in while it runs."""
+
+    __slots__ = (
+        "db_seconds",
+        "db_statements",
+        "pool_wait_seconds",
+        "llm_seconds",
+        "llm_calls",
+    )
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_statements = 0
+        self.pool_wait_seconds = 0.0
+        self.llm_seconds = 0.0
+        self.llm_calls = 0
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Formats the breakdown as a ``Server-Timing`` header value."""
+        metrics = [
+            f"app;dur={total_seconds * 1000:.1f}",
+            f'db;dur={self.db_seconds * 1000:.1f};'
+            f'desc="{self.db_statements} statements"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.1f}",
+        ]
+        if self.llm_calls:
+            metrics.append(f"llm;dur={self.llm_seconds * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+# Mutable, like the statement counter, so sync endpoints running in the
+# threadpool (which get a copy of the context) still update it.
+request_timing_var: ContextVar[Optional[RequestTiming]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+def record_pool_wait(seconds: float) -> None:
+    """Adds a connection checkout wait to the current request."""
+    timing = request_timing_var.get()
+    if timing is not None:
+        timing.pool_wait_seconds += seconds
+
+
+def record_llm_call(seconds: float) -> None:
+    """Adds an LLM call to the current request."""
+    timing = request_timing_var.get()
+    if timing is not None:
+        timing.llm_seconds += seconds
+        timing.llm_calls += 1
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if request_timing_var.get() is not None:
+        conn.info.setdefault(_STARTS_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    _finish_statement(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement(exception_context) -> None:
+    # A failed statement gets no after_cursor_execute; still count it
+    if exception_context.connection is not None:
+        _finish_statement(exception_context.connection)
+
+
+def _finish_statement(conn) -> None:
+    """Adds the statement started last on ``conn`` to the request."""
+    starts = conn.info.get(_STARTS_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    timing = request_timing_var.get()
+    if timing is not None:
+        timing.db_seconds += elapsed
+        timing.db_statements += 1
@@ -0,0 +1,41 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.config import settings
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized by pydantic-core straight to bytes.
+
+    Content may be a validated Pydantic model (serialized in one pass,
+    like ``model_dump_json``) or the plain data FastAPI produces for a
+    ``response_model``. ``Decimal`` is rendered as a string and dates in
+    ISO 8601, exactly as Pydantic's JSON mode does.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def model_response(
+    model: BaseModel, response: Optional[Response] = None
+) -> Any:
+    """
+    Returns an already validated response model for a route.
+
+    With FAST_JSON the model is wrapped in a FastJSONResponse, so FastAPI
+    skips dumping, re-validating and re-encoding it against the route's
+    ``response_model``; otherwise it is returned as is. Headers set on
+    the route's ``response`` parameter are carried over to the wrapper.
+    """
+    if settings.FAST_JSON:
+        fast = FastJSONResponse(model)
+        if response is not None:
+            fast.headers.update(response.headers)
+        return fast
+    return model
@@ -0,0 +1,12 @@
+from typing import Union
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+
+def validation_message(
+    exc: Union[RequestValidationError, ValidationError],
+) -> str:
+    """Returns the first validation error's message, as the API reports it."""
+    first_error = exc.errors()[0]
+    return first_error["msg"].replace("Value error, ", "")
@@ -0,0 +1,92 @@
+"""
+Compares POST /orders/bulk with looping POST /orders/ for the same orders.
+
+    python -m benchmarks.bulk_orders --url sqlite:///bench.db --orders 2000
+
+Both runs go through the HTTP layer of the app (in-process TestClient),
+so the numbers include request validation and serialization. Reports
+orders/sec for the loop and for bulk batches of ``--batch-size``.
+"""
+
+import json
+import random
+import time
+from datetime import date
+
+from benchmarks.common import (
+    base_parser,
+    make_client,
+    make_session_factory,
+    seed_customers,
+    seed_products,
+)
+
+
+def make_orders(count: int, customers: int, products: int) -> list[dict]:
+    """Builds ``count`` random order payloads."""
+    today = str(date.today())
+    return [
+        {
+            "customer_id": random.randint(1, customers),
+            "order_date": today,
+            "items": [
+                {
+                    "product_id": random.randint(1, products),
+                    "quantity": random.randint(1, 3),
+                    "price": 9.99,
+                }
+                for _ in range(random.randint(1, 3))
+            ],
+        }
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    """Prints orders/sec for the loop and the bulk endpoint as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.url)
+    with session_factory() as db:
+        seed_customers(db, args.customers)
+        seed_products(db, args.products)
+    client = make_client(session_factory)
+    orders = make_orders(args.orders, args.customers, args.products)
+
+    start = time.perf_counter()
+    for order in orders:
+        client.post("/orders/", json=order).raise_for_status()
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    created = 0
+    for offset in range(0, len(orders), args.batch_size):
+        response = client.post(
+            "/orders/bulk",
+            json={"orders": orders[offset : offset + args.batch_size]},
+        )
+        response.raise_for_status()
+        created += response.json()["created"]
+    bulk_elapsed = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "orders": len(orders),
+                "batch_size": args.batch_size,
+                "loop_orders_per_sec": round(len(orders) / loop_elapsed, 1),
+                "bulk_orders_per_sec": round(len(orders) / bulk_elapsed, 1),
+                "bulk_created": created,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Shared helpers for the benchmark scripts in this package."""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+
+from app.database import Base
+from app.models.customer import Customer
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+
+DEFAULT_URL = "sqlite:///bench.db"
+CHUNK_SIZE = 10_000
+# Status mix of seeded orders: 2/20 pending, 1/20 canceled
+ORDER_STATUSES = ("Pending",) * 2 + ("Canceled",) + ("Completed",) * 17
+
+
+def base_parser(description: str) -> argparse.ArgumentParser:
+    """Returns an argument parser with the options every benchmark takes."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--url",
+        default=DEFAULT_URL,
+        help="Database URL to benchmark against (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timed runs per measurement (default: %(default)s)",
+    )
+    return parser
+
+
+def make_session_factory(url: str) -> sessionmaker:
+    """Creates the schema on ``url`` and returns a session factory."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def seed_products(db: Session, rows: int) -> None:
+    """Tops the products table up to ``rows`` rows."""
+    existing = db.query(Product).count()
+    for start in range(existing, rows, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, rows)
+        db.execute(
+            insert(Product),
+            [
+                {
+                    "name": f"Product {i}",
+                    "description": f"Description for product {i} " * 8,
+                    "category": f"Category {i % 50}",
+                    "price": Decimal(i % 1000) + Decimal("0.99"),
+                    "stock_quantity": 1_000_000,
+                }
+                for i in range(start, stop)
+            ],
+        )
+        db.commit()
+
+
+def seed_customers(db: Session, rows: int) -> None:
+    """Tops the customers table up to ``rows`` rows."""
+    existing = db.query(Customer).count()
+    for start in range(existing, rows, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, rows)
+        db.execute(
+            insert(Customer),
+            [
+                {
+                    "first_name": f"First{i}",
+                    "last_name": f"Last{i}",
+                    "email": f"customer{i}@example.com",
+                    "phone": "555-0100",
+                    "address": f"{i} Main St",
+                    "city": "Springfield",
+                    "state": "IL",
+                    "zip_code": "62701",
+                }
+                for i in range(start, stop)
+            ],
+        )
+        db.commit()
+
+
+def seed_orders(
+    db: Session, rows: int, customers: int, products: int = 1
+) -> None:
+    """
+    Tops the orders table up to ``rows`` rows, one item per order.
+
+    About 10% of the orders are pending and 5% canceled, with amounts
+    and dates spread out, so filters see realistic selectivity.
+    """
+    existing = db.query(Order).count()
+    for start in range(existing, rows, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, rows)
+        order_ids = db.execute(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            [
+                {
+                    "customer_id": i % customers + 1,
+                    "date": date(2025, 1, 1) + timedelta(days=i % 365),
+                    "total_amount": Decimal(i % 500) + Decimal("0.99"),
+                    "status": ORDER_STATUSES[i % len(ORDER_STATUSES)],
+                }
+                for i in range(start, stop)
+            ],
+        ).scalars()
+        db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": order_id,
+                    "product_id": order_id % products + 1,
+                    "quantity": 1,
+                    "price": Decimal("19.99"),
+                }
+                for order_id in order_ids
+            ],
+        )
+        db.commit()
+
+
+def make_client(session_factory: sessionmaker):
+    """Returns a TestClient for the app, with sessions from the factory."""
+    from fastapi.testclient import TestClient
+
+    from app.database import get_db, get_read_db
+    from app.main import app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return TestClient(app)
+
+
+def fake_request(path: str, query_string: str = "") -> Request:
+    """Builds a bare request so route helpers can render URLs."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("bench", 80),
+            "path": path,
+            "query_string": query_string.encode(),
+            "headers": [],
+        }
+    )
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict:
+    """Runs ``fn`` ``repeat`` times and returns latency stats in ms."""
+    fn()  # warm up caches and connections
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+    }
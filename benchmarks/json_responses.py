@@ -0,0 +1,98 @@
+"""
+Compares the default and the FAST_JSON response path on 100-row pages.
+
+    python -m benchmarks.json_responses --url sqlite:///bench.db
+
+Requests ``/products/`` and ``/orders/`` pages through the in-process
+TestClient with ``settings.FAST_JSON`` off (FastAPI dumps the page,
+re-validates it against the response model and encodes it with
+``json.dumps``) and on (the validated page is serialized once by
+pydantic-core). Counting is disabled so the numbers focus on building and
+serializing the response; the bodies are checked to be identical.
+``serialize_only`` times just turning an already built product page into
+bytes, the way FastAPI does it vs FastJSONResponse.
+"""
+
+import json
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.routes.products import PRODUCT_LIST
+from app.schemas.products import ProductResponse
+from app.utils.pagination import PaginatedResponse, paginate
+from app.utils.responses import FastJSONResponse
+from benchmarks.common import (
+    base_parser,
+    fake_request,
+    make_client,
+    make_session_factory,
+    measure,
+    seed_customers,
+    seed_orders,
+    seed_products,
+)
+
+PATHS = ("/products/", "/orders/")
+
+
+def main() -> None:
+    """Prints per-path latency for both modes as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.url)
+    with session_factory() as db:
+        seed_products(db, args.rows)
+        seed_customers(db, 1_000)
+        seed_orders(db, args.rows, 1_000)
+    client = make_client(session_factory)
+    params = {"page_size": args.page_size, "page": 2, "with_count": False}
+
+    def fetch(path: str) -> bytes:
+        response = client.get(path, params=params)
+        response.raise_for_status()
+        return response.content
+
+    results = {}
+    for path in PATHS:
+        bodies = {}
+        for fast in (False, True):
+            settings.FAST_JSON = fast
+            bodies[fast] = json.loads(fetch(path))
+            results.setdefault(path, {})[
+                "fast_json" if fast else "default"
+            ] = measure(lambda: fetch(path), args.repeat)
+        results[path]["identical_body"] = bodies[False] == bodies[True]
+
+    with session_factory() as db:
+        page = paginate(
+            db.query(PRODUCT_LIST.model),
+            2,
+            args.page_size,
+            fake_request("/products/"),
+            with_count=False,
+            projection=PRODUCT_LIST,
+        )
+    adapter = TypeAdapter(PaginatedResponse[ProductResponse])
+
+    def default_render() -> bytes:
+        # What FastAPI does with a returned model and a response_model
+        checked = adapter.validate_python(page.model_dump())
+        return JSONResponse(adapter.dump_python(checked, mode="json")).body
+
+    results["serialize_only"] = {
+        "default": measure(default_render, args.repeat),
+        "fast_json": measure(
+            lambda: FastJSONResponse(page).body, args.repeat
+        ),
+    }
+
+    print(json.dumps({"page_size": args.page_size, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measures request latency with the queued logging pipeline on and off.
+
+    python -m benchmarks.log_pipeline --url sqlite:///bench.db --requests 2000
+
+Logging is configured at import, so each mode runs in a child process
+(LOG_ASYNC=true / false) that posts orders through the in-process
+TestClient. Every created order logs an INFO line to logs/app.log and to
+the console, which is captured to a file as a container runtime would.
+Reports p50/p99/max request latency per mode.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import (
+    base_parser,
+    make_client,
+    make_session_factory,
+    seed_customers,
+    seed_products,
+)
+
+
+def percentiles(timings: list[float]) -> dict:
+    """Returns p50/p99/max of latencies in ms."""
+    timings = sorted(timings)
+    return {
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def run_child(args) -> None:
+    """Posts ``args.requests`` orders and prints the latency stats."""
+    from benchmarks.bulk_orders import make_orders
+
+    session_factory = make_session_factory(args.url)
+    with session_factory() as db:
+        seed_customers(db, args.customers)
+        seed_products(db, args.products)
+    client = make_client(session_factory)
+    orders = make_orders(args.requests, args.customers, args.products)
+
+    client.post("/orders/", json=orders[0]).raise_for_status()  # warm up
+    timings = []
+    for order in orders[1:]:
+        start = time.perf_counter()
+        client.post("/orders/", json=order).raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(json.dumps(percentiles(timings)))
+
+
+def main() -> None:
+    """Prints the latency of both logging modes as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument(
+        "--child", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    results = {}
+    for mode in ("false", "true"):
+        with tempfile.TemporaryFile() as console:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.log_pipeline", "--child"]
+                + sys.argv[1:],
+                env={**os.environ, "LOG_ASYNC": mode},
+                stdout=subprocess.PIPE,
+                stderr=console,
+                check=True,
+                text=True,
+            ).stdout
+        key = "queued" if mode == "true" else "synchronous"
+        results[key] = json.loads(output.strip().splitlines()[-1])
+
+    print(json.dumps({"requests": args.requests, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
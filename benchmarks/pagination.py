@@ -0,0 +1,92 @@
+"""
+Compares OFFSET and keyset (cursor) pagination at shallow and deep pages.
+
+    python -m benchmarks.pagination --url sqlite:///bench.db --rows 200000
+
+With OFFSET the database walks and discards every row before the page, so
+latency grows with depth; a cursor seeks on the primary key index and page
+10,000 costs the same as page 1.
+"""
+
+import json
+
+from app.models.product import Product
+from app.utils.pagination import NEXT, _encode_cursor, paginate
+from benchmarks.common import (
+    base_parser,
+    fake_request,
+    make_session_factory,
+    measure,
+    seed_products,
+)
+
+
+def main() -> None:
+    """Seeds the products table and prints timings as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--deep-page", type=int, default=10_000)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.url)
+    request = fake_request("/products/")
+    page_size = args.page_size
+    deep_page = min(args.deep_page, args.rows // page_size)
+
+    with session_factory() as db:
+        seed_products(db, args.rows)
+        deep_key = (
+            db.query(Product.id)
+            .order_by(Product.id)
+            .offset((deep_page - 1) * page_size - 1)
+            .limit(1)
+            .scalar()
+        )
+
+        def offset_page(page: int, with_count: bool):
+            return lambda: paginate(
+                db.query(Product),
+                page,
+                page_size,
+                request,
+                with_count=with_count,
+            )
+
+        def cursor_page(cursor):
+            return lambda: paginate(
+                db.query(Product),
+                1,
+                page_size,
+                request,
+                cursor=cursor,
+                with_count=False,
+            )
+
+        results = {
+            "rows": args.rows,
+            "page_size": page_size,
+            "deep_page": deep_page,
+            "offset_page_1": measure(offset_page(1, True), args.repeat),
+            "offset_deep_page": measure(
+                offset_page(deep_page, True), args.repeat
+            ),
+            "offset_page_1_no_count": measure(
+                offset_page(1, False), args.repeat
+            ),
+            "offset_deep_page_no_count": measure(
+                offset_page(deep_page, False), args.repeat
+            ),
+            "cursor_page_1": measure(
+                cursor_page(_encode_cursor(0, NEXT)), args.repeat
+            ),
+            "cursor_deep_page": measure(
+                cursor_page(_encode_cursor(deep_key, NEXT)), args.repeat
+            ),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
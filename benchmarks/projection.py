@@ -0,0 +1,80 @@
+"""
+Compares the ORM listing path with the column-projected one for products.
+
+    python -m benchmarks.projection --url sqlite:///bench.db --page-size 100
+
+The ORM path is what ``app/routes/products.py`` did before projections:
+``paginate(db.query(Product))`` hydrating full instances (description
+included) and validating them attribute by attribute. The projected path
+selects only the ``ProductResponse`` columns and validates the rows
+directly. Both include building the final response model, and peak memory
+is measured with tracemalloc.
+"""
+
+import json
+import tracemalloc
+
+from app.models.product import Product
+from app.routes.products import PRODUCT_LIST
+from app.schemas.products import ProductResponse
+from app.utils.pagination import PaginatedResponse, paginate
+from benchmarks.common import (
+    base_parser,
+    fake_request,
+    make_session_factory,
+    measure,
+    seed_products,
+)
+
+
+def main() -> None:
+    """Seeds the products table and prints timings as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.url)
+    request = fake_request("/products/")
+    response_model = PaginatedResponse[ProductResponse]
+
+    with session_factory() as db:
+        seed_products(db, args.rows)
+
+    def listing(projection):
+        def run():
+            with session_factory() as db:
+                page = paginate(
+                    db.query(Product),
+                    1,
+                    args.page_size,
+                    request,
+                    with_count=False,
+                    projection=projection,
+                )
+                return response_model.model_validate(
+                    page.model_dump(), from_attributes=True
+                )
+
+        return run
+
+    def peak_memory_kb(fn) -> float:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return round(peak / 1024, 1)
+
+    results = {
+        "rows": args.rows,
+        "page_size": args.page_size,
+        "orm": measure(listing(None), args.repeat),
+        "projected": measure(listing(PRODUCT_LIST), args.repeat),
+        "orm_peak_kb": peak_memory_kb(listing(None)),
+        "projected_peak_kb": peak_memory_kb(listing(PRODUCT_LIST)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares the security headers middleware before and after going pure ASGI.
+
+    python -m benchmarks.security_headers --url sqlite:///bench.db
+
+Builds three apps serving ``/`` and the products router: without the
+middleware, with the previous ``@app.middleware("http")`` function
+(Starlette's BaseHTTPMiddleware) and with SecurityHeadersMiddleware.
+Each is driven sequentially through the in-process TestClient; reports
+the best requests/sec per path over ``--rounds`` interleaved rounds.
+"""
+
+import json
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.database import get_db, get_read_db
+from app.middlewares.security import SecurityHeadersMiddleware
+from app.routes import products
+from benchmarks.common import base_parser, make_session_factory, seed_products
+
+PATHS = ("/", "/products/")
+
+
+def build_app(variant: str, session_factory) -> FastAPI:
+    """Returns a bare app with the given middleware variant."""
+    app = FastAPI()
+    app.include_router(products.router)
+
+    @app.get("/")
+    def health_check():
+        return {"status": "ok"}
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    if variant == "base_http":
+
+        @app.middleware("http")
+        async def security_headers(request: Request, call_next):
+            response = await call_next(request)
+            response.headers["X-Frame-Options"] = "DENY"
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["Referrer-Policy"] = (
+                "strict-origin-when-cross-origin"
+            )
+            response.headers["Content-Security-Policy"] = "default-src 'self'"
+            return response
+
+    elif variant == "pure_asgi":
+        app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+def requests_per_sec(client: TestClient, path: str, requests: int) -> float:
+    """Sends ``requests`` GETs to ``path`` and returns the rate."""
+    for _ in range(50):  # warm up
+        client.get(path).raise_for_status()
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path).raise_for_status()
+    return round(requests / (time.perf_counter() - start), 1)
+
+
+def main() -> None:
+    """Prints requests/sec per variant and path as JSON."""
+    parser = base_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=3_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.url)
+    with session_factory() as db:
+        seed_products(db, args.products)
+
+    # Variants are interleaved over a few rounds and the best rate kept,
+    # so warm-up and background noise do not favour one of them.
+    variants = ("none", "base_http", "pure_asgi")
+    clients = {
+        variant: TestClient(build_app(variant, session_factory))
+        for variant in variants
+    }
+    results = {variant: dict.fromkeys(PATHS, 0.0) for variant in variants}
+    for _ in range(args.rounds):
+        for variant, client in clients.items():
+            for path in PATHS:
+                rate = requests_per_sec(client, path, args.requests)
+                results[variant][path] = max(results[variant][path], rate)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
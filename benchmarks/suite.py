@@ -0,0 +1,475 @@
+"""
+Load-test suite: drives every route and reports latency percentiles.
+
+    python -m app.tools.datagen --url sqlite:///suite.db --truncate
+    python -m benchmarks.suite --url sqlite:///suite.db --output suite.json
+
+Runs in-process by default: the app is imported with its database URLs
+pointed at ``--url``, the fake LLM backend for NLP and an admin token,
+and requests go through one TestClient (one event loop, as in a worker).
+``--base-url`` drives a running server instead, with its own settings.
+
+Each scenario sends ``--requests`` requests from ``--concurrency``
+threads (contention scenarios use more) with request parameters drawn
+from a seeded RNG, so two runs on the same dataset send the same
+traffic. Orders created by the run are deleted by the delete scenario;
+product and stock updates are left in place. Prints (and optionally
+writes) one JSON document: per scenario the throughput, p50/p95/p99/max
+latency and error count, to compare across commits.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Optional
+
+from sqlalchemy.engine import make_url
+
+# The app is imported only once its settings are in the environment, so
+# nothing from app (or benchmarks.common, which imports it) is loaded here
+DEFAULT_URL = "sqlite:///bench.db"
+
+ADMIN_TOKEN = "suite-admin-token"
+# Async driver per backend, as in app.database (which reads the settings
+# on import, so it cannot be used to build them)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+# Products every contention order buys
+HOT_PRODUCTS = (1, 2, 3)
+
+
+@dataclass
+class Context:
+    """What the scenarios know about the dataset under test."""
+
+    products: int
+    customers: int
+    orders: int
+    page_size: int
+    etag: str = ""
+    created_orders: list[int] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+# A request: method, path, JSON body and headers
+Request = tuple[str, str, Optional[dict], dict]
+
+
+@dataclass
+class Scenario:
+    """A named request shape and how hard to drive it."""
+
+    name: str
+    build: Callable[[random.Random, Context], Request]
+    expect: tuple[int, ...] = (200,)
+    concurrency: Optional[int] = None
+    record: Optional[Callable[[Context, Any], None]] = None
+
+
+def get(path: str, headers: Optional[dict] = None) -> Request:
+    """A GET request."""
+    return "GET", path, None, headers or {}
+
+
+def order_body(
+    rng: random.Random, ctx: Context, products: tuple[int, ...] = ()
+) -> dict:
+    """An order for a random customer; random products unless given."""
+    product_ids = products or rng.sample(
+        range(1, ctx.products + 1), rng.randint(1, 3)
+    )
+    return {
+        "customer_id": rng.randint(1, ctx.customers),
+        "order_date": date.today().isoformat(),
+        "items": [
+            {"product_id": product_id, "quantity": 1, "price": 9.99}
+            for product_id in product_ids
+        ],
+    }
+
+
+def record_bulk(ctx: Context, body: Any) -> None:
+    """Keeps the ids of bulk-created orders for the delete scenario."""
+    with ctx.lock:
+        ctx.created_orders.extend(
+            result["order_id"]
+            for result in body["results"]
+            if result["success"]
+        )
+
+
+def delete_created(rng: random.Random, ctx: Context) -> Request:
+    """Deletes one order created earlier in the run."""
+    with ctx.lock:
+        order_id = ctx.created_orders.pop() if ctx.created_orders else 0
+    return "DELETE", f"/orders/{order_id}", None, {}
+
+
+def deep_page(total: int, page_size: int) -> int:
+    """The middle page of a listing, for OFFSET depth."""
+    return max(total // page_size // 2, 1)
+
+
+ADMIN = {"X-Admin-Token": ADMIN_TOKEN}
+NLP_QUERY = {"query": "How many orders are there?"}
+
+SCENARIOS = [
+    Scenario("health", lambda rng, ctx: get("/")),
+    Scenario("products: page 1", lambda rng, ctx: get("/products/")),
+    Scenario(
+        "products: deep page",
+        lambda rng, ctx: get(
+            "/products/?page="
+            f"{deep_page(ctx.products, ctx.page_size)}&with_count=false"
+        ),
+    ),
+    Scenario(
+        "products: detail",
+        lambda rng, ctx: get(f"/products/{rng.randint(1, ctx.products)}"),
+    ),
+    Scenario(
+        "products: revalidate",
+        lambda rng, ctx: get(
+            f"/products/{HOT_PRODUCTS[0]}", {"If-None-Match": ctx.etag}
+        ),
+        expect=(304,),
+    ),
+    Scenario("customers: page 1", lambda rng, ctx: get("/customers/")),
+    Scenario(
+        "customers: detail",
+        lambda rng, ctx: get(f"/customers/{rng.randint(1, ctx.customers)}"),
+    ),
+    Scenario("orders: page 1", lambda rng, ctx: get("/orders/")),
+    Scenario(
+        "orders: deep page",
+        lambda rng, ctx: get(
+            "/orders/?page="
+            f"{deep_page(ctx.orders, ctx.page_size)}&with_count=false"
+        ),
+    ),
+    Scenario(
+        "orders: by status",
+        lambda rng, ctx: get(
+            "/orders/?status=" + rng.choice(("Pending", "Canceled"))
+        ),
+    ),
+    Scenario(
+        "orders: by customer",
+        lambda rng, ctx: get(
+            f"/orders/?customer_id={rng.randint(1, ctx.customers)}"
+        ),
+    ),
+    Scenario(
+        "orders: by price",
+        lambda rng, ctx: get(
+            "/orders/?min_price={0}&max_price={1}".format(
+                *sorted(rng.sample(range(1, 500), 2))
+            )
+        ),
+    ),
+    Scenario(
+        "orders: detail",
+        lambda rng, ctx: get(f"/orders/{rng.randint(1, ctx.orders)}"),
+    ),
+    Scenario(
+        "orders: of customer",
+        lambda rng, ctx: get(
+            f"/orders/customer/{rng.randint(1, ctx.customers)}"
+        ),
+    ),
+    Scenario(
+        "orders: create",
+        lambda rng, ctx: ("POST", "/orders/", order_body(rng, ctx), {}),
+        expect=(201, 400),
+    ),
+    Scenario(
+        "orders: create on hot SKUs",
+        lambda rng, ctx: (
+            "POST",
+            "/orders/",
+            order_body(rng, ctx, HOT_PRODUCTS),
+            {},
+        ),
+        expect=(201, 400),
+        concurrency=32,
+    ),
+    Scenario(
+        "orders: bulk create",
+        lambda rng, ctx: (
+            "POST",
+            "/orders/bulk",
+            {"orders": [order_body(rng, ctx) for _ in range(20)]},
+            {},
+        ),
+        record=record_bulk,
+    ),
+    # Needs "orders: bulk create" to have run first
+    Scenario("orders: delete", delete_created),
+    Scenario(
+        "products: update stock",
+        lambda rng, ctx: (
+            "PUT",
+            f"/products/{rng.randint(1, ctx.products)}",
+            {"stock_quantity": 100_000},
+            {},
+        ),
+    ),
+    Scenario(
+        "products: create",
+        lambda rng, ctx: (
+            "POST",
+            "/products/",
+            {
+                "name": f"Suite product {rng.randrange(10**9)}",
+                "category": "Suite",
+                "price": "19.99",
+                "stock_quantity": 100,
+            },
+            {},
+        ),
+    ),
+    Scenario(
+        "nlp: generate sql",
+        lambda rng, ctx: ("POST", "/nlp/generate-sql", NLP_QUERY, {}),
+    ),
+    Scenario(
+        "nlp: stream csv",
+        lambda rng, ctx: (
+            "POST",
+            "/nlp/generate-sql/stream?format=csv",
+            NLP_QUERY,
+            {},
+        ),
+    ),
+    Scenario(
+        "metrics",
+        lambda rng, ctx: get(
+            "/metrics/"
+            + rng.choice(
+                ("pool", "nlp-cache", "product-cache", "replicas", "logging")
+            )
+        ),
+    ),
+    Scenario(
+        "admin: nlp schema",
+        lambda rng, ctx: get("/admin/nlp/schema", ADMIN),
+    ),
+]
+
+
+def percentile(timings: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted latencies, in ms."""
+    index = max(int(round(fraction * len(timings))) - 1, 0)
+    return round(timings[min(index, len(timings) - 1)], 3)
+
+
+def run_scenario(
+    send: "Sender",
+    scenario: Scenario,
+    ctx: Context,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict[str, Any]:
+    """Sends the scenario's requests and returns its stats."""
+    rng = random.Random(f"{seed}:{scenario.name}")
+    planned = [scenario.build(rng, ctx) for _ in range(requests)]
+    timings: list[float] = []
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(request: Request) -> None:
+        start = time.perf_counter()
+        status, body = send(request)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            timings.append(elapsed)
+            if status not in scenario.expect:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+        if scenario.record is not None and status == 200:
+            scenario.record(ctx, body)
+
+    send(planned[0])  # warm up
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, planned[1:]))
+    wall = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "concurrency": concurrency,
+        "throughput_rps": round(len(timings) / wall, 1),
+        "p50_ms": percentile(timings, 0.50),
+        "p95_ms": percentile(timings, 0.95),
+        "p99_ms": percentile(timings, 0.99),
+        "max_ms": round(timings[-1], 3),
+        "errors": errors,
+    }
+
+
+def load_context(send: "Sender") -> Context:
+    """Reads the table sizes and a product ETag through the API."""
+
+    def total(path: str) -> int:
+        status, body = send(get(f"{path}?page_size=1"))
+        if status != 200:
+            raise SystemExit(f"GET {path} failed with {status}")
+        return body["total_count"]
+
+    status, body = send(get("/products/"))
+    ctx = Context(
+        products=total("/products/"),
+        customers=total("/customers/"),
+        orders=total("/orders/"),
+        page_size=body["page_size"],
+    )
+    if not (ctx.products and ctx.customers and ctx.orders):
+        raise SystemExit("Empty dataset; load one with app.tools.datagen")
+    for product_id in HOT_PRODUCTS:
+        send(("PUT", f"/products/{product_id}", {"stock_quantity": 10**8}, {}))
+    ctx.etag = send.headers(get(f"/products/{HOT_PRODUCTS[0]}"))["etag"]
+    return ctx
+
+
+def in_process_env(args) -> dict[str, str]:
+    """Settings for the in-process app; applied before it is imported."""
+    url = make_url(args.url)
+    async_url = url.set(
+        drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    )
+    return {
+        "DATABASE_URL": url.render_as_string(hide_password=False),
+        "ASYNC_DATABASE_URL": async_url.render_as_string(
+            hide_password=False
+        ),
+        "NLP_LLM_BACKEND": "fake",
+        "NLP_FAKE_LATENCY_MS": str(args.llm_latency_ms),
+        "ADMIN_TOKEN": ADMIN_TOKEN,
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+class Sender:
+    """Sends suite requests through an httpx-compatible client."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def __call__(self, request: Request) -> tuple[int, Any]:
+        response = self._send(request)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body
+
+    def headers(self, request: Request) -> Any:
+        """Sends a request and returns its response headers."""
+        return self._send(request).headers
+
+    def _send(self, request: Request) -> Any:
+        method, path, body, headers = request
+        return self.client.request(method, path, json=body, headers=headers)
+
+
+def git_revision() -> Optional[str]:
+    """The commit under test, to label the results."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Runs the selected scenarios and prints the results as JSON."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--url",
+        default=DEFAULT_URL,
+        help="Database URL of the in-process app (default: %(default)s)",
+    )
+    parser.add_argument("--base-url", help="Drive a running server instead")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency-ms", type=int, default=50)
+    parser.add_argument(
+        "--only", help="Comma-separated substrings of scenario names"
+    )
+    parser.add_argument("--output", help="Also write the JSON to this file")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.only:
+        wanted = [part.strip() for part in args.only.split(",")]
+        scenarios = [
+            s for s in SCENARIOS if any(part in s.name for part in wanted)
+        ]
+
+    if args.base_url:
+        import httpx
+
+        client: Any = httpx.Client(base_url=args.base_url, timeout=60)
+    else:
+        os.environ.update(in_process_env(args))
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        client = TestClient(app)
+
+    results = {}
+    with client:
+        send = Sender(client)
+        ctx = load_context(send)
+        for scenario in scenarios:
+            results[scenario.name] = run_scenario(
+                send,
+                scenario,
+                ctx,
+                args.requests,
+                scenario.concurrency or args.concurrency,
+                args.seed,
+            )
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "target": args.base_url or "in-process",
+            "dataset": {
+                "products": ctx.products,
+                "customers": ctx.customers,
+                "orders": ctx.orders,
+            },
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Throughput of the production server at several worker counts.
+
+    python -m app.tools.datagen --url sqlite:///bench.db --truncate
+    python -m benchmarks.workers --url sqlite:///bench.db --workers 1,4,0
+
+For each count (0: one per CPU) a server is started with
+``python -m app.serve`` on the dataset at ``--url``, warmed up, and
+driven for ``--duration`` seconds by ``--clients`` load generator
+processes, each keeping ``--connections`` keep-alive connections busy
+with a seeded mix of product, customer and order reads. Prints the
+requests per second, latency percentiles and speedup over the first
+count as JSON. The load generators run on the same machine and take
+CPU from the workers, so the speedup measured here is a lower bound.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from benchmarks.suite import git_revision, in_process_env, percentile
+
+DEFAULT_URL = "sqlite:///bench.db"
+# Path template -> weight; ids are drawn from the dataset
+MIX = {
+    "/products/{product_id}": 40,
+    "/customers/{customer_id}": 20,
+    "/orders/{order_id}": 20,
+    "/products/?page={page}": 10,
+    "/orders/?customer_id={customer_id}": 10,
+}
+STARTUP_TIMEOUT = 60
+WARMUP_SECONDS = 2
+
+
+def dataset_size(url: str) -> dict[str, int]:
+    """Highest id per table, to draw request ids from."""
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        size = {
+            table: connection.scalar(text(f"SELECT MAX(id) FROM {table}"))
+            or 0
+            for table in ("products", "customers", "orders")
+        }
+    engine.dispose()
+    if not all(size.values()):
+        sys.exit(f"{url} has no data; load it with app.tools.datagen")
+    return size
+
+
+def request_paths(
+    size: dict[str, int], rng: random.Random, count: int
+) -> list[str]:
+    """Draws ``count`` request paths from ``MIX``."""
+    templates = rng.choices(list(MIX), weights=list(MIX.values()), k=count)
+    return [
+        template.format(
+            product_id=rng.randint(1, size["products"]),
+            customer_id=rng.randint(1, size["customers"]),
+            order_id=rng.randint(1, size["orders"]),
+            page=rng.randint(1, 10),
+        )
+        for template in templates
+    ]
+
+
+def drive(
+    base_url: str,
+    paths: list[str],
+    connections: int,
+    duration: float,
+) -> tuple[list[float], dict[str, int]]:
+    """One load generator process: returns latencies (ms) and errors."""
+    return asyncio.run(_drive(base_url, paths, connections, duration))
+
+
+async def _drive(
+    base_url: str,
+    paths: list[str],
+    connections: int,
+    duration: float,
+) -> tuple[list[float], dict[str, int]]:
+    timings: list[float] = []
+    errors: dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=connections)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+
+        async def loop(offset: int) -> None:
+            index = offset
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += connections
+                start = time.perf_counter()
+                try:
+                    status = (await client.get(path)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                timings.append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+
+        await asyncio.gather(*(loop(i) for i in range(connections)))
+    return timings, errors
+
+
+def start_server(workers: int, port: int, env: dict[str, str]):
+    """Starts ``app.serve`` and waits until it answers."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.serve",
+            "--workers",
+            str(workers),
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+        ],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"app.serve exited with status {server.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit("app.serve did not start in time")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    """Stops the server gracefully, as a deployment would."""
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def run(
+    workers: int,
+    args: argparse.Namespace,
+    env: dict[str, str],
+    size: dict[str, int],
+) -> dict[str, Any]:
+    """Serves with ``workers`` workers and measures the throughput."""
+    base_url = f"http://127.0.0.1:{args.port}"
+    rng = random.Random(args.seed)
+    paths = [
+        request_paths(size, rng, args.paths_per_client)
+        for _ in range(args.clients)
+    ]
+    server = start_server(workers, args.port, env)
+    try:
+        with ProcessPoolExecutor(max_workers=args.clients) as pool:
+            # Every worker connects and fills its caches first
+            list(
+                pool.map(
+                    drive,
+                    [base_url] * args.clients,
+                    paths,
+                    [args.connections] * args.clients,
+                    [WARMUP_SECONDS] * args.clients,
+                )
+            )
+            started = time.perf_counter()
+            results = list(
+                pool.map(
+                    drive,
+                    [base_url] * args.clients,
+                    paths,
+                    [args.connections] * args.clients,
+                    [args.duration] * args.clients,
+                )
+            )
+            wall = time.perf_counter() - started
+    finally:
+        stop_server(server)
+
+    timings = sorted(
+        timing for client_timings, _ in results for timing in client_timings
+    )
+    errors: dict[str, int] = {}
+    for _, client_errors in results:
+        for status, count in client_errors.items():
+            errors[status] = errors.get(status, 0) + count
+    return {
+        "workers": workers,
+        "requests": len(timings),
+        "throughput_rps": round(len(timings) / wall, 1),
+        "p50_ms": percentile(timings, 0.50),
+        "p95_ms": percentile(timings, 0.95),
+        "p99_ms": percentile(timings, 0.99),
+        "max_ms": round(timings[-1], 3),
+        "errors": errors,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Benchmarks each worker count and prints the results as JSON."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--url",
+        default=DEFAULT_URL,
+        help="Database URL of the server (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        default="1,4,0",
+        help="Comma-separated worker counts; 0 is one per CPU",
+    )
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8077)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--paths-per-client", type=int, default=10_000)
+    parser.add_argument("--llm-latency-ms", type=int, default=50)
+    parser.add_argument("--output", help="Also write the JSON to this file")
+    args = parser.parse_args(argv)
+
+    cpus = len(os.sched_getaffinity(0))
+    counts = list(
+        dict.fromkeys(
+            int(part) or cpus for part in args.workers.split(",") if part
+        )
+    )
+    size = dataset_size(args.url)
+    env = in_process_env(args)
+    results = {}
+    for workers in counts:
+        results[str(workers)] = run(workers, args, env, size)
+        baseline = results[str(counts[0])]["throughput_rps"]
+        results[str(workers)]["speedup"] = round(
+            results[str(workers)]["throughput_rps"] / baseline, 2
+        )
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "cpus": cpus,
+            "dataset": size,
+            "duration": args.duration,
+            "clients": args.clients,
+            "connections": args.connections,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
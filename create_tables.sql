@@ -7,7 +7,8 @@ CREATE TABLE customers (
     address VARCHAR(255),
     city VARCHAR(50),
     state VARCHAR(50),
-    zip_code VARCHAR(10)
+    zip_code VARCHAR(10),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
 );
 
 -- Create Products Table
@@ -17,9 +18,20 @@ CREATE TABLE products (
     description TEXT,
     category VARCHAR(50),
     price DECIMAL(10,2) NOT NULL,
-    stock_quantity INT NOT NULL
+    stock_quantity INT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
 );
 
+CREATE INDEX ix_products_updated_at ON products (updated_at);
+
+-- Bumped by catalog edits; part of the products listing ETag
+CREATE TABLE catalog_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL
+);
+
+INSERT INTO catalog_version (id, version) VALUES (1, 0);
+
 -- Create Orders Table
 CREATE TABLE orders (
     id SERIAL PRIMARY KEY,
@@ -38,3 +50,12 @@ CREATE TABLE order_items (
     price DECIMAL(10,2)
 
 );
+
+-- Indexes for the order listings and item lookups
+CREATE INDEX ix_orders_customer_id_id ON orders (customer_id, id);
+CREATE INDEX ix_orders_status_id ON orders (status, id);
+CREATE INDEX ix_orders_total_amount ON orders (total_amount);
+CREATE INDEX ix_orders_pending_total_amount ON orders (total_amount)
+    WHERE status = 'Pending';
+CREATE INDEX ix_order_items_order_id ON order_items (order_id);
+CREATE INDEX ix_order_items_product_id ON order_items (product_id);
@@ -0,0 +1,117 @@
+"""
+Test configuration: the app runs against a throwaway SQLite database
+with the per-process caches off, and with the query budgets enforced.
+"""
+
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+ADMIN_TOKEN = "test-admin-token"
+# Read by app.config, so set before the app is imported
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{_DB_PATH}",
+        "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{_DB_PATH}",
+        # A stand-in replica, health-checked on every read
+        "DATABASE_REPLICA_URLS": f"sqlite:///{_DB_PATH}",
+        "DB_REPLICA_CHECK_INTERVAL": "0",
+        "ADMIN_TOKEN": ADMIN_TOKEN,
+        "NLP_LLM_BACKEND": "fake",
+        "NLP_FAKE_LATENCY_MS": "0",
+        "COUNT_CACHE_TTL": "0",
+        "PRODUCT_CACHE_TTL": "0",
+        "PRODUCT_STOCK_CACHE_TTL": "0",
+        "ENFORCE_QUERY_BUDGET": "true",
+        "LOG_ASYNC": "false",
+    }
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.order import Order, OrderItem  # noqa: E402
+from app.models.product import Product  # noqa: E402
+
+STOCK = 100
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Creates the tables for one test and drops them afterwards."""
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db():
+    """A session on the test database."""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    """A client running the app's startup and shutdown."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def orders(db):
+    """
+    Two customers with one order in each status; every order holds one
+    unit of the single product, whose stock starts at ``STOCK``.
+
+    :return: Order id by (customer number, status)
+    """
+    product = Product(
+        name="Widget",
+        description="A widget",
+        category="Tools",
+        price=Decimal("10.00"),
+        stock_quantity=STOCK,
+    )
+    customers = [
+        Customer(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"customer{i}@example.com",
+            address=f"{i} Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+        )
+        for i in (1, 2)
+    ]
+    db.add_all([product, *customers])
+    db.flush()
+
+    ids = {}
+    for number, customer in enumerate(customers, start=1):
+        for status in ("Pending", "Completed", "Canceled"):
+            order = Order(
+                customer_id=customer.id,
+                date=date(2025, 1, 1),
+                total_amount=Decimal("10.00"),
+                status=status,
+                order_items=[
+                    OrderItem(
+                        product_id=product.id,
+                        quantity=1,
+                        price=Decimal("10.00"),
+                    )
+                ],
+            )
+            db.add(order)
+            db.flush()
+            ids[number, status] = order.id
+    db.commit()
+    return ids
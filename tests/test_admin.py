@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from tests.conftest import ADMIN_TOKEN
+
+ADMIN_HEADERS = {"X-Admin-Token": ADMIN_TOKEN}
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("POST", "/admin/nlp/schema/refresh"),
+        ("DELETE", "/admin/nlp/cache"),
+        ("DELETE", "/admin/query-stats"),
+    ],
+)
+def test_worker_local_actions_report_the_worker(client, method, path):
+    response = client.request(method, path, headers=ADMIN_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["pid"] == os.getpid()
+
+
+def test_admin_token_is_required(client):
+    response = client.delete("/admin/query-stats")
+
+    assert response.status_code == 401
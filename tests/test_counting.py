@@ -0,0 +1,50 @@
+import pytest
+from cachetools import TTLCache
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.models.product import Product
+from app.utils import counting
+
+KEY = (frozenset({"products"}), "SELECT count(*) FROM products", ())
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A count cache that keeps its entries for the test."""
+    cache = TTLCache(maxsize=16, ttl=60)
+    cache[KEY] = 1
+    monkeypatch.setattr(counting, "_cache", cache)
+    return cache
+
+
+def write(db) -> None:
+    db.execute(update(Product).values(stock_quantity=Product.stock_quantity))
+
+
+def test_writes_invalidate_once_committed(db, orders, cache):
+    write(db)
+    assert KEY in cache
+
+    db.commit()
+
+    assert KEY not in cache
+
+
+def test_rolled_back_writes_keep_the_cache(db, orders, cache):
+    write(db)
+    db.rollback()
+    db.commit()
+
+    assert KEY in cache
+
+
+def test_explain_keeps_the_driver_parameters():
+    statement = select(Product.id).where(Product.price > 5)
+
+    compiled = counting._Explain(statement).compile(
+        dialect=asyncpg.dialect()
+    )
+
+    assert compiled.string.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "$1" in compiled.string
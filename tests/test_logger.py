@@ -0,0 +1,32 @@
+import logging
+import queue
+import sys
+
+from app.utils.logger import BoundedQueueHandler
+
+
+def test_queued_record_leaves_the_callers_record_intact():
+    handler = BoundedQueueHandler(queue.Queue(), block=False)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test",
+            logging.ERROR,
+            __file__,
+            1,
+            "failed %s",
+            ("order",),
+            exc_info=sys.exc_info(),
+        )
+
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued is not record
+    assert queued.msg == "failed order"
+    assert queued.exc_info is None
+    assert "ValueError: boom" in queued.exc_text
+    assert record.msg == "failed %s"
+    assert record.args == ("order",)
+    assert record.exc_info is not None
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.models.product import Product
+from app.schemas.nlp import StreamFormat
+from app.services.nlp import NLPQueryService, bounded_sql
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT updated_at FROM products",
+        "SELECT id FROM orders WHERE status = 'Pending' ORDER BY id",
+        "SELECT deleted_count, inserted FROM audit",
+    ],
+)
+def test_safe_queries_pass(query):
+    assert not NLPQueryService.is_query_dangerous(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "DELETE FROM orders",
+        "update products set price = 0",
+        "SELECT 1; DROP TABLE customers",
+        "WITH x AS (SELECT 1) INSERT INTO products SELECT * FROM x",
+    ],
+)
+def test_destructive_queries_are_rejected(query):
+    assert NLPQueryService.is_query_dangerous(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT id FROM products",
+        "SELECT id FROM products;",
+        "SELECT id FROM products -- every product",
+        "SELECT id FROM products\n-- every product\n",
+    ],
+)
+def test_bounded_sql_keeps_its_limit(db, query):
+    db.execute(
+        insert(Product),
+        [
+            {"name": "P", "category": "C", "price": 1, "stock_quantity": 1}
+            for _ in range(5)
+        ],
+    )
+
+    rows = db.execute(text(bounded_sql(query, max_rows=2))).all()
+
+    assert len(rows) == 3
+
+
+async def collect(query: str, fmt: StreamFormat) -> str:
+    return "".join(
+        [chunk async for chunk in NLPQueryService.stream_query(query, fmt)]
+    )
+
+
+# abs() of the smallest integer overflows once the second row is read
+FAILING_QUERY = (
+    "SELECT abs(v) AS v FROM "
+    "(SELECT 1 AS v UNION ALL SELECT -9223372036854775808)"
+)
+
+
+def test_failed_stream_ends_with_an_error_line():
+    body = asyncio.run(collect(FAILING_QUERY, StreamFormat.NDJSON))
+
+    trailer = json.loads(body.splitlines()[-1])
+    assert trailer["__meta__"]["error"] == "Error executing SQL query."
+
+
+def test_failed_csv_stream_ends_with_an_error_comment():
+    body = asyncio.run(collect(FAILING_QUERY, StreamFormat.CSV))
+
+    assert body.splitlines()[-1].startswith("# error after")
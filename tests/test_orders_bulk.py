@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.models.product import Product
+from tests.conftest import STOCK
+
+
+def bulk_order(order_date: date) -> dict:
+    return {
+        "customer_id": 1,
+        "order_date": order_date.isoformat(),
+        "items": [{"product_id": 1, "quantity": 1, "price": 10}],
+    }
+
+
+def test_invalid_order_fails_alone(client, db, orders):
+    response = client.post(
+        "/orders/bulk",
+        json={
+            "orders": [
+                bulk_order(date.today()),
+                bulk_order(date.today() - timedelta(days=1)),
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 1
+    assert body["failed"] == 1
+    valid, invalid = body["results"]
+    assert valid["success"] and valid["order_id"]
+    assert not invalid["success"]
+    assert invalid["error"] == "Order date cannot be in the past"
+    db.expire_all()
+    assert db.scalar(select(Product.stock_quantity)) == STOCK - 1
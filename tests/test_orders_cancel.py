@@ -0,0 +1,59 @@
+from sqlalchemy import select
+
+from app.models.order import Order
+from app.models.product import Product
+from tests.conftest import STOCK
+
+
+def order_ids(db) -> set[int]:
+    """Ids of the orders left in the database."""
+    db.expire_all()
+    return set(db.scalars(select(Order.id)))
+
+
+def test_cancel_by_id(client, db, orders):
+    response = client.post(
+        "/orders/cancel", json={"order_ids": [orders[1, "Pending"]]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["cancelled"] == 1
+    assert orders[1, "Pending"] not in order_ids(db)
+    assert db.scalar(select(Product.stock_quantity)) == STOCK + 1
+
+
+def test_cancel_by_filter_only_cancels_pending_orders(client, db, orders):
+    response = client.post(
+        "/orders/cancel", json={"filters": {"customer_id": 1}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["cancelled"] == 1
+    assert order_ids(db) == set(orders.values()) - {orders[1, "Pending"]}
+    assert db.scalar(select(Product.stock_quantity)) == STOCK + 1
+
+
+def test_cancel_by_filter_rejects_other_statuses(client, db, orders):
+    response = client.post(
+        "/orders/cancel", json={"filters": {"status": "Completed"}}
+    )
+
+    assert response.status_code == 422
+    assert order_ids(db) == set(orders.values())
+
+
+def test_cancel_by_search_alone_is_rejected(client, db, orders):
+    response = client.post(
+        "/orders/cancel", json={"filters": {"search": "anything"}}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "At least one filter is required."
+    assert order_ids(db) == set(orders.values())
+
+
+def test_cancel_by_empty_filter_is_rejected(client, db, orders):
+    response = client.post("/orders/cancel", json={"filters": {}})
+
+    assert response.status_code == 422
+    assert order_ids(db) == set(orders.values())
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import insert
+
+from app.models.product import Product
+from app.utils.constants import MAX_PAGE_SIZE
+from app.utils.pagination import NEXT, _encode_cursor
+
+PRODUCTS = 25
+
+
+@pytest.fixture
+def products(db):
+    db.execute(
+        insert(Product),
+        [
+            {
+                "name": f"Product {i}",
+                "category": "Tools",
+                "price": 1,
+                "stock_quantity": 1,
+            }
+            for i in range(PRODUCTS)
+        ],
+    )
+    db.commit()
+
+
+def ids(page: dict) -> list[int]:
+    return [product["id"] for product in page["results"]]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["page=0", "page=-1", "page_size=0", f"page_size={MAX_PAGE_SIZE + 1}"],
+)
+def test_out_of_range_pagination_is_rejected(client, products, query):
+    assert client.get(f"/products/?{query}").status_code == 422
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        _encode_cursor("5", NEXT),
+        _encode_cursor(True, NEXT),
+        _encode_cursor(5.5, NEXT),
+        _encode_cursor(5, "x"),
+    ],
+)
+def test_malformed_cursors_are_rejected(client, products, cursor):
+    response = client.get("/products/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+
+def test_cursors_walk_forward_and_back(client, products):
+    first = client.get("/products/?page_size=10").json()
+    assert first["previous_cursor"] is None
+
+    second = client.get(
+        "/products/", params={"cursor": first["next_cursor"]}
+    ).json()
+    assert ids(second) == list(range(11, 21))
+
+    back = client.get(
+        "/products/", params={"cursor": second["previous_cursor"]}
+    ).json()
+    assert ids(back) == ids(first)
+    assert back["previous_cursor"] is None
+    assert back["next_cursor"] is not None
+
+    last = client.get(
+        "/products/", params={"cursor": second["next_cursor"]}
+    ).json()
+    assert ids(last) == list(range(21, PRODUCTS + 1))
+    assert last["next_cursor"] is None
+    assert last["previous_cursor"] is not None
+
+
+def test_cursor_before_the_first_row_has_no_previous_page(client, products):
+    page = client.get(
+        "/products/",
+        params={"cursor": _encode_cursor(0, NEXT), "page_size": 10},
+    ).json()
+
+    assert ids(page) == list(range(1, 11))
+    assert page["previous_cursor"] is None
+    assert page["next_cursor"] is not None
@@ -0,0 +1,90 @@
+from datetime import date
+
+from app.models.product import CATALOG_VERSION_ID, CatalogVersion
+from app.services.products import ProductService
+from app.utils.query_counter import count_statements
+
+PRODUCT = {
+    "name": "Gadget",
+    "category": "Tools",
+    "price": "5.00",
+    "stock_quantity": 10,
+}
+
+
+def listing_etag(client) -> str:
+    response = client.get("/products/")
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def test_unchanged_listing_is_not_modified(client, orders):
+    etag = listing_etag(client)
+
+    response = client.get("/products/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_product_writes_change_the_listing_etag(client, orders):
+    etag = listing_etag(client)
+    assert client.post("/products/", json=PRODUCT).status_code == 200
+
+    response = client.get("/products/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_stock_writes_change_the_listing_etag(client, orders):
+    etag = listing_etag(client)
+    response = client.post(
+        "/orders/",
+        json={
+            "customer_id": 1,
+            "order_date": date.today().isoformat(),
+            "items": [{"product_id": 1, "quantity": 1, "price": 10}],
+        },
+    )
+    assert response.status_code == 201
+
+    assert listing_etag(client) != etag
+
+
+def test_failed_writes_keep_the_listing_etag(client, orders):
+    etag = listing_etag(client)
+    assert client.delete("/products/999").status_code == 404
+
+    assert listing_etag(client) == etag
+
+
+def test_catalog_version_is_one_statement_without_a_count(db, orders):
+    with count_statements() as counter:
+        is_success, _, _ = ProductService(db).get_catalog_version()
+
+    assert is_success
+    assert counter.count == 1
+    assert "count(" not in counter.statements[0].lower()
+
+
+def catalog_version(db) -> int:
+    db.expire_all()
+    return db.get(CatalogVersion, CATALOG_VERSION_ID).version
+
+
+def test_stock_writes_leave_the_catalog_version_alone(client, db, orders):
+    version = catalog_version(db)
+    response = client.post(
+        "/orders/cancel", json={"order_ids": [orders[1, "Pending"]]}
+    )
+    assert response.status_code == 200
+
+    assert catalog_version(db) == version
+
+
+def test_catalog_writes_bump_the_catalog_version(client, db, orders):
+    version = catalog_version(db)
+    response = client.put("/products/1", json={"price": "12.00"})
+    assert response.status_code == 200
+
+    assert catalog_version(db) == version + 1
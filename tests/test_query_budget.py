@@ -0,0 +1,64 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.database import SessionLocal, replicas
+from app.utils.query_counter import (
+    QueryBudgetExceeded,
+    count_statements,
+    statement_budget,
+    uncounted,
+)
+from app.utils.pagination import NEXT, _encode_cursor
+
+# Every list route, with and without count and cursor; the budgets are
+# enforced (see conftest), so a route over its budget raises
+LIST_ROUTES = [
+    "/products/",
+    "/products/?with_count=false",
+    f"/products/?cursor={_encode_cursor(1, NEXT)}",
+    "/customers/",
+    "/customers/?count=estimated",
+    f"/customers/?cursor={_encode_cursor(1, NEXT)}",
+    "/orders/",
+    "/orders/?status=Pending&min_price=1",
+    f"/orders/?cursor={_encode_cursor(1, NEXT)}&customer_id=1",
+    "/orders/customer/1",
+]
+
+
+@pytest.mark.parametrize("path", LIST_ROUTES)
+def test_list_routes_stay_within_their_budget(client, orders, path):
+    assert client.get(path).status_code == 200
+
+
+def test_requests_over_budget_fail():
+    app = FastAPI()
+
+    @app.get("/", dependencies=[Depends(statement_budget(1))])
+    def two_statements():
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+
+    with pytest.raises(QueryBudgetExceeded):
+        TestClient(app).get("/")
+
+
+def test_replica_checks_are_not_counted():
+    with count_statements() as counter:
+        replica = replicas.pick()
+
+    assert replica is not None
+    assert replica.healthy
+    assert counter.count == 0
+
+
+def test_uncounted_statements_are_left_out():
+    with SessionLocal() as db, count_statements() as counter:
+        db.execute(text("SELECT 1"))
+        with uncounted():
+            db.execute(text("SELECT 2"))
+
+    assert counter.statements == ["SELECT 1"]